@@ -0,0 +1,299 @@
+"""Process-wide read-through caches of ``GET /events/{id}`` and ``/search`` results."""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from .models import EventListing
+from .repositories.protocols import ListingPage
+from .settings import Settings
+from .types import EventCacheStatsOut, SearchCacheStatsOut
+from .util.ids import new_uuid
+
+
+@dataclass(frozen=True)
+class _Entry:
+    value: EventListing
+    loaded_at: float
+
+
+class EventCache:
+    """LRU of event listing rows, each served for at most ``max_staleness`` seconds.
+
+    Event fields never change after creation; the confirmed/waitlist counts do.
+    Writes made in this process invalidate the event right after they commit;
+    ``max_staleness`` bounds how long counts changed elsewhere (another process,
+    a lagging read replica) can be served. Cached values are shared: read-only.
+    """
+
+    def __init__(
+        self,
+        max_entries: int,
+        max_staleness: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.max_entries = max(max_entries, 0)
+        self.max_staleness = max_staleness
+        self._clock = clock
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self._lock = threading.Lock()
+        # Bumped by every invalidation. A load that started before an invalidation
+        # of its event may have read the old counts, so its result is not kept.
+        self._generation = 0
+        # Tells this cache's generations apart from another process's (or a restart's)
+        self._epoch = new_uuid()[:8]
+        self._invalidated: dict[str, int] = {}
+        self._cleared = 0
+        self._loading = 0
+        self._written_at: float | None = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0 and self.max_staleness > 0
+
+    def get_or_load(
+        self, event_id: str, load: Callable[[], EventListing | None]
+    ) -> EventListing | None:
+        """The cached event if fresh enough, else ``load()`` (cached unless None)."""
+        if not self.enabled:
+            return load()
+        with self._lock:
+            now = self._clock()
+            entry = self._entries.get(event_id)
+            if entry is not None and now - entry.loaded_at <= self.max_staleness:
+                self._entries.move_to_end(event_id)
+                self.hits += 1
+                return entry.value
+            self.misses += 1
+            token = self._generation
+            self._loading += 1
+        try:
+            value = load()
+            if value is not None:
+                self._keep(event_id, _Entry(value, now), token)
+        finally:
+            with self._lock:
+                self._loading -= 1
+                if not self._loading:
+                    # No load in flight can be older than these any more
+                    self._invalidated.clear()
+        return value
+
+    def _keep(self, event_id: str, entry: _Entry, token: int) -> None:
+        with self._lock:
+            if self._cleared > token or self._invalidated.get(event_id, 0) > token:
+                return
+            self._entries[event_id] = entry
+            self._entries.move_to_end(event_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, event_id: str) -> None:
+        """Drop ``event_id``; call after the write that changed it has committed."""
+        with self._lock:
+            self._generation += 1
+            self.invalidations += 1
+            self._written_at = self._clock()
+            self._entries.pop(event_id, None)
+            if self._loading:
+                self._invalidated[event_id] = self._generation
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self.invalidations += 1
+            self._written_at = self._clock()
+            self._entries.clear()
+            self._cleared = self._generation
+
+    def write_version(self) -> str:
+        """Changes whenever a write committed by this process invalidated the cache.
+
+        Bumped even when the cache is disabled; writes from other processes are
+        not seen here.
+        """
+        with self._lock:
+            return f"{self._epoch}.{self._generation}"
+
+    def written_within(self, seconds: float) -> bool:
+        """Whether a write committed by this process invalidated the cache lately."""
+        with self._lock:
+            written_at = self._written_at
+            return written_at is not None and self._clock() - written_at < seconds
+
+    def stats(self) -> EventCacheStatsOut:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "max_staleness_seconds": self.max_staleness,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+
+@dataclass(frozen=True)
+class _Page:
+    value: ListingPage
+    version: str
+    loaded_at: float
+
+
+class SearchCache:
+    """LRU of search listing pages keyed by their normalized query.
+
+    Each page remembers the write version (``EventCache.write_version``) it was
+    read under. Any later write by this process makes it stale, and it is dropped
+    on its next lookup rather than by the write. ``max_staleness`` bounds how long
+    writes made elsewhere can go unseen. Cached pages are shared: read-only.
+    """
+
+    def __init__(
+        self,
+        max_entries: int,
+        max_staleness: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.max_entries = max(max_entries, 0)
+        self.max_staleness = max_staleness
+        self._clock = clock
+        self._pages: OrderedDict[str, _Page] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+        self.evictions = 0
+        self.bypassed = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0 and self.max_staleness > 0
+
+    def get_or_load(
+        self,
+        key: str,
+        version: str,
+        load: Callable[[], ListingPage],
+        *,
+        refresh: bool = False,
+    ) -> ListingPage:
+        """The page cached for ``key`` under ``version``, else ``load()``'s (kept).
+
+        ``version`` must be read before ``load`` runs, so a write racing the load
+        leaves the page already stale. ``refresh`` skips the lookup (not the store).
+        """
+        if not self.enabled:
+            return load()
+        with self._lock:
+            now = self._clock()
+            if refresh:
+                self.bypassed += 1
+            else:
+                page = self._pages.get(key)
+                if page is not None:
+                    if page.version == version and now - page.loaded_at <= self.max_staleness:
+                        self._pages.move_to_end(key)
+                        self.hits += 1
+                        return page.value
+                    del self._pages[key]
+                    self.stale += 1
+                self.misses += 1
+        value = load()
+        with self._lock:
+            self._pages[key] = _Page(value, version, now)
+            self._pages.move_to_end(key)
+            while len(self._pages) > self.max_entries:
+                self._pages.popitem(last=False)
+                self.evictions += 1
+        return value
+
+    def stats(self) -> SearchCacheStatsOut:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._pages),
+                "max_entries": self.max_entries,
+                "max_staleness_seconds": self.max_staleness,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "stale": self.stale,
+                "evictions": self.evictions,
+                "bypassed": self.bypassed,
+            }
+
+
+def _from_settings(settings: Settings) -> EventCache:
+    return EventCache(settings.event_cache_size, settings.event_cache_max_staleness)
+
+
+def _search_from_settings(settings: Settings) -> SearchCache:
+    return SearchCache(settings.search_cache_size, settings.search_cache_max_staleness)
+
+
+_EVENT_CACHE: EventCache | None = None
+_EVENT_CACHE_LOCK = threading.Lock()
+
+
+def configure_event_cache(settings: Settings) -> EventCache:
+    """Replace the process-wide cache with an empty one sized by ``settings``."""
+    global _EVENT_CACHE  # noqa: PLW0603
+    with _EVENT_CACHE_LOCK:
+        _EVENT_CACHE = _from_settings(settings)
+        return _EVENT_CACHE
+
+
+def event_cache() -> EventCache:
+    """The process-wide cache, configured from the environment on first use."""
+    global _EVENT_CACHE  # noqa: PLW0603
+    cache = _EVENT_CACHE
+    if cache is not None:
+        return cache
+    with _EVENT_CACHE_LOCK:
+        if _EVENT_CACHE is None:
+            _EVENT_CACHE = _from_settings(Settings.from_env())
+        return _EVENT_CACHE
+
+
+_SEARCH_CACHE: SearchCache | None = None
+
+
+def configure_search_cache(settings: Settings) -> SearchCache:
+    """Replace the process-wide search cache with an empty one sized by ``settings``."""
+    global _SEARCH_CACHE  # noqa: PLW0603
+    with _EVENT_CACHE_LOCK:
+        _SEARCH_CACHE = _search_from_settings(settings)
+        return _SEARCH_CACHE
+
+
+def search_cache() -> SearchCache:
+    """The process-wide search cache, configured from the environment on first use."""
+    global _SEARCH_CACHE  # noqa: PLW0603
+    cache = _SEARCH_CACHE
+    if cache is not None:
+        return cache
+    with _EVENT_CACHE_LOCK:
+        if _SEARCH_CACHE is None:
+            _SEARCH_CACHE = _search_from_settings(Settings.from_env())
+        return _SEARCH_CACHE
+
+
+__all__ = [
+    "EventCache",
+    "SearchCache",
+    "configure_event_cache",
+    "configure_search_cache",
+    "event_cache",
+    "search_cache",
+]
@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+import datetime as dt
+import os
+import sys
+from dataclasses import dataclass
+
+from .db import get_engine, get_session
+from .migrations import current_version, latest_version, migrate
+from .repositories.sql import SQLRepos
+from .repositories.sql_search import rebuild_fts_index
+from .services.retention import RetentionInput, RetentionResult, RetentionService
+from .settings import Settings
+from .util.time import utcnow
+
+USAGE = """usage: python -m ics_connect.cli [--database-url URL] COMMAND [options]
+
+commands:
+  migrate [--target N]   apply pending schema migrations
+  schema-version         show the applied and latest schema versions
+  repair-counters        recompute events' confirmed/waitlist counters from reservations
+  reindex-search         rebuild the full-text search index from events (SQLite FTS5)
+  archive [--older-than-days N] [--batch N] [--max-batches N]
+                         move ended events (with their reservations) and old canceled
+                         reservations to the archive tables, one batch per transaction
+"""
+
+
+@dataclass(frozen=True)
+class _Args:
+    command: str
+    database_url: str
+    options: dict[str, str]
+
+
+def _parse(argv: list[str]) -> _Args:
+    database_url = os.environ.get("DATABASE_URL") or ""
+    command = ""
+    options: dict[str, str] = {}
+    it = iter(argv)
+    for arg in it:
+        if arg.startswith("--"):
+            value = next(it, None)
+            if value is None:
+                raise SystemExit(f"missing value for {arg}\n{USAGE}")
+            if arg == "--database-url":
+                database_url = value
+            else:
+                options[arg[2:]] = value
+        elif not command:
+            command = arg
+        else:
+            raise SystemExit(f"unexpected argument {arg!r}\n{USAGE}")
+    if not command:
+        raise SystemExit(USAGE)
+    if not database_url:
+        raise SystemExit("DATABASE_URL is not set (or pass --database-url)")
+    return _Args(command=command, database_url=database_url, options=options)
+
+
+def _int_option(args: _Args, name: str, minimum: int) -> int | None:
+    """``--name N`` as an int, None when not given; anything else exits with usage."""
+    raw = args.options.get(name)
+    if raw is None:
+        return None
+    usage = f"--{name} expects a whole number >= {minimum}, got {raw!r}\n{USAGE}"
+    try:
+        value = int(raw)
+    except ValueError:
+        raise SystemExit(usage) from None
+    if value < minimum:
+        raise SystemExit(usage)
+    return value
+
+
+def _cmd_migrate(args: _Args) -> int:
+    target = _int_option(args, "target", 0)
+    engine = get_engine(args.database_url)
+    try:
+        applied = migrate(engine, target=target)
+        version = current_version(engine)
+    finally:
+        engine.dispose()
+    sys.stdout.write(f"applied={applied} version={version}\n")
+    return 0
+
+
+def _cmd_schema_version(args: _Args) -> int:
+    engine = get_engine(args.database_url)
+    try:
+        version = current_version(engine)
+    finally:
+        engine.dispose()
+    sys.stdout.write(f"version={version} latest={latest_version()}\n")
+    return 0
+
+
+def _cmd_repair_counters(args: _Args) -> int:
+    engine = get_engine(args.database_url)
+    repaired = 0
+    try:
+        for session in get_session(engine):
+            repos = SQLRepos(session)
+            with repos.transaction():
+                repaired = repos.reservations.recompute_occupancy()
+    finally:
+        engine.dispose()
+    sys.stdout.write(f"repaired={repaired}\n")
+    return 0
+
+
+def _cmd_reindex_search(args: _Args) -> int:
+    engine = get_engine(args.database_url)
+    indexed = 0
+    try:
+        for session in get_session(engine):
+            indexed = rebuild_fts_index(session)
+    finally:
+        engine.dispose()
+    sys.stdout.write(f"indexed={indexed}\n")
+    return 0
+
+
+def _cmd_archive(args: _Args) -> int:
+    settings = Settings.from_env()
+    days = _int_option(args, "older-than-days", 0)
+    batch_size = _int_option(args, "batch", 1)
+    data = RetentionInput(
+        cutoff=utcnow() - dt.timedelta(days=settings.archive_after_days if days is None else days),
+        batch_size=settings.archive_batch_size if batch_size is None else batch_size,
+        max_batches=_int_option(args, "max-batches", 1),
+    )
+    engine = get_engine(args.database_url)
+    result = RetentionResult(events=0, reservations=0, batches=0)
+    try:
+        for session in get_session(engine):
+            result = RetentionService(SQLRepos(session)).archive(data)
+    finally:
+        engine.dispose()
+    sys.stdout.write(
+        f"events={result.events} reservations={result.reservations} batches={result.batches}\n"
+    )
+    return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = _parse(sys.argv[1:] if argv is None else argv)
+    if args.command == "migrate":
+        return _cmd_migrate(args)
+    if args.command == "schema-version":
+        return _cmd_schema_version(args)
+    if args.command == "repair-counters":
+        return _cmd_repair_counters(args)
+    if args.command == "reindex-search":
+        return _cmd_reindex_search(args)
+    if args.command == "archive":
+        return _cmd_archive(args)
+    raise SystemExit(f"unknown command {args.command!r}\n{USAGE}")
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,20 +1,52 @@
 from __future__ import annotations
 
-from collections.abc import Iterator
+import threading
+from collections.abc import Generator, Iterator
 from collections.abc import Iterator as TIterator
 from dataclasses import dataclass, field
 
-from sqlalchemy import create_engine
 from sqlalchemy.engine import Engine
 from sqlalchemy.orm import Session, sessionmaker
 
-from .models import Event, Reservation
+from .cache import event_cache
+from .migrations import migrate
+from .models import Event, Occupancy, Reservation
+from .repositories.inmemory_index import EventIndex, ReservationIndex
+from .repositories.sql_engine import (
+    PoolStats,
+    build_engine,
+    pool_snapshot,
+    sqlite_production,
+)
+from .repositories.sql_search import event_search_for
+from .settings import Settings
+from .types import PoolStatsOut
+
+
+@dataclass
+class ArchiveStore:
+    """Ended events (with their final counters) and reservations moved by retention."""
+
+    events: dict[str, Event] = field(default_factory=dict)
+    occupancy: dict[str, Occupancy] = field(default_factory=dict)
+    # Same index as live events, for include_past searches
+    event_index: EventIndex = field(default_factory=EventIndex)
+    reservations: dict[str, Reservation] = field(default_factory=dict)
 
 
 @dataclass
 class Store:
     events: dict[str, Event] = field(default_factory=dict)
     reservations: dict[str, Reservation] = field(default_factory=dict)
+    # Per-event confirmed/waitlisted counters, kept in step with reservations
+    occupancy: dict[str, Occupancy] = field(default_factory=dict)
+    # Trigram + starts_at index over events, kept in step by the event repository
+    event_index: EventIndex = field(default_factory=EventIndex)
+    # Per-event status buckets, waitlist FIFO and user/email lookups over reservations
+    reservation_index: ReservationIndex = field(default_factory=ReservationIndex)
+    # Serializes reservation writes (check capacity + insert) across request threads
+    lock: threading.RLock = field(default_factory=threading.RLock, repr=False)
+    archive: ArchiveStore = field(default_factory=ArchiveStore)
 
 
 _STORE = Store()
@@ -28,8 +60,8 @@ def get_store() -> Iterator[Store]:
     yield _STORE
 
 
-def get_engine(url: str) -> Engine:
-    return create_engine(url, echo=False, future=True)
+def get_engine(url: str, settings: Settings | None = None) -> Engine:
+    return build_engine(url, settings or Settings.from_env())
 
 
 def get_session(engine: Engine) -> TIterator[Session]:
@@ -39,3 +71,114 @@ def get_session(engine: Engine) -> TIterator[Session]:
         yield session
     finally:
         session.close()
+
+
+class Database:
+    """Engine and session factory shared by every request in the process."""
+
+    def __init__(self, url: str, settings: Settings | None = None) -> None:
+        s = settings or Settings.from_env()
+        self.url = url
+        self.stats = PoolStats()
+        # File SQLite in production: writes get one connection, reads a WAL pool
+        single_writer = sqlite_production(url, s)
+        role = "writer" if single_writer else "primary"
+        self.engine = build_engine(url, s, self.stats, role)
+        self.search = event_search_for(self.engine.dialect.name, s.search_backend)
+        self._session_factory = sessionmaker(
+            bind=self.engine, autoflush=False, autocommit=False, future=True
+        )
+        # Optional read replica for safe GETs; without one, reads use the primary
+        self.read_url = s.database_read_url if s.database_read_url != url else None
+        self.read_after_write = s.database_read_after_write_seconds
+        self.read_engine = self.engine
+        self._read_session_factory = self._session_factory
+        read_url = self.read_url or (url if single_writer else None)
+        if read_url is not None:
+            self.read_stats = PoolStats()
+            self.read_engine = build_engine(read_url, s, self.read_stats, "reader")
+            self._read_session_factory = sessionmaker(
+                bind=self.read_engine, autoflush=False, autocommit=False, future=True
+            )
+
+    def session(self) -> Generator[Session, None, None]:
+        session = self._session_factory()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    def _replica_may_lag(self) -> bool:
+        # Right after this process wrote, the replica may not have the write yet.
+        # A read there would be cached and ETagged under the new write version and
+        # served stale, so such reads go to the primary until the window passes.
+        return self.read_url is not None and event_cache().written_within(self.read_after_write)
+
+    def read_session(self) -> Generator[Session, None, None]:
+        """A session on the read replica (the primary when none is configured).
+
+        Replicas lag: anything that must see the caller's own writes uses ``session``.
+        For ``ICS_DB_READ_AFTER_WRITE_SECONDS`` after a write by this process, this
+        is a primary session too.
+        """
+        lagging = self._replica_may_lag()
+        session = self._session_factory() if lagging else self._read_session_factory()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    def pool_stats(self) -> PoolStatsOut:
+        return pool_snapshot(self.engine, self.stats)
+
+    def dispose(self) -> None:
+        if self.read_engine is not self.engine:
+            self.read_engine.dispose()
+        self.engine.dispose()
+
+
+_DATABASE: Database | None = None
+_DATABASE_LOCK = threading.Lock()
+
+
+def _replace_database(url: str, settings: Settings | None) -> Database:
+    global _DATABASE  # noqa: PLW0603
+    if _DATABASE is not None:
+        _DATABASE.dispose()
+    s = settings or Settings.from_env()
+    db = Database(url, s)
+    # Schema migrations run once per process, never per request.
+    if s.db_auto_migrate:
+        migrate(db.engine)
+    _DATABASE = db
+    return db
+
+
+def init_database(url: str, settings: Settings | None = None) -> Database:
+    """Create (or replace) the process-wide Database for ``url``."""
+    with _DATABASE_LOCK:
+        return _replace_database(url, settings)
+
+
+def get_database(url: str) -> Database:
+    """Return the process-wide Database, creating it on first use."""
+    db = _DATABASE
+    if db is not None and db.url == url:
+        return db
+    with _DATABASE_LOCK:
+        db = _DATABASE
+        if db is not None and db.url == url:
+            return db
+        return _replace_database(url, None)
+
+
+def current_database() -> Database | None:
+    return _DATABASE
+
+
+def dispose_database() -> None:
+    global _DATABASE  # noqa: PLW0603
+    with _DATABASE_LOCK:
+        if _DATABASE is not None:
+            _DATABASE.dispose()
+        _DATABASE = None
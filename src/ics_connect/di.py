@@ -3,11 +3,10 @@ from __future__ import annotations
 import os
 from collections.abc import Iterator
 
-from .db import Store, get_engine, get_session, get_store
+from .db import Store, get_database, get_store
 from .repositories.inmemory import InMemoryRepos
 from .repositories.protocols import Repos
 from .repositories.sql import SQLRepos
-from .repositories.sql_models import create_all as sql_create_all
 
 
 def provide_store() -> Iterator[Store]:
@@ -17,13 +16,28 @@ def provide_store() -> Iterator[Store]:
 def provide_repos() -> Iterator[Repos]:
     db_url = os.environ.get("DATABASE_URL")
     if db_url:
-        engine = get_engine(db_url)
-        sql_create_all(engine)
-        for session in get_session(engine):
-            yield SQLRepos(session)
+        # Engine, pool and schema are process-wide; only the session is per request.
+        database = get_database(db_url)
+        for session in database.session():
+            yield SQLRepos(session, database.search)
         return
     # In-memory repos wrapping the global Store
     # Use the same store instance provided by provide_store/get_store
     store_iter = get_store()
     store = next(store_iter)
     yield InMemoryRepos(store)
+
+
+def provide_read_repos() -> Iterator[Repos]:
+    """Like ``provide_repos``, on the read replica (``DATABASE_READ_URL``) if any.
+
+    Only for safe GETs that may lag the primary; read-your-writes paths (such as
+    ``/events/{id}/mine`` right after a reserve) keep using ``provide_repos``.
+    """
+    db_url = os.environ.get("DATABASE_URL")
+    if db_url:
+        database = get_database(db_url)
+        for session in database.read_session():
+            yield SQLRepos(session, database.search)
+        return
+    yield InMemoryRepos(next(get_store()))
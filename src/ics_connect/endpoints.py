@@ -1,46 +1,33 @@
 from __future__ import annotations
 
 import datetime as dt
-from dataclasses import dataclass
+import time
+from dataclasses import dataclass, replace
+from functools import partial
 from typing import Final
 
+from .cache import event_cache, search_cache
+from .db import current_database
 from .errors import AppError
-from .models import Event
-from .repositories.protocols import Repos
+from .models import EventListing
+from .rendering import search_json, to_public
+from .repositories.protocols import EventQuery, ListingPage, Repos, SearchOrder
 from .services.events import CreateEventInput, EventService
 from .services.reservations import ReservationService, ReserveInput
 from .types import (
     AuthResponse,
     CreatedEventResponse,
     CreateEventBody,
-    EventPublic,
+    MetricsOut,
     ProfileBody,
     ProfileOut,
     ReservationOut,
     ReserveBody,
     ReserveResponse,
-    SearchResult,
 )
-
-
-def to_public(ev: Event, confirmed: int, waitlisted: int) -> EventPublic:
-    return {
-        "id": ev.id,
-        "title": ev.title,
-        "description": ev.description,
-        "type": ev.type,
-        "starts_at": ev.starts_at,
-        "ends_at": ev.ends_at,
-        "location_text": ev.location_text,
-        "discord_link": ev.discord_link,
-        "website_link": ev.website_link,
-        "tags": [],
-        "public": ev.public,
-        "capacity": ev.capacity,
-        "confirmed_count": confirmed,
-        "waitlist_count": waitlisted,
-        "requires_join_code": ev.requires_join_code,
-    }
+from .util.cursor import decode_cursor, encode_cursor, encode_offset_cursor
+from .util.etag import strong_etag, weak_etag
+from .util.time import as_utc
 
 
 def create_event_ep(body: CreateEventBody, repos: Repos) -> CreatedEventResponse:
@@ -70,13 +57,17 @@ def create_event_ep(body: CreateEventBody, repos: Repos) -> CreatedEventResponse
     return resp
 
 
-def get_event_ep(event_id: str, repos: Repos) -> EventPublic:
-    ev = repos.events.get(event_id)
-    if ev is None:
+def get_event_listing_ep(event_id: str, repos: Repos) -> EventListing:
+    # Served from the process-wide cache while fresh; misses are not cached
+    row = event_cache().get_or_load(event_id, partial(repos.events.get_listing, event_id))
+    if row is None:
         raise AppError("NOT_FOUND", "Event not found")
-    confirmed = repos.reservations.count_confirmed(event_id)
-    waitlisted = repos.reservations.count_waitlisted(event_id)
-    return to_public(ev, int(confirmed), int(waitlisted))
+    return row
+
+
+def event_etag(row: EventListing) -> str:
+    """Strong ETag of an event: its counts are the only fields that change."""
+    return strong_etag("event", row.id, row.confirmed_count, row.waitlist_count)
 
 
 def reserve_ep(
@@ -185,30 +176,90 @@ class SearchParams:
     to: dt.datetime | None
     limit: int
     offset: int
+    cursor: str | None = None
+    # "relevance" (default when q is given) or "starts_at"
+    sort: str | None = None
+    # Also search archived (ended) events; pages are chronological
+    include_past: bool = False
+    # Skip the result cache for this request (the fresh page replaces the cached one)
+    fresh: bool = False
+
+
+_SEARCH_ORDERS: Final[dict[str, SearchOrder]] = {
+    "relevance": "relevance",
+    "starts_at": "starts_at",
+}
+
+
+def _search_query(params: SearchParams) -> EventQuery:
+    if params.sort is not None and params.sort not in _SEARCH_ORDERS:
+        raise AppError("INVALID_INPUT", "'sort' must be 'relevance' or 'starts_at'")
+    if params.include_past and params.sort == "relevance":
+        raise AppError("INVALID_INPUT", "'include_past' results are ordered by 'starts_at'")
+    order: SearchOrder = "relevance" if params.q and not params.include_past else "starts_at"
+    if params.sort is not None:
+        order = _SEARCH_ORDERS[params.sort]
+    query = EventQuery(
+        # "" matches everything, as no q does: one cache key and ETag for both
+        q=params.q or None,
+        start=None if params.start is None else as_utc(params.start),
+        to=None if params.to is None else as_utc(params.to),
+        limit=params.limit,
+        offset=params.offset,
+        order=order,
+        include_past=params.include_past,
+    )
+    if not params.cursor:
+        return query
+    if params.offset:
+        raise AppError("INVALID_INPUT", "'cursor' and 'offset' cannot be combined")
+    try:
+        position = decode_cursor(params.cursor)
+    except ValueError as exc:
+        raise AppError("INVALID_INPUT", "'cursor' is invalid") from exc
+    # The cursor pins the ordering it was issued for
+    if isinstance(position, int):
+        return replace(query, offset=position, order="relevance")
+    return replace(query, after=position, order="starts_at")
+
+
+def search_etag(params: SearchParams, window_seconds: float) -> str:
+    """Weak ETag for a search page, known before running it.
+
+    Derived from the normalized query and this process's write generation, plus
+    the current ``window_seconds`` slot, not from the page itself: a write made
+    by another process can leave a matching tag stale for up to one window.
+    Raises ``AppError`` for parameters ``search_json_ep`` would reject.
+    """
+    query = _search_query(params)
+    slot = int(time.time() // window_seconds) if window_seconds > 0 else 0
+    return weak_etag("search", event_cache().write_version(), slot, repr(query))
+
+
+def _search_page(params: SearchParams, repos: Repos) -> tuple[ListingPage, str | None]:
+    query = _search_query(params)
+    # Read before the search, so a write racing it leaves the cached page stale
+    version = event_cache().write_version()
+    page = search_cache().get_or_load(
+        repr(query),
+        version,
+        partial(repos.events.search_listings, query),
+        refresh=params.fresh,
+    )
+    next_cursor: str | None = None
+    if query.ranked:
+        consumed = query.offset + len(page.listings)
+        if page.listings and consumed < page.total:
+            next_cursor = encode_offset_cursor(consumed)
+    elif page.next_after is not None:
+        next_cursor = encode_cursor(*page.next_after)
+    return page, next_cursor
 
 
-def search_ep(params: SearchParams, repos: Repos) -> SearchResult:
-    events = repos.events.list_all()
-    if params.q:
-        ql = params.q.lower()
-        events = [
-            e
-            for e in events
-            if ql in (e.title.lower()) or (e.description or "").lower().find(ql) >= 0
-        ]
-    if params.start is not None:
-        events = [e for e in events if e.starts_at >= params.start]
-    if params.to is not None:
-        events = [e for e in events if e.starts_at <= params.to]
-    total = len(events)
-    page = events[params.offset : params.offset + params.limit]
-    out: list[EventPublic] = []
-    for ev in page:
-        confirmed = repos.reservations.count_confirmed(ev.id)
-        waitlisted = repos.reservations.count_waitlisted(ev.id)
-        out.append(to_public(ev, int(confirmed), int(waitlisted)))
-    result: SearchResult = {"events": out, "total": total}
-    return result
+def search_json_ep(params: SearchParams, repos: Repos) -> bytes:
+    """The ``SearchResult`` body, spliced from the events' stored fragments."""
+    page, next_cursor = _search_page(params, repos)
+    return search_json(page.listings, page.total, next_cursor)
 
 
 OK_RESPONSE: Final[dict[str, bool]] = {"ok": True}
@@ -218,6 +269,15 @@ def health_ep() -> dict[str, bool]:
     return OK_RESPONSE
 
 
+def metrics_ep() -> MetricsOut:
+    database = current_database()
+    return {
+        "db_pool": database.pool_stats() if database is not None else None,
+        "event_cache": event_cache().stats(),
+        "search_cache": search_cache().stats(),
+    }
+
+
 # Auth/profile (stateless)
 
 def _profile_id_from_email(email: str) -> str:
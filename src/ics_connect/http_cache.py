@@ -0,0 +1,84 @@
+"""Conditional GETs: ETags, ``If-None-Match`` and per-route Cache-Control."""
+
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass
+
+from starlette.responses import Response
+
+from .settings import Settings
+from .util.etag import etag_matches
+
+_JSON = "application/json"
+
+
+@dataclass(frozen=True)
+class HttpCachePolicy:
+    # Route name ("event", "search") -> Cache-Control value; "" sends none
+    cache_control: dict[str, str]
+    # ETags built from the write generation also change this often (seconds), so
+    # writes made by other processes are noticed within the window; 0 never
+    generation_window: float
+
+    @staticmethod
+    def from_settings(settings: Settings) -> HttpCachePolicy:
+        return HttpCachePolicy(
+            cache_control={
+                "event": settings.cache_control_event,
+                "search": settings.cache_control_search,
+            },
+            generation_window=settings.search_etag_window_seconds,
+        )
+
+
+def _headers(route: str, etag: str) -> dict[str, str]:
+    headers = {"ETag": etag}
+    cache_control = http_cache_policy().cache_control.get(route, "")
+    if cache_control:
+        headers["Cache-Control"] = cache_control
+    return headers
+
+
+def not_modified(route: str, etag: str, if_none_match: str | None) -> Response | None:
+    """The 304 for ``route`` when the client already holds ``etag``, else None."""
+    if not etag_matches(if_none_match, etag):
+        return None
+    return Response(status_code=304, headers=_headers(route, etag))
+
+
+def json_response(route: str, etag: str, body: bytes) -> Response:
+    """A 200 carrying already-serialized JSON, with the route's caching headers."""
+    return Response(content=body, media_type=_JSON, headers=_headers(route, etag))
+
+
+_POLICY: HttpCachePolicy | None = None
+_POLICY_LOCK = threading.Lock()
+
+
+def configure_http_cache(settings: Settings) -> HttpCachePolicy:
+    global _POLICY  # noqa: PLW0603
+    with _POLICY_LOCK:
+        _POLICY = HttpCachePolicy.from_settings(settings)
+        return _POLICY
+
+
+def http_cache_policy() -> HttpCachePolicy:
+    """The process-wide policy, read from the environment on first use."""
+    global _POLICY  # noqa: PLW0603
+    policy = _POLICY
+    if policy is not None:
+        return policy
+    with _POLICY_LOCK:
+        if _POLICY is None:
+            _POLICY = HttpCachePolicy.from_settings(Settings.from_env())
+        return _POLICY
+
+
+__all__ = [
+    "HttpCachePolicy",
+    "configure_http_cache",
+    "http_cache_policy",
+    "json_response",
+    "not_modified",
+]
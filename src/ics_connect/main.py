@@ -1,25 +1,85 @@
 from __future__ import annotations
 
+import asyncio
+import datetime as dt
+import logging
+import os
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from . import __version__
+from .cache import configure_event_cache, configure_search_cache
+from .db import dispose_database, init_database
+from .di import provide_repos
 from .errors import AppError, app_error_handler, unhandled_error_handler
+from .http_cache import configure_http_cache
 from .logging import RequestLoggingMiddleware, get_logger, setup_logging
 from .middleware.rate_limit import RateLimiter, RateLimitMiddleware
 from .routers import events_router, health_router, search_router
+from .services.retention import RetentionInput, RetentionResult, RetentionService
 from .settings import Settings
+from .util.time import utcnow
+
+
+def _archive_once(settings: Settings) -> RetentionResult:
+    data = RetentionInput(
+        cutoff=utcnow() - dt.timedelta(days=settings.archive_after_days),
+        batch_size=settings.archive_batch_size,
+    )
+    result = RetentionResult(events=0, reservations=0, batches=0)
+    for repos in provide_repos():
+        result = RetentionService(repos).archive(data)
+    return result
+
+
+async def _retention_loop(settings: Settings, logger: logging.Logger) -> None:
+    """Run the retention job every ``archive_interval_seconds`` on a worker thread."""
+    while True:
+        await asyncio.sleep(settings.archive_interval_seconds)
+        # A failed run is logged and retried next period rather than ending the loop
+        outcome = (
+            await asyncio.gather(asyncio.to_thread(_archive_once, settings), return_exceptions=True)
+        )[0]
+        if isinstance(outcome, BaseException):
+            logger.error(f"retention failed: {outcome!r}")
+        else:
+            logger.info(
+                f"retention archived events={outcome.events} "
+                f"reservations={outcome.reservations} batches={outcome.batches}"
+            )
 
 
 def create_app() -> FastAPI:
     setup_logging()
     settings = Settings.from_env()
+    configure_event_cache(settings)
+    configure_search_cache(settings)
+    configure_http_cache(settings)
 
-    app = FastAPI(title="ICS Connect API", version=__version__)
+    @asynccontextmanager
+    async def lifespan(_app: FastAPI) -> AsyncIterator[None]:
+        # One engine/pool for the whole process; disposed on shutdown
+        db_url = os.environ.get("DATABASE_URL")
+        if db_url:
+            init_database(db_url, settings)
+        retention = None
+        if settings.archive_interval_seconds > 0:
+            logger = get_logger("ics_connect.retention")
+            retention = asyncio.create_task(_retention_loop(settings, logger))
+        try:
+            yield
+        finally:
+            if retention is not None:
+                retention.cancel()
+                await asyncio.gather(retention, return_exceptions=True)
+            dispose_database()
 
-    # Startup repo-mode log (sql vs memory) based on env
-    import os
+    app = FastAPI(title="ICS Connect API", version=__version__, lifespan=lifespan)
 
+    # Startup repo-mode log (sql vs memory) based on env
     logger = get_logger("ics_connect.startup")
     mode = "sql" if os.environ.get("DATABASE_URL") else "memory"
     logger.info(f"startup repo={mode}")
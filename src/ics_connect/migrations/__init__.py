@@ -0,0 +1,5 @@
+from __future__ import annotations
+
+from .runner import Migration, current_version, latest_version, migrate
+
+__all__ = ["Migration", "current_version", "latest_version", "migrate"]
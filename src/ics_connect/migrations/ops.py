@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+from typing import TypeVar
+
+from sqlalchemy import (
+    Column,
+    Index,
+    Integer,
+    String,
+    column,
+    func,
+    inspect,
+    literal_column,
+    select,
+    table,
+    text,
+)
+from sqlalchemy.engine import Connection
+from sqlalchemy.schema import CreateColumn
+
+from ..util.time import utcnow
+
+_T = TypeVar("_T")
+
+# Arbitrary constant shared by every process that migrates the same database.
+_PG_ADVISORY_LOCK_ID = 7_246_001
+_ADVISORY_LOCK_PARAMS: dict[str, object] = {"id": _PG_ADVISORY_LOCK_ID}
+
+# Typed handle on schema_version.version; table() binds it to its FROM clause
+_VERSION = column("version", Integer)
+_SCHEMA_VERSION = table("schema_version", _VERSION)
+
+
+def ensure_version_table(conn: Connection) -> None:
+    conn.execute(
+        text(
+            "CREATE TABLE IF NOT EXISTS schema_version ("
+            "version INTEGER PRIMARY KEY, "
+            "name VARCHAR NOT NULL, "
+            "applied_at TIMESTAMP NOT NULL)"
+        )
+    )
+
+
+def read_version(conn: Connection) -> int:
+    value: int | None = conn.execute(select(func.max(_VERSION))).scalar_one()
+    return value if value is not None else 0
+
+
+def record_version(conn: Connection, version: int, name: str) -> None:
+    params: dict[str, object] = {"version": version, "name": name, "applied_at": utcnow()}
+    conn.execute(
+        text(
+            "INSERT INTO schema_version (version, name, applied_at) "
+            "VALUES (:version, :name, :applied_at)"
+        ),
+        params,
+    )
+
+
+def advisory_lock(conn: Connection) -> None:
+    if conn.dialect.name == "postgresql":
+        conn.execute(text("SELECT pg_advisory_lock(:id)"), _ADVISORY_LOCK_PARAMS)
+        conn.commit()
+
+
+def advisory_unlock(conn: Connection) -> None:
+    if conn.dialect.name == "postgresql":
+        conn.execute(text("SELECT pg_advisory_unlock(:id)"), _ADVISORY_LOCK_PARAMS)
+        conn.commit()
+
+
+def has_table(conn: Connection, table_name: str) -> bool:
+    return inspect(conn).has_table(table_name)
+
+
+def has_column(conn: Connection, table_name: str, column_name: str) -> bool:
+    # An empty SELECT * still describes every column, on any dialect
+    empty = select(literal_column("*", String)).select_from(table(table_name)).limit(0)
+    names = conn.execute(empty).keys()
+    return column_name in names
+
+
+def has_index(conn: Connection, table_name: str, index: str) -> bool:
+    return inspect(conn).has_index(table_name, index)
+
+
+def add_column(conn: Connection, table_name: str, col: Column[_T]) -> None:
+    """``ALTER TABLE ... ADD COLUMN`` unless the column already exists."""
+    if has_column(conn, table_name, col.name):
+        return
+    ddl = CreateColumn(col).compile(dialect=conn.dialect)
+    conn.execute(text(f"ALTER TABLE {table_name} ADD COLUMN {ddl}"))
+
+
+def create_index(conn: Connection, index: Index) -> None:
+    index.create(conn, checkfirst=True)
+
+
+__all__ = [
+    "add_column",
+    "advisory_lock",
+    "advisory_unlock",
+    "create_index",
+    "ensure_version_table",
+    "has_column",
+    "has_index",
+    "has_table",
+    "read_version",
+    "record_version",
+]
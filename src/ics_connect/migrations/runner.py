@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from sqlalchemy.engine import Connection, Engine
+
+from ..logging import get_logger
+from .ops import (
+    advisory_lock,
+    advisory_unlock,
+    ensure_version_table,
+    read_version,
+    record_version,
+)
+
+
+@dataclass(frozen=True)
+class Migration:
+    version: int
+    name: str
+    upgrade: Callable[[Connection], None]
+
+
+def _version_of(m: Migration) -> int:
+    return m.version
+
+
+def _registered() -> list[Migration]:
+    from .versions import MIGRATIONS
+
+    return sorted(MIGRATIONS, key=_version_of)
+
+
+def latest_version() -> int:
+    migrations = _registered()
+    return migrations[-1].version if migrations else 0
+
+
+def current_version(engine: Engine) -> int:
+    """Return the highest applied migration version (0 for an empty database)."""
+    with engine.begin() as conn:
+        ensure_version_table(conn)
+        return read_version(conn)
+
+
+def migrate(engine: Engine, target: int | None = None) -> list[int]:
+    """Apply pending migrations in order, each in its own transaction.
+
+    Returns the versions that were applied by this call.
+    """
+    logger = get_logger("ics_connect.migrations")
+    applied: list[int] = []
+    # One connection throughout: it holds the lock, and a single-writer pool
+    # (the SQLite production profile) has no second one to hand out.
+    with engine.connect() as conn:
+        # Serialize concurrent app instances migrating the same database.
+        advisory_lock(conn)
+        try:
+            with conn.begin():
+                ensure_version_table(conn)
+                current = read_version(conn)
+            for m in _registered():
+                if m.version <= current or (target is not None and m.version > target):
+                    continue
+                with conn.begin():
+                    m.upgrade(conn)
+                    record_version(conn, m.version, m.name)
+                logger.info(f"migration applied version={m.version} name={m.name}")
+                applied.append(m.version)
+        finally:
+            advisory_unlock(conn)
+    return applied
+
+
+__all__ = ["Migration", "current_version", "latest_version", "migrate"]
@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+from ..runner import Migration
+from . import (
+    m0001_initial,
+    m0002_hot_path_indexes,
+    m0003_event_occupancy_counters,
+    m0004_events_starts_at_id_index,
+    m0005_event_full_text_search,
+    m0006_reservation_email_normalized,
+    m0007_archive_tables,
+    m0008_event_public_json,
+)
+
+# Ordered list of schema migrations; append new versions at the end.
+MIGRATIONS: list[Migration] = [
+    Migration(1, "initial", m0001_initial.upgrade),
+    Migration(2, "hot_path_indexes", m0002_hot_path_indexes.upgrade),
+    Migration(3, "event_occupancy_counters", m0003_event_occupancy_counters.upgrade),
+    Migration(4, "events_starts_at_id_index", m0004_events_starts_at_id_index.upgrade),
+    Migration(5, "event_full_text_search", m0005_event_full_text_search.upgrade),
+    Migration(6, "reservation_email_normalized", m0006_reservation_email_normalized.upgrade),
+    Migration(7, "archive_tables", m0007_archive_tables.upgrade),
+    Migration(8, "event_public_json", m0008_event_public_json.upgrade),
+]
+
+__all__ = ["MIGRATIONS"]
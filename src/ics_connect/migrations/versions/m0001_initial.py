@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+from sqlalchemy import (
+    Boolean,
+    Column,
+    DateTime,
+    Index,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    Text,
+    text,
+)
+from sqlalchemy.engine import Connection
+
+_metadata = MetaData()
+
+Table(
+    "events",
+    _metadata,
+    Column("id", String, primary_key=True),
+    Column("title", String, nullable=False),
+    Column("description", String, nullable=True),
+    Column("type", String, nullable=True),
+    Column("starts_at", DateTime, nullable=False),
+    Column("ends_at", DateTime, nullable=False),
+    Column("location_text", String, nullable=True),
+    Column("tags_json", Text, nullable=False),
+    Column("public", Boolean, nullable=False),
+    Column("requires_join_code", Boolean, nullable=False),
+    Column("join_code_hash", String, nullable=True),
+    Column("admin_key_hash", String, nullable=False),
+    Column("capacity", Integer, nullable=False),
+    Column("waitlist_enabled", Boolean, nullable=False),
+    Column("discord_link", String, nullable=True),
+    Column("website_link", String, nullable=True),
+    Column("created_at", DateTime, nullable=False),
+)
+
+Table(
+    "reservations",
+    _metadata,
+    Column("id", String, primary_key=True),
+    Column("event_id", String, nullable=False),
+    Column("user_id", String, nullable=True),
+    Column("display_name", String, nullable=False),
+    Column("email", String, nullable=True),
+    Column("status", String, nullable=False),
+    Column("promoted_at", DateTime, nullable=True),
+    Column("created_at", DateTime, nullable=False),
+    Index(
+        "idx_unique_active_user_reservation",
+        "event_id",
+        "user_id",
+        unique=True,
+        postgresql_where=text("status != 'canceled' AND user_id IS NOT NULL"),
+        sqlite_where=text("status != 'canceled' AND user_id IS NOT NULL"),
+    ),
+)
+
+
+def upgrade(conn: Connection) -> None:
+    # Baseline schema previously produced by metadata.create_all. checkfirst lets
+    # databases bootstrapped that way be adopted as version 1 unchanged.
+    _metadata.create_all(conn, checkfirst=True)
@@ -0,0 +1,15 @@
+from __future__ import annotations
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+_STATEMENTS = (
+    "CREATE INDEX IF NOT EXISTS ix_reservations_event_status_created "
+    "ON reservations (event_id, status, created_at)",
+    "CREATE INDEX IF NOT EXISTS ix_events_starts_at ON events (starts_at)",
+)
+
+
+def upgrade(conn: Connection) -> None:
+    for stmt in _STATEMENTS:
+        conn.execute(text(stmt))
@@ -0,0 +1,20 @@
+from __future__ import annotations
+
+from sqlalchemy import Column, Integer, text
+from sqlalchemy.engine import Connection
+
+from ..ops import add_column
+
+_BACKFILL = (
+    "UPDATE events SET "
+    "confirmed_count = (SELECT COUNT(*) FROM reservations r "
+    "WHERE r.event_id = events.id AND r.status = 'confirmed'), "
+    "waitlist_count = (SELECT COUNT(*) FROM reservations r "
+    "WHERE r.event_id = events.id AND r.status = 'waitlisted')"
+)
+
+
+def upgrade(conn: Connection) -> None:
+    for name in ("confirmed_count", "waitlist_count"):
+        add_column(conn, "events", Column(name, Integer, nullable=False, server_default="0"))
+    conn.execute(text(_BACKFILL))
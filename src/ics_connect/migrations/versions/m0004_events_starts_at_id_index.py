@@ -0,0 +1,13 @@
+from __future__ import annotations
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+
+def upgrade(conn: Connection) -> None:
+    # Search orders by (starts_at, id); a composite index serves the whole
+    # ORDER BY without a sort step and supersedes the single-column index.
+    conn.execute(
+        text("CREATE INDEX IF NOT EXISTS ix_events_starts_at_id ON events (starts_at, id)")
+    )
+    conn.execute(text("DROP INDEX IF EXISTS ix_events_starts_at"))
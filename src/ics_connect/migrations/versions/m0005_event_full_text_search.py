@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+# SQLite: FTS5 table written by the event repository alongside each event.
+_SQLITE = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS events_fts USING fts5("
+    "event_id UNINDEXED, title, description, tokenize = 'unicode61 remove_diacritics 2')",
+    "DELETE FROM events_fts",
+    "INSERT INTO events_fts (event_id, title, description) "
+    "SELECT id, title, COALESCE(description, '') FROM events",
+)
+
+# Postgres: a generated tsvector column (maintained by the database) with a GIN index.
+_POSTGRES = (
+    "ALTER TABLE events ADD COLUMN IF NOT EXISTS search_vector tsvector "
+    "GENERATED ALWAYS AS (to_tsvector('english', "
+    "coalesce(title, '') || ' ' || coalesce(description, ''))) STORED",
+    "CREATE INDEX IF NOT EXISTS ix_events_search_vector ON events USING GIN (search_vector)",
+)
+
+
+def upgrade(conn: Connection) -> None:
+    statements: tuple[str, ...]
+    if conn.dialect.name == "sqlite":
+        statements = _SQLITE
+    elif conn.dialect.name == "postgresql":
+        statements = _POSTGRES
+    else:
+        # Other dialects keep the LIKE search and need no schema
+        return
+    for stmt in statements:
+        conn.execute(text(stmt))
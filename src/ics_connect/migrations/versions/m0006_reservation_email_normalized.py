@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+from sqlalchemy import Column, String, text
+from sqlalchemy.engine import Connection
+
+from ..ops import add_column
+
+# Same normalization the former lookup applied in SQL (lower(email)), plus trimming
+_BACKFILL = (
+    "UPDATE reservations SET email_normalized = lower(trim(email)) "
+    "WHERE email IS NOT NULL AND email_normalized IS NULL"
+)
+
+# Anonymous duplicates that slipped in before the index existed keep their rows but
+# lose the key, so the oldest one stays the reservation the email resolves to
+_UNKEY_DUPLICATES = (
+    "UPDATE reservations SET email_normalized = NULL "
+    "WHERE email_normalized IS NOT NULL AND status != 'canceled' AND user_id IS NULL "
+    "AND EXISTS ("
+    "SELECT 1 FROM reservations o "
+    "WHERE o.event_id = reservations.event_id "
+    "AND o.email_normalized = reservations.email_normalized "
+    "AND o.status != 'canceled' AND o.user_id IS NULL "
+    "AND (o.created_at < reservations.created_at "
+    "OR (o.created_at = reservations.created_at AND o.id < reservations.id)))"
+)
+
+_INDEX = (
+    "CREATE UNIQUE INDEX IF NOT EXISTS ux_reservations_event_email_active "
+    "ON reservations (event_id, email_normalized) "
+    "WHERE status != 'canceled' AND user_id IS NULL"
+)
+
+
+def upgrade(conn: Connection) -> None:
+    add_column(conn, "reservations", Column("email_normalized", String, nullable=True))
+    for stmt in (_BACKFILL, _UNKEY_DUPLICATES, _INDEX):
+        conn.execute(text(stmt))
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+from sqlalchemy import Boolean, Column, DateTime, Index, Integer, MetaData, String, Table, Text
+from sqlalchemy.engine import Connection
+
+_metadata = MetaData()
+
+# Same columns as ``events`` / ``reservations`` at version 6, plus when the row moved.
+# Plain tables: no foreign keys, unique or partial indexes, or full-text side index.
+Table(
+    "events_archive",
+    _metadata,
+    Column("id", String, primary_key=True),
+    Column("title", String, nullable=False),
+    Column("description", String, nullable=True),
+    Column("type", String, nullable=True),
+    Column("starts_at", DateTime, nullable=False),
+    Column("ends_at", DateTime, nullable=False),
+    Column("location_text", String, nullable=True),
+    Column("tags_json", Text, nullable=False),
+    Column("public", Boolean, nullable=False),
+    Column("requires_join_code", Boolean, nullable=False),
+    Column("join_code_hash", String, nullable=True),
+    Column("admin_key_hash", String, nullable=False),
+    Column("capacity", Integer, nullable=False),
+    Column("waitlist_enabled", Boolean, nullable=False),
+    Column("discord_link", String, nullable=True),
+    Column("website_link", String, nullable=True),
+    Column("created_at", DateTime, nullable=False),
+    Column("confirmed_count", Integer, nullable=False, server_default="0"),
+    Column("waitlist_count", Integer, nullable=False, server_default="0"),
+    Column("archived_at", DateTime, nullable=False),
+    Index("ix_events_archive_starts_at_id", "starts_at", "id"),
+)
+
+Table(
+    "reservations_archive",
+    _metadata,
+    Column("id", String, primary_key=True),
+    Column("event_id", String, nullable=False),
+    Column("user_id", String, nullable=True),
+    Column("display_name", String, nullable=False),
+    Column("email", String, nullable=True),
+    Column("email_normalized", String, nullable=True),
+    Column("status", String, nullable=False),
+    Column("promoted_at", DateTime, nullable=True),
+    Column("created_at", DateTime, nullable=False),
+    Column("archived_at", DateTime, nullable=False),
+    Index("ix_reservations_archive_event_id", "event_id"),
+)
+
+
+def upgrade(conn: Connection) -> None:
+    _metadata.create_all(conn, checkfirst=True)
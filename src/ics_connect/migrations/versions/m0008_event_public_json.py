@@ -0,0 +1,13 @@
+from __future__ import annotations
+
+from sqlalchemy import Column, Text
+from sqlalchemy.engine import Connection
+
+from ..ops import add_column
+
+
+# No backfill: rendering is application code, and reads render a fragment for rows
+# that have none (with the same UTC times). Events created from now on store theirs.
+def upgrade(conn: Connection) -> None:
+    for table in ("events", "events_archive"):
+        add_column(conn, table, Column("public_json", Text, nullable=True))
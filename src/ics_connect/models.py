@@ -1,12 +1,16 @@
 from __future__ import annotations
 
 import datetime as dt
+import sys
 from dataclasses import dataclass, field
+from typing import NamedTuple
 
 from .util.time import utcnow
 
 
-@dataclass
+# Slotted: the in-memory store holds these by the million, and a slotted
+# instance carries no per-object __dict__
+@dataclass(slots=True)
 class Event:
     id: str
     title: str
@@ -25,6 +29,38 @@ class Event:
     discord_link: str | None
     website_link: str | None
     created_at: dt.datetime = field(default_factory=utcnow)
+    # Public JSON minus the counts (rendering.event_fragment), rendered when the
+    # event is written; "" until then
+    public_json: str = ""
+
+    def __post_init__(self) -> None:
+        # Shared with every reservation's event_id (see Reservation)
+        self.id = sys.intern(self.id)
+
+
+class EventListing(NamedTuple):
+    """The public columns of an event plus its occupancy: all that listings render.
+
+    A plain tuple rather than an ``Event``: listing reads select exactly these
+    columns (never the secret hashes or tags) and build one per result row.
+    """
+
+    id: str
+    title: str
+    description: str | None
+    type: str | None
+    starts_at: dt.datetime
+    ends_at: dt.datetime
+    location_text: str | None
+    discord_link: str | None
+    website_link: str | None
+    public: bool
+    capacity: int
+    requires_join_code: bool
+    confirmed_count: int
+    waitlist_count: int
+    # Event.public_json; None (or "") for rows written before it was stored
+    public_json: str | None = None
 
 
 class ReservationStatus:
@@ -33,7 +69,54 @@ class ReservationStatus:
     CANCELED = "canceled"
 
 
-@dataclass
+@dataclass(slots=True)
+class Occupancy:
+    """Denormalized per-event reservation counters."""
+
+    confirmed: int = 0
+    waitlisted: int = 0
+
+
+def occupancy_delta(old_status: str | None, new_status: str | None) -> tuple[int, int]:
+    """Return the (confirmed, waitlisted) counter change for a status transition.
+
+    ``None`` stands for "no reservation" (before create / after delete).
+    """
+    confirmed = int(new_status == ReservationStatus.CONFIRMED) - int(
+        old_status == ReservationStatus.CONFIRMED
+    )
+    waitlisted = int(new_status == ReservationStatus.WAITLISTED) - int(
+        old_status == ReservationStatus.WAITLISTED
+    )
+    return confirmed, waitlisted
+
+
+def event_listing(ev: Event, occ: Occupancy) -> EventListing:
+    return EventListing(
+        id=ev.id,
+        title=ev.title,
+        description=ev.description,
+        type=ev.type,
+        starts_at=ev.starts_at,
+        ends_at=ev.ends_at,
+        location_text=ev.location_text,
+        discord_link=ev.discord_link,
+        website_link=ev.website_link,
+        public=ev.public,
+        capacity=ev.capacity,
+        requires_join_code=ev.requires_join_code,
+        confirmed_count=occ.confirmed,
+        waitlist_count=occ.waitlisted,
+        public_json=ev.public_json,
+    )
+
+
+def normalize_email(email: str) -> str:
+    """Canonical form used to match reservations by email (trimmed, lowercased)."""
+    return email.strip().lower()
+
+
+@dataclass(slots=True)
 class Reservation:
     id: str
     event_id: str
@@ -43,3 +126,9 @@ class Reservation:
     status: str
     promoted_at: dt.datetime | None
     created_at: dt.datetime = field(default_factory=utcnow)
+
+    def __post_init__(self) -> None:
+        # A handful of distinct values repeated across millions of rows: keep one
+        # string object each instead of a copy per reservation
+        self.event_id = sys.intern(self.event_id)
+        self.status = sys.intern(self.status)
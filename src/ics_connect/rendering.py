@@ -0,0 +1,103 @@
+"""Public event JSON, rendered once per event and completed with live counts per read.
+
+An event's public fields never change after creation; only its confirmed and
+waitlist counts do. ``event_fragment`` serializes everything but the counts (the
+object left open, ``{"id":...,"requires_join_code":false``) when the event is
+written, and it is stored with the event (``Event.public_json``, the
+``events.public_json`` column). Responses append the counts to that prefix, so a
+read builds no dict and encodes nothing but two integers. The result is
+byte-for-byte what encoding ``EventPublic`` would produce: the counts are its
+last two keys. Times are rendered as aware UTC on every path, so a fragment
+stored at write time and one rendered from a row read back later agree.
+"""
+
+from __future__ import annotations
+
+import json
+
+from pydantic import TypeAdapter
+
+from .models import Event, EventListing
+from .types import EventPublic
+from .util.time import as_utc
+
+_EVENT_JSON: TypeAdapter[EventPublic] = TypeAdapter(EventPublic)
+# What the encoder writes for the counts of a fresh event, stripped off the fragment
+_ZERO_COUNTS = b',"confirmed_count":0,"waitlist_count":0}'
+
+
+def to_public(ev: Event, confirmed: int, waitlisted: int) -> EventPublic:
+    return {
+        "id": ev.id,
+        "title": ev.title,
+        "description": ev.description,
+        "type": ev.type,
+        "starts_at": as_utc(ev.starts_at),
+        "ends_at": as_utc(ev.ends_at),
+        "location_text": ev.location_text,
+        "discord_link": ev.discord_link,
+        "website_link": ev.website_link,
+        "tags": [],
+        "public": ev.public,
+        "capacity": ev.capacity,
+        "requires_join_code": ev.requires_join_code,
+        "confirmed_count": confirmed,
+        "waitlist_count": waitlisted,
+    }
+
+
+def listing_public(row: EventListing) -> EventPublic:
+    """Render a projected listing row; its counts came in the same read."""
+    return {
+        "id": row.id,
+        "title": row.title,
+        "description": row.description,
+        "type": row.type,
+        "starts_at": as_utc(row.starts_at),
+        "ends_at": as_utc(row.ends_at),
+        "location_text": row.location_text,
+        "discord_link": row.discord_link,
+        "website_link": row.website_link,
+        "tags": [],
+        "public": row.public,
+        "capacity": row.capacity,
+        "requires_join_code": row.requires_join_code,
+        "confirmed_count": row.confirmed_count,
+        "waitlist_count": row.waitlist_count,
+    }
+
+
+def _fragment(pub: EventPublic) -> str:
+    zeroed: EventPublic = {**pub, "confirmed_count": 0, "waitlist_count": 0}
+    encoded = _EVENT_JSON.dump_json(zeroed)
+    if not encoded.endswith(_ZERO_COUNTS):
+        # Splicing counts onto anything else would produce invalid or reordered JSON
+        raise RuntimeError("EventPublic no longer ends with its counts")
+    return encoded.removesuffix(_ZERO_COUNTS).decode()
+
+
+def event_fragment(ev: Event) -> str:
+    """The public JSON of ``ev`` without its counts; render when the event is written."""
+    return _fragment(to_public(ev, 0, 0))
+
+
+def _listing_json(row: EventListing) -> str:
+    # Rows written before fragments were stored render one on the spot
+    fragment = row.public_json or _fragment(listing_public(row))
+    counts = f'"confirmed_count":{row.confirmed_count},"waitlist_count":{row.waitlist_count}'
+    return f"{fragment},{counts}}}"
+
+
+def event_json(row: EventListing) -> bytes:
+    """``row`` as ``EventPublic`` JSON: its stored fragment plus the row's counts."""
+    return _listing_json(row).encode()
+
+
+def search_json(rows: list[EventListing], total: int, next_cursor: str | None) -> bytes:
+    """A ``SearchResult`` body spliced from the rows' fragments."""
+    events = ",".join(_listing_json(row) for row in rows)
+    cursor = json.dumps(next_cursor)
+    return f'{{"events":[{events}],"total":{total},"next_cursor":{cursor}}}'.encode()
+
+
+__all__ = ["event_fragment", "event_json", "listing_public", "search_json", "to_public"]
@@ -0,0 +1,58 @@
+"""Paging ``include_past`` searches over live events and the archive together."""
+
+from __future__ import annotations
+
+import datetime as dt
+import heapq
+from dataclasses import replace
+from typing import Protocol, TypeVar
+
+from .protocols import EventQuery
+
+
+class _Positioned(Protocol):
+    @property
+    def starts_at(self) -> dt.datetime: ...  # pragma: no cover - protocol
+
+    @property
+    def id(self) -> str: ...  # pragma: no cover - protocol
+
+
+_P = TypeVar("_P", bound=_Positioned)
+
+
+def _position(item: _Positioned) -> tuple[dt.datetime, str]:
+    return (item.starts_at, item.id)
+
+
+def past_window(query: EventQuery) -> EventQuery:
+    """The query each source (live, archive) answers for an ``include_past`` page.
+
+    Either source may hold every row up to the end of the requested page, so each
+    returns that many from the start of the range, plus one to detect a next page.
+    """
+    return replace(
+        query,
+        include_past=False,
+        order="starts_at",
+        offset=0,
+        limit=query.offset + max(query.limit, 0) + 1,
+    )
+
+
+def merge_past(
+    live: list[_P], archived: list[_P], query: EventQuery
+) -> tuple[list[_P], tuple[dt.datetime, str] | None]:
+    """Interleave two ``past_window`` results by (starts_at, id); cut ``query``'s page.
+
+    Returns the page and, when more rows follow it, the keyset position to resume at.
+    """
+    limit = max(query.limit, 0)
+    merged = list(heapq.merge(live, archived, key=_position))
+    page = merged[query.offset : query.offset + limit + 1]
+    more = len(page) > limit
+    del page[limit:]
+    return page, _position(page[-1]) if more and page else None
+
+
+__all__ = ["merge_past", "past_window"]
@@ -1,97 +1,381 @@
 from __future__ import annotations
 
 import datetime as dt
+import heapq
+from bisect import bisect_right
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import replace
+from functools import partial
+from itertools import islice
 
-from ..db import Store
-from ..models import Event, Reservation, ReservationStatus
-from .protocols import EventRepository, Repos, ReservationRepository
+from ..db import ArchiveStore, Store
+from ..models import (
+    Event,
+    EventListing,
+    Occupancy,
+    Reservation,
+    ReservationStatus,
+    event_listing,
+    occupancy_delta,
+)
+from ..util.time import utcnow
+from .archive import merge_past, past_window
+from .inmemory_index import EventIndex, SortKey
+from .protocols import (
+    ArchiveBatch,
+    CancelOutcome,
+    DuplicateReservationError,
+    EventPage,
+    EventQuery,
+    EventRepository,
+    ListingPage,
+    Repos,
+    ReservationRepository,
+)
+
+
+class _Journal:
+    """Undo log standing in for database transactions over the in-memory store.
+
+    Writes made inside ``InMemoryRepos.transaction()`` record how to revert
+    themselves; a failing unit of work (or savepoint) replays them newest-first
+    back to where it started.
+    """
+
+    def __init__(self) -> None:
+        self.depth = 0
+        self._undo: list[Callable[[], None]] = []
+
+    def record(self, undo: Callable[[], None]) -> None:
+        if self.depth:
+            self._undo.append(undo)
+
+    def mark(self) -> int:
+        return len(self._undo)
+
+    def rollback_to(self, mark: int) -> None:
+        while len(self._undo) > mark:
+            self._undo.pop()()
+
+    def clear(self) -> None:
+        self._undo.clear()
+
+
+def _events(events: dict[str, Event], keys: list[SortKey]) -> list[Event]:
+    return [events[event_id] for _, event_id in keys]
+
+
+def _search_index(index: EventIndex, events: dict[str, Event], query: EventQuery) -> EventPage:
+    """``EventRepository.search`` over one set of events (live, or archived) and its index."""
+    limit = max(query.limit, 0)
+    if not query.q:
+        # Pure date-range listing: bisect the sorted keys, no matching or sorting
+        total = index.count_range(query.start, query.to)
+        keys = index.keys_after(query.after, query.start, query.to, query.offset, limit + 1)
+    else:
+        matched = index.matching_keys(query.q, query.start, query.to)
+        total = len(matched)
+        if query.ranked:
+            # Same ranking as the LIKE fallback: title hits before description-only hits
+            ranked = index.title_hits_first(matched, query.q)
+            return EventPage(
+                events=_events(events, ranked[query.offset : query.offset + limit]),
+                total=total,
+            )
+        begin = query.offset
+        if query.after is not None:
+            begin += bisect_right(matched, query.after)
+        keys = matched[begin : begin + limit + 1]
+    more = len(keys) > limit
+    page = _events(events, keys[:limit])
+    return EventPage(
+        events=page,
+        total=total,
+        next_after=(page[-1].starts_at, page[-1].id) if more and page else None,
+    )
+
+
+def _archive(
+    archive: ArchiveStore,
+    reservations: list[Reservation],
+    event: Event | None = None,
+    occupancy: Occupancy | None = None,
+) -> None:
+    for r in reservations:
+        archive.reservations[r.id] = r
+    if event is not None:
+        archive.event_index.add(event)
+        archive.events[event.id] = event
+        archive.occupancy[event.id] = occupancy or Occupancy()
+
+
+def _unarchive(
+    archive: ArchiveStore, reservations: list[Reservation], event: Event | None = None
+) -> None:
+    for r in reservations:
+        archive.reservations.pop(r.id, None)
+    if event is not None:
+        archive.events.pop(event.id, None)
+        archive.event_index.remove(event.id)
+        archive.occupancy.pop(event.id, None)
 
 
 class _EventRepo(EventRepository):
-    def __init__(self, store: Store) -> None:
+    def __init__(self, store: Store, journal: _Journal, reservations: _ReservationRepo) -> None:
         self._store = store
+        self._journal = journal
+        # Archiving an event moves its reservations through their repository
+        self._reservations = reservations
 
     def get(self, event_id: str) -> Event | None:
         return self._store.events.get(event_id)
 
     def create(self, event: Event) -> None:
-        self._store.events[event.id] = event
+        with self._store.lock:
+            previous = self._store.events.get(event.id)
+            self._apply(previous, event)
+            self._journal.record(partial(self._apply, event, previous))
+
+    def _apply(self, old: Event | None, new: Event | None) -> None:
+        """Replace the stored event ``old`` by ``new`` (None = absent), with its index."""
+        store = self._store
+        if new is None:
+            if old is not None:
+                del store.events[old.id]
+                store.event_index.remove(old.id)
+                store.occupancy.pop(old.id, None)
+            return
+        # Index first: if it rejects the event, the store has not taken it either
+        store.event_index.add(new)
+        store.events[new.id] = new
+        store.occupancy.setdefault(new.id, Occupancy())
 
     def list_all(self) -> list[Event]:
         return list(self._store.events.values())
 
+    def search(self, query: EventQuery) -> EventPage:
+        store = self._store
+        if not query.include_past:
+            return _search_index(store.event_index, store.events, query)
+        window = past_window(query)
+        live = _search_index(store.event_index, store.events, window)
+        past = _search_index(store.archive.event_index, store.archive.events, window)
+        events, next_after = merge_past(live.events, past.events, query)
+        return EventPage(events=events, total=live.total + past.total, next_after=next_after)
+
+    def get_listing(self, event_id: str) -> EventListing | None:
+        ev = self._store.events.get(event_id)
+        return None if ev is None else self._listing(ev)
+
+    def search_listings(self, query: EventQuery) -> ListingPage:
+        page = self.search(query)
+        listings = [self._listing(ev) for ev in page.events]
+        return ListingPage(listings=listings, total=page.total, next_after=page.next_after)
+
+    def _listing(self, ev: Event) -> EventListing:
+        occupancy = self._store.occupancy.get(ev.id) or self._store.archive.occupancy.get(ev.id)
+        return event_listing(ev, occupancy or Occupancy())
+
+    def archive_ended(self, cutoff: dt.datetime, limit: int) -> ArchiveBatch:
+        store = self._store
+        with store.lock:
+            # Keys up to the cutoff, earliest first; starts_at <= ends_at
+            started = store.event_index.matching_keys(None, None, cutoff)
+            candidates = (store.events[eid] for _, eid in started)
+            ended = list(
+                islice((ev for ev in candidates if ev.ends_at < cutoff), max(limit, 0))
+            )
+            moved = 0
+            for ev in ended:
+                index = store.reservation_index
+                rows = [store.reservations[rid] for rid in index.event_reservation_ids(ev.id)]
+                occupancy = replace(store.occupancy.get(ev.id) or Occupancy())
+                for r in rows:
+                    self._reservations.drop(r)
+                self._apply(ev, None)
+                self._journal.record(partial(self._apply, None, ev))
+                _archive(store.archive, rows, ev, occupancy)
+                self._journal.record(partial(_unarchive, store.archive, rows, ev))
+                moved += len(rows)
+        return ArchiveBatch(events=len(ended), reservations=moved)
+
+
+def _created_at(r: Reservation) -> dt.datetime:
+    return r.created_at
+
+
+def _copy(r: Reservation | None) -> Reservation | None:
+    # Hand out copies so callers mutating a reservation cannot bypass update()
+    # (which needs the stored status to adjust the counters).
+    return replace(r) if r is not None else None
+
 
 class _ReservationRepo(ReservationRepository):
-    def __init__(self, store: Store) -> None:
+    def __init__(self, store: Store, journal: _Journal) -> None:
         self._store = store
+        self._journal = journal
+
+    def _adjust(self, event_id: str, old_status: str | None, new_status: str | None) -> None:
+        d_confirmed, d_waitlisted = occupancy_delta(old_status, new_status)
+        occ = self._store.occupancy.setdefault(event_id, Occupancy())
+        occ.confirmed += d_confirmed
+        occ.waitlisted += d_waitlisted
 
     def get(self, reservation_id: str) -> Reservation | None:
-        return self._store.reservations.get(reservation_id)
+        return _copy(self._store.reservations.get(reservation_id))
+
+    def _apply(self, old: Reservation | None, new: Reservation | None) -> None:
+        """Replace stored version ``old`` by ``new`` (None = absent): row, indexes, counters."""
+        store = self._store
+        if old is not None:
+            del store.reservations[old.id]
+        if new is not None:
+            store.reservations[new.id] = new
+        if old is not None and new is not None:
+            store.reservation_index.replace(old, new)
+        elif old is not None:
+            store.reservation_index.remove(old)
+        elif new is not None:
+            store.reservation_index.add(new)
+        ref = new if new is not None else old
+        if ref is not None:
+            self._adjust(ref.event_id, old.status if old else None, new.status if new else None)
+
+    def _put(self, old: Reservation | None, new: Reservation) -> None:
+        self._apply(old, new)
+        self._journal.record(partial(self._apply, new, old))
+
+    def drop(self, reservation: Reservation) -> None:
+        """Remove a stored reservation outright (archiving), undoably."""
+        self._apply(reservation, None)
+        self._journal.record(partial(self._apply, None, reservation))
 
     def create(self, reservation: Reservation) -> None:
-        self._store.reservations[reservation.id] = reservation
+        with self._store.lock:
+            self._put(None, replace(reservation))
+
+    def create_within_capacity(self, reservation: Reservation) -> Reservation | None:
+        index = self._store.reservation_index
+        with self._store.lock:
+            if reservation.user_id is not None:
+                duplicate = index.active_by_user(reservation.event_id, reservation.user_id)
+            elif reservation.email:
+                duplicate = index.active_by_email(reservation.event_id, reservation.email)
+            else:
+                duplicate = None
+            if duplicate is not None:
+                raise DuplicateReservationError(reservation.event_id)
+            event = self._store.events.get(reservation.event_id)
+            if event is None:
+                return None
+            occ = self._store.occupancy.get(event.id) or Occupancy()
+            if occ.confirmed < event.capacity:
+                status = ReservationStatus.CONFIRMED
+            elif event.waitlist_enabled:
+                status = ReservationStatus.WAITLISTED
+            else:
+                return None
+            placed = replace(reservation, status=status)
+            self.create(placed)
+            return placed
 
     def update(self, reservation: Reservation) -> None:
-        self._store.reservations[reservation.id] = reservation
+        with self._store.lock:
+            old = self._store.reservations.get(reservation.id)
+            if old is None:
+                return
+            self._put(old, replace(reservation))
 
-    def count_confirmed(self, event_id: str) -> int:
-        return int(
-            sum(
-                1
-                for r in self._store.reservations.values()
-                if r.event_id == event_id and r.status == ReservationStatus.CONFIRMED
+    def cancel_and_promote(self, event_id: str, reservation_id: str) -> CancelOutcome | None:
+        with self._store.lock:
+            current = self._store.reservations.get(reservation_id)
+            if current is None or current.event_id != event_id:
+                return None
+            previous = current.status
+            if previous == ReservationStatus.CANCELED:
+                return CancelOutcome(previous)
+            self.update(replace(current, status=ReservationStatus.CANCELED))
+            if previous != ReservationStatus.CONFIRMED:
+                return CancelOutcome(previous)
+            head = self._store.reservation_index.oldest_waitlisted(event_id)
+            if head is not None:
+                promoted = self._store.reservations[head]
+                self.update(
+                    replace(promoted, status=ReservationStatus.CONFIRMED, promoted_at=utcnow())
+                )
+            return CancelOutcome(previous, head)
+
+    def occupancy(self, event_id: str) -> Occupancy:
+        return replace(self._store.occupancy.get(event_id) or Occupancy())
+
+    def counts_for_events(self, event_ids: list[str]) -> dict[str, Occupancy]:
+        occupancy = self._store.occupancy
+        return {eid: replace(occupancy.get(eid) or Occupancy()) for eid in event_ids}
+
+    def recompute_occupancy(self) -> int:
+        # Counted under the lock: a concurrent reserve would resize the dicts mid-scan
+        with self._store.lock:
+            actual: dict[str, Occupancy] = {eid: Occupancy() for eid in self._store.events}
+            for r in self._store.reservations.values():
+                occ = actual.setdefault(r.event_id, Occupancy())
+                if r.status == ReservationStatus.CONFIRMED:
+                    occ.confirmed += 1
+                elif r.status == ReservationStatus.WAITLISTED:
+                    occ.waitlisted += 1
+            previous = self._store.occupancy
+            repaired = sum(1 for eid, occ in actual.items() if previous.get(eid) != occ)
+            self._store.occupancy = actual
+            self._journal.record(partial(self._set_occupancy, previous))
+        return repaired
+
+    def _set_occupancy(self, occupancy: dict[str, Occupancy]) -> None:
+        self._store.occupancy = occupancy
+
+    def archive_canceled(self, cutoff: dt.datetime, limit: int) -> int:
+        store = self._store
+        with store.lock:
+            canceled = (
+                r
+                for r in store.reservations.values()
+                if r.status == ReservationStatus.CANCELED and r.created_at < cutoff
             )
-        )
+            rows = heapq.nsmallest(max(limit, 0), canceled, key=_created_at)
+            for r in rows:
+                self.drop(r)
+            _archive(store.archive, rows)
+            self._journal.record(partial(_unarchive, store.archive, rows))
+        return len(rows)
+
+    def count_confirmed(self, event_id: str) -> int:
+        return self._store.reservation_index.count(event_id, ReservationStatus.CONFIRMED)
 
     def count_waitlisted(self, event_id: str) -> int:
-        return int(
-            sum(
-                1
-                for r in self._store.reservations.values()
-                if r.event_id == event_id and r.status == ReservationStatus.WAITLISTED
-            )
-        )
+        return self._store.reservation_index.count(event_id, ReservationStatus.WAITLISTED)
 
     def find_oldest_waitlisted(self, event_id: str) -> Reservation | None:
-        waitlisted_list = [
-            r
-            for r in self._store.reservations.values()
-            if r.event_id == event_id and r.status == ReservationStatus.WAITLISTED
-        ]
-        def _created_at(res: Reservation) -> dt.datetime:
-            return res.created_at
-        waitlisted_sorted = sorted(waitlisted_list, key=_created_at)
-        return waitlisted_sorted[0] if waitlisted_sorted else None
+        return self._get_indexed(self._store.reservation_index.oldest_waitlisted(event_id))
 
     def find_active_by_event_and_user(
         self, event_id: str, user_id: str
     ) -> Reservation | None:
-        for r in self._store.reservations.values():
-            if (
-                r.event_id == event_id
-                and r.user_id == user_id
-                and r.status != ReservationStatus.CANCELED
-            ):
-                return r
-        return None
+        return self._get_indexed(self._store.reservation_index.active_by_user(event_id, user_id))
 
     def find_active_by_event_and_email(self, event_id: str, email: str) -> Reservation | None:
-        email_l = email.strip().lower()
-        for r in self._store.reservations.values():
-            if (
-                r.event_id == event_id
-                and r.email is not None
-                and r.email.strip().lower() == email_l
-                and r.status != ReservationStatus.CANCELED
-            ):
-                return r
-        return None
+        return self._get_indexed(self._store.reservation_index.active_by_email(event_id, email))
+
+    def _get_indexed(self, reservation_id: str | None) -> Reservation | None:
+        if reservation_id is None:
+            return None
+        return _copy(self._store.reservations[reservation_id])
 
 
 class InMemoryRepos(Repos):
     def __init__(self, store: Store) -> None:
-        self._events = _EventRepo(store)
-        self._res = _ReservationRepo(store)
+        self._store = store
+        self._journal = _Journal()
+        self._res = _ReservationRepo(store, self._journal)
+        self._events = _EventRepo(store, self._journal, self._res)
 
     @property
     def events(self) -> EventRepository:
@@ -101,5 +385,22 @@ class InMemoryRepos(Repos):
     def reservations(self) -> ReservationRepository:
         return self._res
 
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        journal = self._journal
+        # The store lock isolates the whole unit of work, like a database write lock
+        with self._store.lock:
+            mark = journal.mark()
+            journal.depth += 1
+            try:
+                yield
+            except BaseException:
+                journal.rollback_to(mark)
+                raise
+            finally:
+                journal.depth -= 1
+                if not journal.depth:
+                    journal.clear()
+
 
 __all__ = ["InMemoryRepos"]
@@ -0,0 +1,325 @@
+from __future__ import annotations
+
+import datetime as dt
+from bisect import bisect_left, bisect_right, insort
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from itertools import count
+
+from ..models import Event, Reservation, ReservationStatus, normalize_email
+
+_GRAM = 3
+# Walk the date range instead of the postings unless they are this many times smaller
+_WALK_RATIO = 4
+_EMPTY: frozenset[str] = frozenset()
+
+# Position in (starts_at, id) order
+SortKey = tuple[dt.datetime, str]
+
+
+def _starts_at(key: SortKey) -> dt.datetime:
+    return key[0]
+
+
+def trigrams(text: str) -> set[str]:
+    return {text[i : i + _GRAM] for i in range(len(text) - _GRAM + 1)}
+
+
+@dataclass(frozen=True)
+class _Doc:
+    key: SortKey
+    title: str
+    description: str
+
+    def contains(self, needle: str) -> bool:
+        return needle in self.title or needle in self.description
+
+
+@dataclass
+class EventIndex:
+    """Incrementally maintained search structures for the in-memory store.
+
+    * a trigram -> event ids inverted index over lowercased title/description,
+      so a substring query only verifies events sharing all of its trigrams;
+    * the (starts_at, id) keys of every event in sorted order, so date ranges,
+      ordering and keyset positions are bisections instead of sorts.
+
+    Matching semantics are exactly the case-insensitive substring test on
+    title or description that the repository always had.
+    """
+
+    _docs: dict[str, _Doc] = field(default_factory=dict)
+    _postings: dict[str, set[str]] = field(default_factory=dict)
+    _by_start: list[SortKey] = field(default_factory=list)
+    # Docs in the same order as _by_start, so range walks skip the id lookup
+    _docs_by_start: list[_Doc] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def add(self, event: Event) -> None:
+        self.remove(event.id)
+        doc = _Doc(
+            key=(event.starts_at, event.id),
+            title=event.title.lower(),
+            description=(event.description or "").lower(),
+        )
+        # Placed first: a key that does not compare with the others (a naive next to
+        # aware datetimes) raises before the index has changed
+        pos = bisect_left(self._by_start, doc.key)
+        self._by_start.insert(pos, doc.key)
+        self._docs_by_start.insert(pos, doc)
+        self._docs[event.id] = doc
+        for gram in trigrams(doc.title) | trigrams(doc.description):
+            self._postings.setdefault(gram, set()).add(event.id)
+
+    def remove(self, event_id: str) -> None:
+        doc = self._docs.pop(event_id, None)
+        if doc is None:
+            return
+        for gram in trigrams(doc.title) | trigrams(doc.description):
+            ids = self._postings.get(gram)
+            if ids is not None:
+                ids.discard(event_id)
+                if not ids:
+                    del self._postings[gram]
+        pos = bisect_left(self._by_start, doc.key)
+        del self._by_start[pos]
+        del self._docs_by_start[pos]
+
+    def _range(self, start: dt.datetime | None, to: dt.datetime | None) -> tuple[int, int]:
+        keys = self._by_start
+        lo = 0 if start is None else bisect_left(keys, start, key=_starts_at)
+        hi = len(keys) if to is None else bisect_right(keys, to, key=_starts_at)
+        return lo, max(lo, hi)
+
+    def _candidates(self, needle: str) -> set[str] | frozenset[str] | None:
+        """Ids sharing the needle's rarest trigram; None when it has no trigram.
+
+        Intersecting every posting list costs more than substring-checking the
+        smallest one, so only that list is used.
+        """
+        grams = trigrams(needle)
+        if not grams:
+            return None
+        return min((self._postings.get(g, _EMPTY) for g in grams), key=len)
+
+    def matching_keys(
+        self, q: str | None, start: dt.datetime | None, to: dt.datetime | None
+    ) -> list[SortKey]:
+        """(starts_at, id) of every event matching ``q`` in the range, in order."""
+        lo, hi = self._range(start, to)
+        needle = (q or "").lower()
+        if not needle:
+            return self._by_start[lo:hi]
+        if lo == hi:
+            return []
+        candidates = self._candidates(needle)
+        if candidates is None or len(candidates) * _WALK_RATIO >= hi - lo:
+            # Short needle, or the postings are not much narrower than the date
+            # range: walking the range in order beats verifying and sorting
+            return [
+                d.key
+                for d in self._docs_by_start[lo:hi]
+                if needle in d.title or needle in d.description
+            ]
+        first, last = self._by_start[lo], self._by_start[hi - 1]
+        keys: list[SortKey] = []
+        for event_id in candidates:
+            doc = self._docs[event_id]
+            # Trigrams only narrow the candidates; the substring test decides
+            if first <= doc.key <= last and doc.contains(needle):
+                keys.append(doc.key)
+        keys.sort()
+        return keys
+
+    def count_range(self, start: dt.datetime | None, to: dt.datetime | None) -> int:
+        lo, hi = self._range(start, to)
+        return hi - lo
+
+    def keys_after(
+        self,
+        after: SortKey | None,
+        start: dt.datetime | None,
+        to: dt.datetime | None,
+        offset: int,
+        limit: int,
+    ) -> list[SortKey]:
+        """A page of the date range (no text filter) straight off the sorted keys."""
+        lo, hi = self._range(start, to)
+        if after is not None:
+            lo = max(lo, bisect_right(self._by_start, after))
+        begin = lo + offset
+        return self._by_start[begin : min(hi, begin + max(limit, 0))]
+
+    def title_hits_first(self, keys: list[SortKey], q: str) -> list[SortKey]:
+        """Stable partition of ``keys``: events whose title contains ``q`` come first."""
+        needle = q.lower()
+        docs = self._docs
+        in_title = [k for k in keys if needle in docs[k[1]].title]
+        if len(in_title) == len(keys):
+            return keys
+        return in_title + [k for k in keys if needle not in docs[k[1]].title]
+
+
+# Waitlist order: created_at, then creation sequence (stable for equal timestamps)
+_WaitKey = tuple[dt.datetime, int, str]
+# (event_id, status) -> insertion-ordered set of reservation ids
+_Buckets = dict[tuple[str, str], dict[str, None]]
+# event_id -> user id / normalized email -> the active reservation id. Keys are
+# unique per event but for rare transient duplicates, which get an
+# insertion-ordered set of ids instead of the single id.
+_Lookup = dict[str, dict[str, str | dict[str, None]]]
+_NO_KEYS: dict[str, str | dict[str, None]] = {}
+
+
+def _bucket_add(buckets: _Buckets, key: tuple[str, str], rid: str) -> None:
+    buckets.setdefault(key, {})[rid] = None
+
+
+def _bucket_discard(buckets: _Buckets, key: tuple[str, str], rid: str) -> None:
+    ids = buckets.get(key)
+    if ids is None:
+        return
+    ids.pop(rid, None)
+    if not ids:
+        del buckets[key]
+
+
+def _lookup_add(lookup: _Lookup, event_id: str, key: str, rid: str) -> None:
+    keys = lookup.setdefault(event_id, {})
+    held = keys.get(key)
+    if held is None:
+        keys[key] = rid
+    elif isinstance(held, str):
+        if held != rid:
+            keys[key] = {held: None, rid: None}
+    else:
+        held[rid] = None
+
+
+def _lookup_discard(lookup: _Lookup, event_id: str, key: str, rid: str) -> None:
+    keys = lookup.get(event_id)
+    held = None if keys is None else keys.get(key)
+    if keys is None or held is None:
+        return
+    if isinstance(held, str):
+        if held != rid:
+            return
+        del keys[key]
+    else:
+        held.pop(rid, None)
+        if len(held) > 1:
+            return
+        # Back to the single-id form once the duplicates are gone
+        keys[key] = next(iter(held))
+    if not keys:
+        del lookup[event_id]
+
+
+def _lookup_first(lookup: _Lookup, event_id: str, key: str) -> str | None:
+    held = lookup.get(event_id, _NO_KEYS).get(key)
+    if held is None or isinstance(held, str):
+        return held
+    return next(iter(held))
+
+
+def _email_key(email: str) -> str:
+    key = normalize_email(email)
+    # Already-normalized addresses (the common case) share the reservation's string
+    return email if key == email else key
+
+
+@dataclass
+class ReservationIndex:
+    """Secondary indexes over the in-memory reservations, keyed per event.
+
+    * (event_id, status) buckets, so per-event counts are ``len`` of a bucket;
+    * a per-event waitlist kept sorted by (created_at, creation order);
+    * per-event lookups of active (non-canceled) reservations by user_id, and by
+      normalized email for anonymous ones (the SQL unique indexes' keys).
+
+    Buckets are insertion-ordered dicts, so "first match" is the oldest entry,
+    exactly as the former full scans of ``Store.reservations`` returned. The
+    active lookups hold a bare id per key (one active reservation per user or
+    email is the norm) to keep the per-reservation footprint small.
+    """
+
+    _by_status: _Buckets = field(default_factory=dict)
+    _waitlist: dict[str, list[_WaitKey]] = field(default_factory=dict)
+    _active_by_user: _Lookup = field(default_factory=dict)
+    _active_by_email: _Lookup = field(default_factory=dict)
+    # Queue position of each waitlisted reservation; pruned as it leaves the waitlist
+    _seq: dict[str, int] = field(default_factory=dict)
+    # Never reused, so positions stay unique after pruning
+    _next_seq: Iterator[int] = field(default_factory=count)
+
+    def add(self, r: Reservation) -> None:
+        self._add(r, None)
+
+    def remove(self, r: Reservation) -> None:
+        """Drop ``r`` (as it was last added) from every index."""
+        self._remove(r)
+
+    def replace(self, old: Reservation, new: Reservation) -> None:
+        """``remove(old)`` then ``add(new)``; a reservation still waitlisted keeps its place."""
+        self._add(new, self._remove(old))
+
+    def _add(self, r: Reservation, seq: int | None) -> None:
+        _bucket_add(self._by_status, (r.event_id, r.status), r.id)
+        if r.status == ReservationStatus.WAITLISTED:
+            if seq is None:
+                seq = next(self._next_seq)
+            self._seq[r.id] = seq
+            insort(self._waitlist.setdefault(r.event_id, []), (r.created_at, seq, r.id))
+        if r.status == ReservationStatus.CANCELED:
+            return
+        if r.user_id is not None:
+            _lookup_add(self._active_by_user, r.event_id, r.user_id, r.id)
+        elif r.email is not None:
+            _lookup_add(self._active_by_email, r.event_id, _email_key(r.email), r.id)
+
+    def _remove(self, r: Reservation) -> int | None:
+        # Returns the waitlist position ``r`` held, if any
+        _bucket_discard(self._by_status, (r.event_id, r.status), r.id)
+        seq = None
+        if r.status == ReservationStatus.WAITLISTED:
+            seq = self._seq.pop(r.id, None)
+            queue = self._waitlist.get(r.event_id)
+            if queue is not None and seq is not None:
+                item = (r.created_at, seq, r.id)
+                pos = bisect_left(queue, item)
+                if pos < len(queue) and queue[pos] == item:
+                    del queue[pos]
+                if not queue:
+                    del self._waitlist[r.event_id]
+        if r.user_id is not None:
+            _lookup_discard(self._active_by_user, r.event_id, r.user_id, r.id)
+        elif r.email is not None:
+            _lookup_discard(self._active_by_email, r.event_id, normalize_email(r.email), r.id)
+        return seq
+
+    def event_reservation_ids(self, event_id: str) -> list[str]:
+        """Every reservation of the event, whatever its status."""
+        statuses = (
+            ReservationStatus.CONFIRMED,
+            ReservationStatus.WAITLISTED,
+            ReservationStatus.CANCELED,
+        )
+        return [rid for status in statuses for rid in self._by_status.get((event_id, status), ())]
+
+    def count(self, event_id: str, status: str) -> int:
+        return len(self._by_status.get((event_id, status), ()))
+
+    def oldest_waitlisted(self, event_id: str) -> str | None:
+        queue = self._waitlist.get(event_id)
+        return queue[0][2] if queue else None
+
+    def active_by_user(self, event_id: str, user_id: str) -> str | None:
+        return _lookup_first(self._active_by_user, event_id, user_id)
+
+    def active_by_email(self, event_id: str, email: str) -> str | None:
+        return _lookup_first(self._active_by_email, event_id, normalize_email(email))
+
+
+__all__ = ["EventIndex", "ReservationIndex", "SortKey", "trigrams"]
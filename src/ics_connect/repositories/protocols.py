@@ -1,8 +1,63 @@
 from __future__ import annotations
 
-from typing import Protocol
+import datetime as dt
+from contextlib import AbstractContextManager
+from dataclasses import dataclass
+from typing import Literal, Protocol
 
-from ..models import Event, Reservation
+from ..models import Event, EventListing, Occupancy, Reservation
+
+SearchOrder = Literal["starts_at", "relevance"]
+
+
+@dataclass(frozen=True)
+class EventQuery:
+    """Search filters and paging, evaluated by the repository (not in Python).
+
+    ``after`` switches to keyset paging: only events ordered strictly after that
+    ``(starts_at, id)`` position are returned, so deep pages cost as much as the first.
+    ``order="relevance"`` ranks matches for ``q`` best-first; ranked pages are
+    offset-based and ``after`` is ignored. ``include_past`` also searches archived
+    (ended) events; those pages are always ordered by ``(starts_at, id)``.
+    """
+
+    q: str | None = None
+    start: dt.datetime | None = None
+    to: dt.datetime | None = None
+    limit: int = 10
+    offset: int = 0
+    after: tuple[dt.datetime, str] | None = None
+    order: SearchOrder = "starts_at"
+    include_past: bool = False
+
+    @property
+    def ranked(self) -> bool:
+        return self.order == "relevance" and bool(self.q) and not self.include_past
+
+
+@dataclass(frozen=True)
+class EventPage:
+    events: list[Event]
+    total: int
+    # (starts_at, id) of the last event when more matches follow this page
+    next_after: tuple[dt.datetime, str] | None = None
+
+
+@dataclass(frozen=True)
+class ListingPage:
+    """``EventPage`` projected to the public listing columns, counts included."""
+
+    listings: list[EventListing]
+    total: int
+    next_after: tuple[dt.datetime, str] | None = None
+
+
+@dataclass(frozen=True)
+class ArchiveBatch:
+    """Rows moved to the archive tables by one bounded retention step."""
+
+    events: int = 0
+    reservations: int = 0
 
 
 class EventRepository(Protocol):
@@ -15,6 +70,42 @@ class EventRepository(Protocol):
     def list_all(self) -> list[Event]:  # pragma: no cover - protocol
         raise NotImplementedError
 
+    def search(self, query: EventQuery) -> EventPage:  # pragma: no cover - protocol
+        """Filter by q/start/to, order by (starts_at, id) and return one page + total."""
+        raise NotImplementedError
+
+    def get_listing(self, event_id: str) -> EventListing | None:  # pragma: no cover
+        """The event's public columns and occupancy in one read (no full entity)."""
+        raise NotImplementedError
+
+    def search_listings(self, query: EventQuery) -> ListingPage:  # pragma: no cover
+        """``search`` selecting only the public columns and the occupancy counters."""
+        raise NotImplementedError
+
+    def archive_ended(self, cutoff: dt.datetime, limit: int) -> ArchiveBatch:  # pragma: no cover
+        """Archive up to ``limit`` events that ended before ``cutoff``, earliest first.
+
+        Each moves with all its reservations; archived events leave every live read
+        (``get``, reserves, counters) and are found only by ``include_past`` searches.
+        """
+        raise NotImplementedError
+
+
+@dataclass(frozen=True)
+class CancelOutcome:
+    # Status the reservation had before the cancel (``canceled`` if it already was)
+    previous_status: str
+    # Waitlisted reservation promoted into the freed seat, if any
+    promoted_id: str | None = None
+
+
+class DuplicateReservationError(Exception):
+    """The user (or, anonymously, the email) already holds an active reservation.
+
+    Raised by ``ReservationRepository.create_within_capacity`` when a concurrent
+    request won the race; the caller looks the winner up instead.
+    """
+
 
 class ReservationRepository(Protocol):
     def get(self, reservation_id: str) -> Reservation | None:  # pragma: no cover
@@ -26,12 +117,56 @@ class ReservationRepository(Protocol):
     def update(self, reservation: Reservation) -> None:  # pragma: no cover
         raise NotImplementedError
 
+    def create_within_capacity(
+        self, reservation: Reservation
+    ) -> Reservation | None:  # pragma: no cover
+        """Atomically claim a seat for ``reservation`` and store it.
+
+        The status is decided from the event's live occupancy in the same
+        transaction as the insert: confirmed while a seat is free, otherwise
+        waitlisted if the event has a waitlist (``reservation.status`` is ignored).
+        Returns the stored reservation, or None when the event is full. Raises
+        DuplicateReservationError when an active reservation for the same user
+        (or anonymous email) already exists.
+        """
+        raise NotImplementedError
+
+    def cancel_and_promote(
+        self, event_id: str, reservation_id: str
+    ) -> CancelOutcome | None:  # pragma: no cover
+        """Cancel a reservation and fill the seat it freed, in one transaction.
+
+        The oldest waitlisted reservation is promoted only when the canceled one
+        was confirmed; concurrent cancels never promote the same reservation.
+        Returns None when the event has no such reservation. Cancelling an
+        already canceled reservation changes nothing.
+        """
+        raise NotImplementedError
+
     def count_confirmed(self, event_id: str) -> int:  # pragma: no cover
         raise NotImplementedError
 
     def count_waitlisted(self, event_id: str) -> int:  # pragma: no cover
         raise NotImplementedError
 
+    def occupancy(self, event_id: str) -> Occupancy:  # pragma: no cover
+        """Return the event's denormalized counters (O(1), no reservation scan)."""
+        raise NotImplementedError
+
+    def counts_for_events(
+        self, event_ids: list[str]
+    ) -> dict[str, Occupancy]:  # pragma: no cover
+        """Return occupancy for many events in one round-trip (missing ids -> zeros)."""
+        raise NotImplementedError
+
+    def recompute_occupancy(self) -> int:  # pragma: no cover
+        """Rebuild every event's counters from reservations; return events repaired."""
+        raise NotImplementedError
+
+    def archive_canceled(self, cutoff: dt.datetime, limit: int) -> int:  # pragma: no cover
+        """Archive up to ``limit`` canceled reservations created before ``cutoff``."""
+        raise NotImplementedError
+
     def find_oldest_waitlisted(self, event_id: str) -> Reservation | None:  # pragma: no cover
         raise NotImplementedError
 
@@ -44,7 +179,11 @@ class ReservationRepository(Protocol):
     def find_active_by_event_and_email(
         self, event_id: str, email: str
     ) -> Reservation | None:  # pragma: no cover
-        """Return an existing non-canceled reservation for the event by email, if any."""
+        """Return the event's non-canceled anonymous reservation for ``email``, if any.
+
+        Emails match after ``normalize_email``; reservations made by a signed-in
+        user are keyed by their user id instead.
+        """
         raise NotImplementedError
 
 
@@ -57,5 +196,26 @@ class Repos(Protocol):
     def reservations(self) -> ReservationRepository:  # pragma: no cover
         raise NotImplementedError
 
+    def transaction(self) -> AbstractContextManager[None]:  # pragma: no cover
+        """Unit of work: commit when the block exits cleanly, roll back if it raises.
+
+        Repository writes only flush; nothing is durable until the outermost
+        ``transaction()`` commits. A nested ``transaction()`` is a savepoint: an
+        exception escaping it undoes just that block, and the outer unit of work
+        can carry on (e.g. look up the row that won a duplicate-insert race).
+        """
+        raise NotImplementedError
+
 
-__all__ = ["EventRepository", "ReservationRepository", "Repos"]
+__all__ = [
+    "ArchiveBatch",
+    "CancelOutcome",
+    "DuplicateReservationError",
+    "EventPage",
+    "EventQuery",
+    "EventRepository",
+    "ListingPage",
+    "Repos",
+    "ReservationRepository",
+    "SearchOrder",
+]
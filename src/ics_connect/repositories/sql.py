@@ -1,12 +1,60 @@
 from __future__ import annotations
 
-from sqlalchemy import Select, func, select
+import datetime as dt
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import replace
+
+from sqlalchemy import (
+    ColumnElement,
+    DateTime,
+    Select,
+    delete,
+    func,
+    insert,
+    literal,
+    or_,
+    select,
+    text,
+    tuple_,
+    update,
+)
 from sqlalchemy.engine import ScalarResult
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
-
-from ..models import Event, Reservation
-from .protocols import EventRepository, Repos, ReservationRepository
-from .sql_models import EventRow, ReservationRow
+from sqlalchemy.sql import Executable
+from sqlalchemy.sql.selectable import ScalarSelect
+
+from ..models import (
+    Event,
+    EventListing,
+    Occupancy,
+    Reservation,
+    ReservationStatus,
+    normalize_email,
+    occupancy_delta,
+)
+from ..util.time import utcnow
+from .archive import merge_past, past_window
+from .protocols import (
+    ArchiveBatch,
+    CancelOutcome,
+    DuplicateReservationError,
+    EventPage,
+    EventQuery,
+    EventRepository,
+    ListingPage,
+    Repos,
+    ReservationRepository,
+)
+from .sql_models import (
+    ANONYMOUS_ACTIVE,
+    EventArchiveRow,
+    EventRow,
+    ReservationArchiveRow,
+    ReservationRow,
+)
+from .sql_search import EventSearch, LikeEventSearch, escape_like, event_search_for
 
 
 def _to_event_row(e: Event) -> EventRow:
@@ -28,10 +76,11 @@ def _to_event_row(e: Event) -> EventRow:
         capacity=e.capacity,
         waitlist_enabled=e.waitlist_enabled,
         created_at=e.created_at,
+        public_json=e.public_json or None,
     )
 
 
-def _from_event_row(r: EventRow) -> Event:
+def _from_event_row(r: EventRow | EventArchiveRow) -> Event:
     return Event(
         id=r.id,
         title=r.title,
@@ -50,6 +99,7 @@ def _from_event_row(r: EventRow) -> Event:
         capacity=r.capacity,
         waitlist_enabled=r.waitlist_enabled,
         created_at=r.created_at,
+        public_json=r.public_json or "",
     )
 
 
@@ -60,6 +110,7 @@ def _to_res_row(r: Reservation) -> ReservationRow:
         user_id=r.user_id,
         display_name=r.display_name,
         email=r.email,
+        email_normalized=normalize_email(r.email) if r.email is not None else None,
         status=r.status,
         promoted_at=r.promoted_at,
         created_at=r.created_at,
@@ -79,9 +130,264 @@ def _from_res_row(r: ReservationRow) -> Reservation:
     )
 
 
+def count_by_status_stmt(event_id: str, status: str) -> Select[tuple[int]]:
+    return (
+        select(func.count())
+        .select_from(ReservationRow)
+        .where(ReservationRow.event_id == event_id, ReservationRow.status == status)
+    )
+
+
+def active_by_email_stmt(event_id: str, email: str) -> Select[tuple[ReservationRow]]:
+    """Probe of ``ux_reservations_event_email_active`` for an anonymous reservation."""
+    return select(ReservationRow).where(
+        ReservationRow.event_id == event_id,
+        ReservationRow.email_normalized == normalize_email(email),
+        text(ANONYMOUS_ACTIVE),
+    )
+
+
+def oldest_waitlisted_stmt(event_id: str) -> Select[tuple[ReservationRow]]:
+    return (
+        select(ReservationRow)
+        .where(ReservationRow.event_id == event_id, ReservationRow.status == "waitlisted")
+        .order_by(ReservationRow.created_at.asc())
+        .limit(1)
+    )
+
+
+def promote_oldest_waitlisted_stmt(event_id: str, promoted_at: dt.datetime) -> Executable:
+    """Confirm the event's waitlist head in one statement, returning its id.
+
+    ``FOR UPDATE SKIP LOCKED`` (Postgres) lets concurrent cancels each take a
+    different head instead of promoting the same reservation twice.
+    """
+    head = (
+        oldest_waitlisted_stmt(event_id)
+        .with_only_columns(ReservationRow.id)
+        .with_for_update(skip_locked=True)
+        .scalar_subquery()
+    )
+    return (
+        update(ReservationRow)
+        .where(ReservationRow.id == head)
+        .values(status=ReservationStatus.CONFIRMED, promoted_at=promoted_at)
+        .returning(ReservationRow.id)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def search_filters(query: EventQuery) -> list[ColumnElement[bool]]:
+    conds: list[ColumnElement[bool]] = []
+    if query.start is not None:
+        conds.append(EventRow.starts_at >= query.start)
+    if query.to is not None:
+        conds.append(EventRow.starts_at <= query.to)
+    return conds
+
+
+def _matching_stmt(
+    query: EventQuery, search: EventSearch
+) -> tuple[Select[tuple[EventRow]], ColumnElement[float] | None]:
+    stmt = select(EventRow).where(*search_filters(query))
+    if not query.q:
+        return stmt, None
+    return search.match(stmt, query.q)
+
+
+def search_page_stmt(
+    query: EventQuery, search: EventSearch | None = None
+) -> Select[tuple[EventRow]]:
+    stmt, rank = _matching_stmt(query, search or LikeEventSearch())
+    if rank is not None and query.ranked:
+        return (
+            stmt.order_by(rank, EventRow.starts_at.asc(), EventRow.id.asc())
+            .limit(query.limit)
+            .offset(query.offset)
+        )
+    if query.after is not None:
+        # Row-value seek on the (starts_at, id) index instead of skipping rows
+        stmt = stmt.where(tuple_(EventRow.starts_at, EventRow.id) > tuple_(*query.after))
+    return (
+        stmt.order_by(EventRow.starts_at.asc(), EventRow.id.asc())
+        .limit(query.limit)
+        .offset(query.offset)
+    )
+
+
+# Listing reads select exactly these, in EventListing field order: no secret hashes,
+# tags or created_at, the denormalized counters instead of a second query, and the
+# pre-rendered JSON the response is spliced from
+LISTING_COLUMNS = (
+    EventRow.id,
+    EventRow.title,
+    EventRow.description,
+    EventRow.type,
+    EventRow.starts_at,
+    EventRow.ends_at,
+    EventRow.location_text,
+    EventRow.discord_link,
+    EventRow.website_link,
+    EventRow.public,
+    EventRow.capacity,
+    EventRow.requires_join_code,
+    EventRow.confirmed_count,
+    EventRow.waitlist_count,
+    EventRow.public_json,
+)
+
+
+def listing_page_stmt(
+    query: EventQuery, search: EventSearch | None = None
+) -> Select[tuple[object, ...]]:
+    """``search_page_stmt`` projected to ``LISTING_COLUMNS`` (plain rows, no ORM entities)."""
+    return search_page_stmt(query, search).with_only_columns(
+        *LISTING_COLUMNS, maintain_column_froms=True
+    )
+
+
+def search_count_stmt(query: EventQuery, search: EventSearch | None = None) -> Select[tuple[int]]:
+    search = search or LikeEventSearch()
+    if query.q and query.start is None and query.to is None:
+        direct = search.count_matches(query.q)
+        if direct is not None:
+            return direct
+    stmt, _rank = _matching_stmt(query, search)
+    return stmt.with_only_columns(func.count(), maintain_column_froms=True)
+
+
+# The listing projection over the archive (frozen counters), same field order
+ARCHIVE_LISTING_COLUMNS = tuple(getattr(EventArchiveRow, c.key) for c in LISTING_COLUMNS)
+
+
+def _archive_filters(query: EventQuery) -> list[ColumnElement[bool]]:
+    # Archived events have no full-text side index: LIKE, as the portable fallback
+    conds: list[ColumnElement[bool]] = []
+    if query.start is not None:
+        conds.append(EventArchiveRow.starts_at >= query.start)
+    if query.to is not None:
+        conds.append(EventArchiveRow.starts_at <= query.to)
+    if query.q:
+        pattern = f"%{escape_like(query.q)}%"
+        conds.append(
+            or_(
+                EventArchiveRow.title.ilike(pattern, escape="\\"),
+                EventArchiveRow.description.ilike(pattern, escape="\\"),
+            )
+        )
+    return conds
+
+
+def archive_page_stmt(query: EventQuery) -> Select[tuple[EventArchiveRow]]:
+    """Archived events matching ``query``, in (starts_at, id) order (``include_past``)."""
+    stmt = select(EventArchiveRow).where(*_archive_filters(query))
+    if query.after is not None:
+        position = tuple_(EventArchiveRow.starts_at, EventArchiveRow.id)
+        stmt = stmt.where(position > tuple_(*query.after))
+    return (
+        stmt.order_by(EventArchiveRow.starts_at.asc(), EventArchiveRow.id.asc())
+        .limit(query.limit)
+        .offset(query.offset)
+    )
+
+
+def archive_count_stmt(query: EventQuery) -> Select[tuple[int]]:
+    return select(func.count()).select_from(EventArchiveRow).where(*_archive_filters(query))
+
+
+def archive_rows_stmt(
+    source: type[EventRow] | type[ReservationRow],
+    target: type[EventArchiveRow] | type[ReservationArchiveRow],
+    where: ColumnElement[bool],
+    archived_at: dt.datetime,
+) -> Executable:
+    """``INSERT INTO <archive> SELECT <row>, :archived_at FROM <live> WHERE ...``."""
+    columns = list(source.__table__.columns)
+    return insert(target).from_select(
+        [*(c.name for c in columns), "archived_at"],
+        select(*columns, literal(archived_at, DateTime())).where(where),
+    )
+
+
+# Unique-violation codes reported by the drivers (no message matching)
+_PG_UNIQUE_VIOLATION = "23505"
+_SQLITE_UNIQUE_VIOLATIONS = ("SQLITE_CONSTRAINT_UNIQUE", "SQLITE_CONSTRAINT_PRIMARYKEY")
+
+
+def is_unique_violation(exc: IntegrityError) -> bool:
+    """True when ``exc`` is a unique/primary-key violation, per the driver's error code."""
+    orig = exc.orig
+    # psycopg 3 exposes ``sqlstate``, psycopg2 ``pgcode``; sqlite3 the error name
+    sqlstate = getattr(orig, "sqlstate", None) or getattr(orig, "pgcode", None)
+    if sqlstate is not None:
+        return str(sqlstate) == _PG_UNIQUE_VIOLATION
+    return getattr(orig, "sqlite_errorname", None) in _SQLITE_UNIQUE_VIOLATIONS
+
+
+def claim_seat_stmts(event_id: str) -> tuple[Executable, Executable]:
+    """Conditional counter bumps: (take a confirmed seat, join the waitlist).
+
+    Each matches the event row only while the claim is allowed, so the row lock
+    taken by the UPDATE serializes concurrent reservers and the condition is
+    re-checked against the committed count (no read-then-write race).
+    """
+    confirm = (
+        update(EventRow)
+        .where(EventRow.id == event_id, EventRow.confirmed_count < EventRow.capacity)
+        .values(confirmed_count=EventRow.confirmed_count + 1)
+        .execution_options(synchronize_session=False)
+    )
+    waitlist = (
+        update(EventRow)
+        .where(EventRow.id == event_id, EventRow.waitlist_enabled.is_(True))
+        .values(waitlist_count=EventRow.waitlist_count + 1)
+        .execution_options(synchronize_session=False)
+    )
+    return confirm, waitlist
+
+
+def begin_write(session: Session) -> None:
+    """On SQLite, take the database write lock before reading (BEGIN IMMEDIATE).
+
+    A deferred transaction that reads and then writes can fail to upgrade its
+    lock under contention; IMMEDIATE queues writers on ``busy_timeout`` instead.
+    Postgres needs nothing here: writes lock the rows they touch. No-op when the
+    connection is already inside a transaction.
+    """
+    if session.get_bind().dialect.name != "sqlite":
+        return
+    conn = session.connection()
+    if not conn.connection.dbapi_connection.in_transaction:
+        conn.exec_driver_sql("BEGIN IMMEDIATE")
+
+
+def explain_plan(session: Session, stmt: Executable) -> list[str]:
+    """Return the database's query plan for ``stmt`` as text lines (diagnostics)."""
+    bind = session.get_bind()
+    compiled = stmt.compile(dialect=bind.dialect, compile_kwargs={"literal_binds": True})
+    if bind.dialect.name == "sqlite":
+        rows = session.execute(text(f"EXPLAIN QUERY PLAN {compiled}")).all()
+        return [str(r[-1]) for r in rows]
+    rows = session.execute(text(f"EXPLAIN {compiled}")).all()
+    return [str(r[0]) for r in rows]
+
+
+def _trim(
+    page: list[Event] | list[EventListing], query: EventQuery
+) -> tuple[dt.datetime, str] | None:
+    """Drop the probe row fetched past ``query.limit``; the keyset position if it existed."""
+    more = len(page) > query.limit
+    del page[query.limit :]
+    if not more or query.ranked:
+        return None
+    last = page[-1]
+    return (last.starts_at, last.id)
+
+
 class _SQLEventRepo(EventRepository):
-    def __init__(self, session: Session) -> None:
+    def __init__(self, session: Session, search: EventSearch) -> None:
         self._s = session
+        self._search = search
 
     def get(self, event_id: str) -> Event | None:
         stmt: Select[tuple[EventRow]] = select(EventRow).where(EventRow.id == event_id)
@@ -91,7 +397,9 @@ class _SQLEventRepo(EventRepository):
 
     def create(self, event: Event) -> None:
         self._s.add(_to_event_row(event))
-        self._s.commit()
+        # Full-text side index is written in the same transaction as the event
+        self._search.index_event(self._s, event)
+        self._s.flush()
 
     def list_all(self) -> list[Event]:
         stmt: Select[tuple[EventRow]] = select(EventRow)
@@ -99,11 +407,106 @@ class _SQLEventRepo(EventRepository):
         rows: list[EventRow] = list(sr)
         return [_from_event_row(r) for r in rows]
 
+    def search(self, query: EventQuery) -> EventPage:
+        if query.include_past:
+            window = past_window(query)
+            live = self.search(window)
+            archived = self._s.execute(archive_page_stmt(window)).scalars()
+            events, next_after = merge_past(
+                live.events, [_from_event_row(r) for r in archived], query
+            )
+            total = live.total + self._archived_count(window)
+            return EventPage(events=events, total=total, next_after=next_after)
+        total = self._count(query)
+        if total <= query.offset or query.limit <= 0:
+            return EventPage(events=[], total=total)
+        # One extra row tells us whether a next page exists
+        probe = replace(query, limit=query.limit + 1)
+        stmt = search_page_stmt(probe, self._search)
+        sr: ScalarResult[EventRow] = self._s.execute(stmt).scalars()
+        events = [_from_event_row(r) for r in sr]
+        return EventPage(events=events, total=total, next_after=_trim(events, query))
+
+    def get_listing(self, event_id: str) -> EventListing | None:
+        row = self._s.execute(select(*LISTING_COLUMNS).where(EventRow.id == event_id)).first()
+        return EventListing._make(row) if row is not None else None
+
+    def search_listings(self, query: EventQuery) -> ListingPage:
+        if query.include_past:
+            window = past_window(query)
+            live = self.search_listings(window)
+            stmt = archive_page_stmt(window).with_only_columns(*ARCHIVE_LISTING_COLUMNS)
+            archived = [EventListing._make(row) for row in self._s.execute(stmt)]
+            listings, next_after = merge_past(live.listings, archived, query)
+            total = live.total + self._archived_count(window)
+            return ListingPage(listings=listings, total=total, next_after=next_after)
+        total = self._count(query)
+        if total <= query.offset or query.limit <= 0:
+            return ListingPage(listings=[], total=total)
+        probe = replace(query, limit=query.limit + 1)
+        result = self._s.execute(listing_page_stmt(probe, self._search))
+        listings = [EventListing._make(row) for row in result]
+        return ListingPage(listings=listings, total=total, next_after=_trim(listings, query))
+
+    def _count(self, query: EventQuery) -> int:
+        return int(self._s.execute(search_count_stmt(query, self._search)).scalar_one())
+
+    def _archived_count(self, query: EventQuery) -> int:
+        return int(self._s.execute(archive_count_stmt(query)).scalar_one())
+
+    def archive_ended(self, cutoff: dt.datetime, limit: int) -> ArchiveBatch:
+        # starts_at <= ends_at, so the starts_at bound lets the search index find them
+        batch = (
+            select(EventRow.id)
+            .where(EventRow.starts_at < cutoff, EventRow.ends_at < cutoff)
+            .order_by(EventRow.starts_at.asc(), EventRow.id.asc())
+            .limit(limit)
+        )
+        event_ids = list(self._s.execute(batch).scalars())
+        if not event_ids:
+            return ArchiveBatch()
+        now = utcnow()
+        events = EventRow.id.in_(event_ids)
+        reservations = ReservationRow.event_id.in_(event_ids)
+        self._s.execute(archive_rows_stmt(EventRow, EventArchiveRow, events, now))
+        moved = self._s.execute(
+            archive_rows_stmt(ReservationRow, ReservationArchiveRow, reservations, now)
+        ).rowcount
+        for stmt in (delete(ReservationRow).where(reservations), delete(EventRow).where(events)):
+            self._s.execute(stmt.execution_options(synchronize_session=False))
+        self._search.remove_events(self._s, event_ids)
+        return ArchiveBatch(events=len(event_ids), reservations=int(moved))
+
+
+
+def _status_count_subq(status: str) -> ScalarSelect[int]:
+    return (
+        select(func.count())
+        .select_from(ReservationRow)
+        .where(ReservationRow.event_id == EventRow.id, ReservationRow.status == status)
+        .scalar_subquery()
+    )
+
 
 class _SQLReservationRepo(ReservationRepository):
     def __init__(self, session: Session) -> None:
         self._s = session
 
+    def _adjust(self, event_id: str, old_status: str | None, new_status: str | None) -> None:
+        self._bump(event_id, *occupancy_delta(old_status, new_status))
+
+    def _bump(self, event_id: str, d_confirmed: int, d_waitlisted: int) -> None:
+        if d_confirmed == 0 and d_waitlisted == 0:
+            return
+        self._s.execute(
+            update(EventRow)
+            .where(EventRow.id == event_id)
+            .values(
+                confirmed_count=EventRow.confirmed_count + d_confirmed,
+                waitlist_count=EventRow.waitlist_count + d_waitlisted,
+            )
+        )
+
     def get(self, reservation_id: str) -> Reservation | None:
         stmt: Select[tuple[ReservationRow]] = select(ReservationRow).where(
             ReservationRow.id == reservation_id
@@ -114,7 +517,61 @@ class _SQLReservationRepo(ReservationRepository):
 
     def create(self, reservation: Reservation) -> None:
         self._s.add(_to_res_row(reservation))
-        self._s.commit()
+        self._s.flush()
+        self._adjust(reservation.event_id, None, reservation.status)
+
+    def _claim_seat(self, event_id: str) -> str | None:
+        confirm, waitlist = claim_seat_stmts(event_id)
+        if self._s.execute(confirm).rowcount:
+            return ReservationStatus.CONFIRMED
+        if self._s.execute(waitlist).rowcount:
+            return ReservationStatus.WAITLISTED
+        return None
+
+    def create_within_capacity(self, reservation: Reservation) -> Reservation | None:
+        begin_write(self._s)
+        status = self._claim_seat(reservation.event_id)
+        if status is None:
+            return None
+        # Duplicates (by user, or by normalized email when anonymous) are caught by
+        # the partial unique indexes; the caller's savepoint undoes the claim
+        placed = replace(reservation, status=status)
+        self._s.add(_to_res_row(placed))
+        try:
+            self._s.flush()
+        except IntegrityError as exc:
+            if is_unique_violation(exc):
+                raise DuplicateReservationError(reservation.event_id) from exc
+            raise
+        return placed
+
+    def cancel_and_promote(self, event_id: str, reservation_id: str) -> CancelOutcome | None:
+        begin_write(self._s)
+        lock = (
+            select(ReservationRow.status)
+            .where(ReservationRow.id == reservation_id, ReservationRow.event_id == event_id)
+            .with_for_update()
+        )
+        previous = self._s.execute(lock).scalar_one_or_none()
+        if previous is None or previous == ReservationStatus.CANCELED:
+            return None if previous is None else CancelOutcome(previous)
+        self._s.execute(
+            update(ReservationRow)
+            .where(ReservationRow.id == reservation_id)
+            .values(status=ReservationStatus.CANCELED)
+            .execution_options(synchronize_session=False)
+        )
+        d_confirmed, d_waitlisted = occupancy_delta(previous, ReservationStatus.CANCELED)
+        promoted_id = None
+        if previous == ReservationStatus.CONFIRMED:
+            promote = promote_oldest_waitlisted_stmt(event_id, utcnow())
+            promoted_id = self._s.execute(promote).scalar_one_or_none()
+            if promoted_id is not None:
+                d_confirmed += 1
+                d_waitlisted -= 1
+        # One counter write for the cancel and the promotion together
+        self._bump(event_id, d_confirmed, d_waitlisted)
+        return CancelOutcome(previous, promoted_id)
 
     def update(self, reservation: Reservation) -> None:
         stmt: Select[tuple[ReservationRow]] = select(ReservationRow).where(
@@ -124,34 +581,77 @@ class _SQLReservationRepo(ReservationRepository):
         row = sr.first()
         if row is None:
             return
+        old_status = row.status
         row.status = reservation.status
         row.promoted_at = reservation.promoted_at
         self._s.add(row)
-        self._s.commit()
+        self._adjust(row.event_id, old_status, reservation.status)
+        self._s.flush()
 
-    def count_confirmed(self, event_id: str) -> int:
-        stmt: Select[tuple[int]] = (
-            select(func.count())
-            .select_from(ReservationRow)
-            .where(ReservationRow.event_id == event_id, ReservationRow.status == "confirmed")
+    def occupancy(self, event_id: str) -> Occupancy:
+        stmt = select(EventRow.confirmed_count, EventRow.waitlist_count).where(
+            EventRow.id == event_id
+        )
+        row = self._s.execute(stmt).first()
+        if row is None:
+            return Occupancy()
+        return Occupancy(confirmed=int(row[0]), waitlisted=int(row[1]))
+
+    def counts_for_events(self, event_ids: list[str]) -> dict[str, Occupancy]:
+        out = {eid: Occupancy() for eid in event_ids}
+        if not out:
+            return out
+        stmt = select(EventRow.id, EventRow.confirmed_count, EventRow.waitlist_count).where(
+            EventRow.id.in_(list(out))
+        )
+        for eid, confirmed, waitlisted in self._s.execute(stmt):
+            out[eid] = Occupancy(confirmed=int(confirmed), waitlisted=int(waitlisted))
+        return out
+
+    def recompute_occupancy(self) -> int:
+        confirmed = _status_count_subq("confirmed")
+        waitlisted = _status_count_subq("waitlisted")
+        stmt = (
+            update(EventRow)
+            .where(
+                or_(EventRow.confirmed_count != confirmed, EventRow.waitlist_count != waitlisted)
+            )
+            .values(confirmed_count=confirmed, waitlist_count=waitlisted)
+            .execution_options(synchronize_session=False)
+        )
+        repaired = self._s.execute(stmt).rowcount
+        return int(repaired)
+
+    def archive_canceled(self, cutoff: dt.datetime, limit: int) -> int:
+        batch = (
+            select(ReservationRow.id)
+            .where(
+                ReservationRow.status == ReservationStatus.CANCELED,
+                ReservationRow.created_at < cutoff,
+            )
+            .order_by(ReservationRow.created_at.asc())
+            .limit(limit)
+        )
+        ids = list(self._s.execute(batch).scalars())
+        if not ids:
+            return 0
+        moving = ReservationRow.id.in_(ids)
+        self._s.execute(archive_rows_stmt(ReservationRow, ReservationArchiveRow, moving, utcnow()))
+        self._s.execute(
+            delete(ReservationRow).where(moving).execution_options(synchronize_session=False)
         )
+        return len(ids)
+
+    def count_confirmed(self, event_id: str) -> int:
+        stmt = count_by_status_stmt(event_id, "confirmed")
         return int(self._s.execute(stmt).scalar_one())
 
     def count_waitlisted(self, event_id: str) -> int:
-        stmt: Select[tuple[int]] = (
-            select(func.count())
-            .select_from(ReservationRow)
-            .where(ReservationRow.event_id == event_id, ReservationRow.status == "waitlisted")
-        )
+        stmt = count_by_status_stmt(event_id, "waitlisted")
         return int(self._s.execute(stmt).scalar_one())
 
     def find_oldest_waitlisted(self, event_id: str) -> Reservation | None:
-        stmt: Select[tuple[ReservationRow]] = (
-            select(ReservationRow)
-            .where(ReservationRow.event_id == event_id, ReservationRow.status == "waitlisted")
-            .order_by(ReservationRow.created_at.asc())
-            .limit(1)
-        )
+        stmt = oldest_waitlisted_stmt(event_id)
         sr: ScalarResult[ReservationRow] = self._s.execute(stmt).scalars()
         row = sr.first()
         return _from_res_row(row) if row else None
@@ -171,27 +671,19 @@ class _SQLReservationRepo(ReservationRepository):
         return _from_res_row(row) if row else None
 
     def find_active_by_event_and_email(self, event_id: str, email: str) -> Reservation | None:
-        email_l = email.strip().lower()
-        stmt: Select[tuple[ReservationRow]] = (
-            select(ReservationRow)
-            .where(
-                ReservationRow.event_id == event_id,
-                ReservationRow.email.is_not(None),
-                func.lower(ReservationRow.email) == email_l,
-                ReservationRow.status != "canceled",
-            )
-            .limit(1)
-        )
+        stmt = active_by_email_stmt(event_id, email)
         sr: ScalarResult[ReservationRow] = self._s.execute(stmt).scalars()
         row = sr.first()
         return _from_res_row(row) if row else None
 
 
 class SQLRepos(Repos):
-    def __init__(self, session: Session) -> None:
+    def __init__(self, session: Session, search: EventSearch | None = None) -> None:
         self._session = session
-        self._events = _SQLEventRepo(session)
+        self._search = search or event_search_for(session.get_bind().dialect.name)
+        self._events = _SQLEventRepo(session, self._search)
         self._res = _SQLReservationRepo(session)
+        self._depth = 0
 
     @property
     def events(self) -> EventRepository:
@@ -201,10 +693,57 @@ class SQLRepos(Repos):
     def reservations(self) -> ReservationRepository:
         return self._res
 
+    @property
+    def search(self) -> EventSearch:
+        return self._search
+
     @property
     def session(self) -> Session:
         """Expose session for transaction management (rollback after errors)."""
         return self._session
 
-
-__all__ = ["SQLRepos"]
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        if self._depth:
+            # Savepoint: a failure inside rolls back to here, the outer work survives
+            self._depth += 1
+            try:
+                with self._session.begin_nested():
+                    yield
+            finally:
+                self._depth -= 1
+            return
+        # SQLite: hold the write lock for the whole unit of work, and make sure a
+        # real transaction is open so savepoints nest inside it
+        begin_write(self._session)
+        self._depth = 1
+        try:
+            yield
+            self._session.commit()
+        except BaseException:
+            self._session.rollback()
+            raise
+        finally:
+            self._depth = 0
+
+
+__all__ = [
+    "ARCHIVE_LISTING_COLUMNS",
+    "LISTING_COLUMNS",
+    "SQLRepos",
+    "active_by_email_stmt",
+    "archive_count_stmt",
+    "archive_page_stmt",
+    "archive_rows_stmt",
+    "begin_write",
+    "claim_seat_stmts",
+    "count_by_status_stmt",
+    "explain_plan",
+    "is_unique_violation",
+    "listing_page_stmt",
+    "oldest_waitlisted_stmt",
+    "promote_oldest_waitlisted_stmt",
+    "search_count_stmt",
+    "search_filters",
+    "search_page_stmt",
+]
@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass, field
+from functools import partial
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Connection, Engine, make_url
+from sqlalchemy.engine.interfaces import DBAPIConnection
+from sqlalchemy.pool import ConnectionPoolEntry, QueuePool, StaticPool
+
+from ..settings import Settings
+from ..types import PoolStatsOut
+
+
+@dataclass
+class PoolStats:
+    """Cumulative checkout counters for a process-wide connection pool."""
+
+    checkouts: int = 0
+    checkins: int = 0
+    wait_seconds_total: float = 0.0
+    wait_seconds_max: float = 0.0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def record_checkout(self, waited: float) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.wait_seconds_total += waited
+            self.wait_seconds_max = max(self.wait_seconds_max, waited)
+
+    def record_checkin(self) -> None:
+        with self._lock:
+            self.checkins += 1
+
+
+class _InstrumentedQueuePool(QueuePool):
+    """QueuePool that records how long callers wait for a connection."""
+
+    stats: PoolStats | None = None
+
+    def _do_get(self) -> ConnectionPoolEntry:
+        start = time.perf_counter()
+        rec = super()._do_get()
+        if self.stats is not None:
+            self.stats.record_checkout(time.perf_counter() - start)
+        return rec
+
+    def _do_return_conn(self, record: ConnectionPoolEntry) -> None:
+        super()._do_return_conn(record)
+        if self.stats is not None:
+            self.stats.record_checkin()
+
+
+# The class as a plain type: its name as an expression is typed as the constructor,
+# whose signature (``**kw: Any``) mypy's strict Any checks would reject
+_INSTRUMENTED_POOL: type[_InstrumentedQueuePool] = _InstrumentedQueuePool
+_SHARED_SQLITE_CONNECT_ARGS: dict[str, object] = {"check_same_thread": False}
+
+
+def is_sqlite_memory(url: str) -> bool:
+    u = make_url(url)
+    return u.get_backend_name() == "sqlite" and u.database in (None, "", ":memory:")
+
+
+def sqlite_production(url: str, settings: Settings) -> bool:
+    """Whether ``url`` is a file SQLite database run with the production profile.
+
+    The profile puts the database in WAL mode, so readers never wait for the
+    writer, and gives writes a single connection of their own (``role="writer"``):
+    concurrent writers queue on the pool instead of contending for SQLite's lock.
+    """
+    u = make_url(url)
+    return (
+        u.get_backend_name() == "sqlite"
+        and not is_sqlite_memory(url)
+        and settings.sqlite_profile == "production"
+    )
+
+
+def sqlite_pragmas(settings: Settings, role: str) -> list[str]:
+    """Per-connection PRAGMAs of the production profile for a ``role`` connection."""
+    pragmas = [
+        # Persistent in the file; repeating it on connect is a no-op
+        "PRAGMA journal_mode=WAL",
+        # Durable across application crashes; an OS crash may lose the last commits
+        "PRAGMA synchronous=NORMAL",
+        f"PRAGMA busy_timeout={int(settings.sqlite_busy_timeout_ms)}",
+        f"PRAGMA mmap_size={int(settings.sqlite_mmap_size)}",
+    ]
+    if role == "reader":
+        pragmas.append("PRAGMA query_only=ON")
+    return pragmas
+
+
+def read_pragma(conn: Connection, name: str) -> str:
+    """Current value of SQLite ``PRAGMA name`` on ``conn`` (diagnostics, tests)."""
+    dbapi_connection = conn.connection.dbapi_connection
+    if dbapi_connection is None:
+        raise RuntimeError("connection is closed")
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute(f"PRAGMA {name}")
+        row: tuple[object, ...] | None = cursor.fetchone()
+    finally:
+        cursor.close()
+    if row is None:
+        raise RuntimeError(f"PRAGMA {name} returned no row")
+    return str(row[0])
+
+
+def _apply_pragmas(pragmas: list[str], dbapi_connection: DBAPIConnection, _record: object) -> None:
+    cursor = dbapi_connection.cursor()
+    try:
+        for pragma in pragmas:
+            cursor.execute(pragma)
+    finally:
+        cursor.close()
+
+
+def _install_sqlite_profile(engine: Engine, url: str, settings: Settings, role: str) -> None:
+    if sqlite_production(url, settings):
+        event.listen(engine, "connect", partial(_apply_pragmas, sqlite_pragmas(settings, role)))
+
+
+def _pool_options(url: str, settings: Settings, role: str) -> dict[str, int | float | bool]:
+    single_writer = role == "writer" and sqlite_production(url, settings)
+    return {
+        "pool_size": 1 if single_writer else settings.db_pool_size,
+        "max_overflow": 0 if single_writer else settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_recycle": settings.db_pool_recycle,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+    }
+
+
+def build_engine(
+    url: str, settings: Settings, stats: PoolStats | None = None, role: str = "primary"
+) -> Engine:
+    """Pooled Engine for ``url``.
+
+    ``role`` is "primary" (reads and writes), "writer" or "reader"; the last two
+    only differ from "primary" under the SQLite production profile.
+    """
+    if is_sqlite_memory(url):
+        # A single shared connection keeps one in-memory database visible to
+        # every thread; QueuePool sizing does not apply here.
+        return create_engine(
+            url,
+            echo=False,
+            future=True,
+            poolclass=StaticPool,
+            connect_args=_SHARED_SQLITE_CONNECT_ARGS,
+        )
+    engine = create_engine(
+        url,
+        echo=False,
+        future=True,
+        poolclass=_INSTRUMENTED_POOL,
+        **_pool_options(url, settings, role),
+    )
+    if isinstance(engine.pool, _INSTRUMENTED_POOL):
+        engine.pool.stats = stats
+    _install_sqlite_profile(engine, url, settings, role)
+    return engine
+
+
+def pool_snapshot(engine: Engine, stats: PoolStats) -> PoolStatsOut:
+    pool = engine.pool
+    # Engines built here have an instrumented QueuePool, or a StaticPool (one connection)
+    size, checked_out, overflow = 1, 0, 0
+    if isinstance(pool, _INSTRUMENTED_POOL):
+        size, checked_out, overflow = pool.size(), pool.checkedout(), pool.overflow()
+    return {
+        "size": size,
+        "checked_out": checked_out,
+        "overflow": overflow,
+        "checkouts": stats.checkouts,
+        "checkins": stats.checkins,
+        "wait_ms_total": round(stats.wait_seconds_total * 1000, 3),
+        "wait_ms_max": round(stats.wait_seconds_max * 1000, 3),
+    }
+
+
+__all__ = [
+    "PoolStats",
+    "build_engine",
+    "is_sqlite_memory",
+    "pool_snapshot",
+    "read_pragma",
+    "sqlite_pragmas",
+    "sqlite_production",
+]
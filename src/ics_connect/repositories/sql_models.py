@@ -3,17 +3,18 @@ from __future__ import annotations
 import datetime as dt
 
 from sqlalchemy import Boolean, DateTime, Index, Integer, MetaData, String, Text, text
-from sqlalchemy.engine import Engine
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 
 
+# Schema changes ship as versioned migrations (ics_connect.migrations); keep
+# these mappings in sync with the latest migration.
 class Base(DeclarativeBase):
     # Explicit metadata avoids plugin "Any" issues on Base.metadata
     metadata = MetaData()
 
 
-class EventRow(Base):
-    __tablename__ = "events"
+class _EventColumns:
+    """Columns shared by ``events`` and its archive."""
 
     id: Mapped[str] = mapped_column(String, primary_key=True)
     title: Mapped[str] = mapped_column(String)
@@ -32,9 +33,51 @@ class EventRow(Base):
     discord_link: Mapped[str | None] = mapped_column(String, nullable=True)
     website_link: Mapped[str | None] = mapped_column(String, nullable=True)
     created_at: Mapped[dt.datetime] = mapped_column(DateTime)
+    # Denormalized occupancy, maintained in the same transaction as reservation writes
+    confirmed_count: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    waitlist_count: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    # Event.public_json; NULL for events written before version 8
+    public_json: Mapped[str | None] = mapped_column(Text, nullable=True)
+
+
+class EventRow(_EventColumns, Base):
+    __tablename__ = "events"
+    __table_args__ = (
+        # Search: date-range filters and ordering
+        Index("ix_events_starts_at_id", "starts_at", "id"),
+    )
+
+
+class EventArchiveRow(_EventColumns, Base):
+    """Ended events moved out of ``events`` by the retention job (counters frozen)."""
+
+    __tablename__ = "events_archive"
+    __table_args__ = (Index("ix_events_archive_starts_at_id", "starts_at", "id"),)
 
+    archived_at: Mapped[dt.datetime] = mapped_column(DateTime)
 
-class ReservationRow(Base):
+
+# Predicate of the anonymous-email unique index; queries repeat it verbatim so the
+# planner can prove the partial index applies
+ANONYMOUS_ACTIVE = "status != 'canceled' AND user_id IS NULL"
+
+
+class _ReservationColumns:
+    """Columns shared by ``reservations`` and its archive."""
+
+    id: Mapped[str] = mapped_column(String, primary_key=True)
+    event_id: Mapped[str] = mapped_column(String)
+    user_id: Mapped[str | None] = mapped_column(String, nullable=True)
+    display_name: Mapped[str] = mapped_column(String)
+    email: Mapped[str | None] = mapped_column(String, nullable=True)
+    # normalize_email(email), written with the row; the anonymous idempotency key
+    email_normalized: Mapped[str | None] = mapped_column(String, nullable=True)
+    status: Mapped[str] = mapped_column(String)
+    promoted_at: Mapped[dt.datetime | None] = mapped_column(DateTime, nullable=True)
+    created_at: Mapped[dt.datetime] = mapped_column(DateTime)
+
+
+class ReservationRow(_ReservationColumns, Base):
     __tablename__ = "reservations"
     __table_args__ = (
         # Unique constraint: one active reservation per user per event
@@ -47,22 +90,35 @@ class ReservationRow(Base):
             postgresql_where=text("status != 'canceled' AND user_id IS NOT NULL"),
             sqlite_where=text("status != 'canceled' AND user_id IS NOT NULL"),
         ),
+        # Same for anonymous reservations, keyed by the normalized email
+        Index(
+            "ux_reservations_event_email_active",
+            "event_id",
+            "email_normalized",
+            unique=True,
+            postgresql_where=text(ANONYMOUS_ACTIVE),
+            sqlite_where=text(ANONYMOUS_ACTIVE),
+        ),
+        # Occupancy counts and waitlist head (oldest waitlisted) per event
+        Index("ix_reservations_event_status_created", "event_id", "status", "created_at"),
     )
 
-    id: Mapped[str] = mapped_column(String, primary_key=True)
-    event_id: Mapped[str] = mapped_column(String)
-    user_id: Mapped[str | None] = mapped_column(String, nullable=True)
-    display_name: Mapped[str] = mapped_column(String)
-    email: Mapped[str | None] = mapped_column(String, nullable=True)
-    status: Mapped[str] = mapped_column(String)
-    promoted_at: Mapped[dt.datetime | None] = mapped_column(DateTime, nullable=True)
-    created_at: Mapped[dt.datetime] = mapped_column(DateTime)
 
+class ReservationArchiveRow(_ReservationColumns, Base):
+    """Reservations of archived events, and old canceled ones, moved by retention."""
+
+    __tablename__ = "reservations_archive"
+    __table_args__ = (Index("ix_reservations_archive_event_id", "event_id"),)
 
-def create_all(engine: Engine) -> None:
-    metadata: MetaData = Base.metadata
-    metadata.create_all(engine)
+    archived_at: Mapped[dt.datetime] = mapped_column(DateTime)
 
 
-__all__ = ["EventRow", "ReservationRow", "create_all"]
+__all__ = [
+    "ANONYMOUS_ACTIVE",
+    "Base",
+    "EventArchiveRow",
+    "EventRow",
+    "ReservationArchiveRow",
+    "ReservationRow",
+]
 
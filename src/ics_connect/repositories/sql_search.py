@@ -0,0 +1,219 @@
+from __future__ import annotations
+
+import re
+from typing import Protocol
+
+from sqlalchemy import (
+    ColumnElement,
+    Float,
+    Function,
+    Select,
+    String,
+    case,
+    column,
+    func,
+    literal_column,
+    or_,
+    select,
+    table,
+    text,
+)
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import Session
+
+from ..models import Event
+from .sql_models import EventRow
+
+# Matches the tokens FTS5's unicode61 tokenizer and Postgres' parser index; anything
+# else in ``q`` (quotes, operators, wildcards) is dropped rather than interpreted.
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+_PG_TS_CONFIG = "english"
+
+# ``events`` columns the matchers read, typed; as literal columns they add no FROM
+_EVENT_ID = literal_column("events.id", String)
+_TITLE = literal_column("events.title", String)
+_DESCRIPTION = literal_column("events.description", String)
+_SEARCH_VECTOR = literal_column("events.search_vector", TSVECTOR)
+
+# FTS5 virtual table kept in step with ``events`` (see migration m0005)
+_FTS_EVENT_ID = column("event_id", String)
+_FTS_TITLE = column("title", String)
+_FTS_DESCRIPTION = column("description", String)
+events_fts = table("events_fts", _FTS_EVENT_ID, _FTS_TITLE, _FTS_DESCRIPTION)
+
+
+def query_tokens(q: str) -> list[str]:
+    return [m.group(0) for m in _TOKEN_RE.finditer(q.lower())]
+
+
+def escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+class EventSearch(Protocol):
+    """Text-matching strategy behind ``EventRepository.search``.
+
+    ``match`` narrows ``stmt`` (a SELECT over ``events``) to events matching ``q``
+    and returns a rank expression that sorts best matches first (ascending).
+    ``count_matches`` is an optional shortcut for unfiltered totals. ``index_event``
+    and ``remove_events`` keep any side index in step with event writes and
+    archiving; they run in the caller's transaction.
+    """
+
+    name: str
+
+    def match(
+        self, stmt: Select[tuple[EventRow]], q: str
+    ) -> tuple[Select[tuple[EventRow]], ColumnElement[float]]:  # pragma: no cover
+        raise NotImplementedError
+
+    def count_matches(self, q: str) -> Select[tuple[int]] | None:  # pragma: no cover
+        """Count matches from the side index alone (no other filters), if it has one."""
+        raise NotImplementedError
+
+    def index_event(self, session: Session, event: Event) -> None:  # pragma: no cover
+        raise NotImplementedError
+
+    def remove_events(self, session: Session, event_ids: list[str]) -> None:  # pragma: no cover
+        raise NotImplementedError
+
+
+class LikeEventSearch:
+    """Case-insensitive substring match (portable fallback, no side index)."""
+
+    name = "like"
+
+    def match(
+        self, stmt: Select[tuple[EventRow]], q: str
+    ) -> tuple[Select[tuple[EventRow]], ColumnElement[float]]:
+        pattern = f"%{escape_like(q)}%"
+        in_title = _TITLE.ilike(pattern, escape="\\")
+        stmt = stmt.where(or_(in_title, _DESCRIPTION.ilike(pattern, escape="\\")))
+        # No scoring available: title hits rank above description-only hits
+        rank: ColumnElement[float] = case((in_title, 0.0), else_=1.0)
+        return stmt, rank
+
+    def count_matches(self, q: str) -> Select[tuple[int]] | None:
+        """No side index: totals are counted from ``events`` (returns None)."""
+
+    def index_event(self, session: Session, event: Event) -> None:
+        """Nothing to maintain: matching reads ``events`` directly."""
+
+    def remove_events(self, session: Session, event_ids: list[str]) -> None:
+        """Nothing to maintain: matching reads ``events`` directly."""
+
+
+def _fts_match(tokens: list[str]) -> ColumnElement[bool]:
+    # Prefix match on every token, implicitly AND-ed: "jam" finds "jams"
+    expr = " ".join(f'"{t}"*' for t in tokens)
+    return literal_column("events_fts").bool_op("MATCH")(expr)
+
+
+class Fts5EventSearch:
+    """SQLite FTS5 over title/description, ranked by bm25 (lower is better)."""
+
+    name = "fts5"
+
+    def match(
+        self, stmt: Select[tuple[EventRow]], q: str
+    ) -> tuple[Select[tuple[EventRow]], ColumnElement[float]]:
+        tokens = query_tokens(q)
+        if not tokens:
+            return LikeEventSearch().match(stmt, q)
+        stmt = stmt.join(events_fts, _FTS_EVENT_ID == _EVENT_ID).where(_fts_match(tokens))
+        return stmt, literal_column("events_fts.rank", Float)
+
+    def count_matches(self, q: str) -> Select[tuple[int]] | None:
+        tokens = query_tokens(q)
+        if not tokens:
+            return None
+        # Counting inside the FTS index skips one events lookup per match
+        return select(func.count()).select_from(events_fts).where(_fts_match(tokens))
+
+    def index_event(self, session: Session, event: Event) -> None:
+        session.execute(
+            events_fts.insert().values(
+                event_id=event.id, title=event.title, description=event.description or ""
+            )
+        )
+
+    def remove_events(self, session: Session, event_ids: list[str]) -> None:
+        session.execute(events_fts.delete().where(_FTS_EVENT_ID.in_(event_ids)))
+
+
+class TsvectorEventSearch:
+    """Postgres ``tsvector`` match on the generated ``events.search_vector`` column.
+
+    The column is ``GENERATED ALWAYS ... STORED`` (migration m0005), so Postgres keeps it
+    in sync on every insert/update and there is nothing to index by hand.
+    """
+
+    name = "tsvector"
+
+    def match(
+        self, stmt: Select[tuple[EventRow]], q: str
+    ) -> tuple[Select[tuple[EventRow]], ColumnElement[float]]:
+        tokens = query_tokens(q)
+        if not tokens:
+            return LikeEventSearch().match(stmt, q)
+        terms = " & ".join(f"{t}:*" for t in tokens)
+        # Resolves to the postgresql dialect's to_tsquery (regconfig-typed config)
+        tsquery: ColumnElement[str] = func.to_tsquery(_PG_TS_CONFIG, terms)
+        stmt = stmt.where(_SEARCH_VECTOR.bool_op("@@")(tsquery))
+        return stmt, -Function("ts_rank", _SEARCH_VECTOR, tsquery, type_=Float)
+
+    def count_matches(self, q: str) -> Select[tuple[int]] | None:
+        """The GIN index is on ``events`` itself; the generic count is direct (None)."""
+
+    def index_event(self, session: Session, event: Event) -> None:
+        """Nothing to maintain: the generated column follows the row."""
+
+    def remove_events(self, session: Session, event_ids: list[str]) -> None:
+        """Nothing to maintain: the generated column goes with the row."""
+
+
+def rebuild_fts_index(session: Session) -> int:
+    """Re-derive ``events_fts`` from ``events`` (SQLite only); return rows indexed."""
+    if session.get_bind().dialect.name != "sqlite":
+        return 0
+    session.execute(text("DELETE FROM events_fts"))
+    session.execute(
+        text(
+            "INSERT INTO events_fts (event_id, title, description) "
+            "SELECT id, title, COALESCE(description, '') FROM events"
+        )
+    )
+    indexed = session.execute(select(func.count()).select_from(events_fts)).scalar_one()
+    session.commit()
+    return indexed
+
+
+SEARCH_BACKENDS = ("auto", "like")
+
+
+def event_search_for(dialect: str, backend: str = "auto") -> EventSearch:
+    """Pick the search strategy for a dialect; ``backend="like"`` forces the fallback."""
+    if backend not in SEARCH_BACKENDS:
+        raise ValueError(f"unknown search backend {backend!r}; expected one of {SEARCH_BACKENDS}")
+    if backend == "like":
+        return LikeEventSearch()
+    if dialect == "sqlite":
+        return Fts5EventSearch()
+    if dialect == "postgresql":
+        return TsvectorEventSearch()
+    return LikeEventSearch()
+
+
+__all__ = [
+    "SEARCH_BACKENDS",
+    "EventSearch",
+    "Fts5EventSearch",
+    "LikeEventSearch",
+    "TsvectorEventSearch",
+    "escape_like",
+    "event_search_for",
+    "events_fts",
+    "query_tokens",
+    "rebuild_fts_index",
+]
@@ -3,16 +3,20 @@ from __future__ import annotations
 from typing import Annotated
 
 from fastapi import APIRouter, Depends, Header
+from starlette.responses import Response
 
-from ..di import provide_repos
+from ..di import provide_read_repos, provide_repos
 from ..endpoints import (
     cancel_my_reservation_ep,
     create_event_ep,
-    get_event_ep,
+    event_etag,
+    get_event_listing_ep,
     my_reservation_ep,
     reserve_ep,
 )
 from ..errors import AppError
+from ..http_cache import json_response, not_modified
+from ..rendering import event_json
 from ..repositories.protocols import Repos
 from ..types import (
     CreatedEventResponse as CreatedEventResponseTD,
@@ -37,7 +41,10 @@ from ..validation import (
 
 router = APIRouter()
 StoreDep = Annotated[Repos, Depends(provide_repos)]
+# Safe GETs that tolerate replica lag; /mine stays on the primary (read-your-writes)
+ReadStoreDep = Annotated[Repos, Depends(provide_read_repos)]
 AuthHeader = Annotated[str | None, Header(convert_underscores=False)]
+IfNoneMatch = Annotated[str | None, Header()]
 
 
 def create_event(body: dict[str, object], store: StoreDep) -> CreatedEventResponseTD:
@@ -45,8 +52,16 @@ def create_event(body: dict[str, object], store: StoreDep) -> CreatedEventRespon
     return create_event_ep(payload, store)
 
 
-def get_event(event_id: str, store: StoreDep) -> EventPublic:
-    return get_event_ep(event_id, store)
+def get_event(
+    event_id: str, store: ReadStoreDep, if_none_match: IfNoneMatch = None
+) -> Response:
+    # A cache hit answers a revalidation without touching the database
+    row = get_event_listing_ep(event_id, store)
+    etag = event_etag(row)
+    unchanged = not_modified("event", etag, if_none_match)
+    if unchanged is not None:
+        return unchanged
+    return json_response("event", etag, event_json(row))
 
 
 def reserve(
@@ -135,7 +150,9 @@ def cancel_my_reservation(
 __all__ = ["router"]
 
 router.add_api_route("/events", create_event, methods=["POST"])
-router.add_api_route("/events/{event_id}", get_event, methods=["GET"])
+router.add_api_route(
+    "/events/{event_id}", get_event, methods=["GET"], response_model=EventPublic
+)
 router.add_api_route(
     "/events/{event_id}/reserve",
     reserve,
@@ -2,7 +2,8 @@ from __future__ import annotations
 
 from fastapi import APIRouter
 
-from ..endpoints import health_ep
+from ..endpoints import health_ep, metrics_ep
+from ..types import MetricsOut
 
 router = APIRouter()
 
@@ -11,7 +12,12 @@ def health() -> dict[str, bool]:
     return health_ep()
 
 
+def metrics() -> MetricsOut:
+    return metrics_ep()
+
+
 router.add_api_route("/health", health, methods=["GET"])
+router.add_api_route("/metrics", metrics, methods=["GET"])
 
 
 __all__ = ["router"]
@@ -1,21 +1,34 @@
 from __future__ import annotations
 
 import datetime as dt
+import re
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, Request
+from fastapi import APIRouter, Depends, Header, Request
+from starlette.responses import Response
 
-from ..di import provide_repos
-from ..endpoints import SearchParams, search_ep
+from ..di import provide_read_repos
+from ..endpoints import SearchParams, search_etag, search_json_ep
+from ..http_cache import http_cache_policy, json_response, not_modified
 from ..repositories.protocols import Repos
 from ..types import SearchResult as SearchResultTD
 
 router = APIRouter()
 
-StoreDep = Annotated[Repos, Depends(provide_repos)]
+StoreDep = Annotated[Repos, Depends(provide_read_repos)]
 
+IfNoneMatch = Annotated[str | None, Header()]
+CacheControl = Annotated[str | None, Header()]
+_NO_CACHE = re.compile(r"\bno-(cache|store)\b", re.IGNORECASE)
+_TRUE = frozenset({"1", "true", "yes", "on"})
 
-def search(request: Request, store: StoreDep) -> SearchResultTD:
+
+def search(
+    request: Request,
+    store: StoreDep,
+    if_none_match: IfNoneMatch = None,
+    cache_control: CacheControl = None,
+) -> Response:
     qp = request.query_params
     q = qp.get("q")
     start_raw = qp.get("start")
@@ -26,10 +39,27 @@ def search(request: Request, store: StoreDep) -> SearchResultTD:
     to_dt = dt.datetime.fromisoformat(to_raw) if to_raw else None
     limit = int(limit_raw) if limit_raw is not None else 10
     offset = int(offset_raw) if offset_raw is not None else 0
-    params = SearchParams(q=q, start=start_dt, to=to_dt, limit=limit, offset=offset)
-    return search_ep(params, store)
+    params = SearchParams(
+        q=q,
+        start=start_dt,
+        to=to_dt,
+        limit=limit,
+        offset=offset,
+        cursor=qp.get("cursor"),
+        sort=qp.get("sort"),
+        include_past=(qp.get("include_past") or "").strip().lower() in _TRUE,
+        # Cache-Control: no-cache (a hard reload) asks for a page read anew
+        fresh=_NO_CACHE.search(cache_control or "") is not None,
+    )
+    # Checked before the query runs: a 304 costs no database work at all
+    etag = search_etag(params, http_cache_policy().generation_window)
+    unchanged = not_modified("search", etag, if_none_match)
+    if unchanged is not None:
+        return unchanged
+    body = search_json_ep(params, store)
+    return json_response("search", etag, body)
 
 
-router.add_api_route("/search", search, methods=["GET"])
+router.add_api_route("/search", search, methods=["GET"], response_model=SearchResultTD)
 
 __all__ = ["router"]
@@ -3,10 +3,13 @@ from __future__ import annotations
 import datetime as dt
 from dataclasses import dataclass
 
+from ..cache import event_cache
 from ..models import Event
+from ..rendering import event_fragment
 from ..repositories.protocols import Repos
 from ..util.hashing import hash_secret
-from ..util.ids import new_uuid
+from ..util.ids import new_id, new_uuid
+from ..util.time import as_utc
 
 
 @dataclass(frozen=True)
@@ -41,12 +44,12 @@ class EventService:
         if data.requires_join_code:
             join_code_raw = new_uuid().split("-")[0].upper()
         ev = Event(
-            id=new_uuid(),
+            id=new_id(),
             title=data.title,
             description=data.description,
             type=data.type,
-            starts_at=data.starts_at,
-            ends_at=data.ends_at,
+            starts_at=as_utc(data.starts_at),
+            ends_at=as_utc(data.ends_at),
             location_text=data.location_text,
             tags_json="[]",
             public=data.public,
@@ -58,5 +61,9 @@ class EventService:
             discord_link=data.discord_link,
             website_link=data.website_link,
         )
-        self._repos.events.create(ev)
+        # Rendered once here; every read of the event reuses it
+        ev.public_json = event_fragment(ev)
+        with self._repos.transaction():
+            self._repos.events.create(ev)
+        event_cache().invalidate(ev.id)
         return CreatedEvent(event=ev, join_code=join_code_raw, admin_key=admin_key_raw)
@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import datetime as dt
+from dataclasses import dataclass
+
+from ..cache import event_cache
+from ..repositories.protocols import Repos
+
+
+@dataclass(frozen=True)
+class RetentionInput:
+    # Events that ended, and canceled reservations created, before this move out
+    cutoff: dt.datetime
+    # Events (with their reservations) or canceled reservations per transaction
+    batch_size: int = 500
+    # Stop after this many batches of each kind; None runs until nothing is left
+    max_batches: int | None = None
+
+
+@dataclass(frozen=True)
+class RetentionResult:
+    events: int
+    reservations: int
+    batches: int
+
+
+class RetentionService:
+    """Moves ended events and stale canceled reservations to the archive tables.
+
+    Each batch is its own unit of work, so a run holds locks for one batch at a
+    time and can be interrupted (or fail) without losing the batches before it.
+    """
+
+    def __init__(self, repos: Repos) -> None:
+        self._repos = repos
+
+    def archive(self, data: RetentionInput) -> RetentionResult:
+        events = reservations = batches = 0
+        size = max(data.batch_size, 1)
+        while data.max_batches is None or batches < data.max_batches:
+            with self._repos.transaction():
+                moved = self._repos.events.archive_ended(data.cutoff, size)
+            batches += 1
+            events += moved.events
+            if moved.events:
+                # Archived events are gone from GET /events/{id}
+                event_cache().clear()
+            reservations += moved.reservations
+            if moved.events < size:
+                break
+        canceled_batches = 0
+        while data.max_batches is None or canceled_batches < data.max_batches:
+            with self._repos.transaction():
+                count = self._repos.reservations.archive_canceled(data.cutoff, size)
+            canceled_batches += 1
+            reservations += count
+            if count < size:
+                break
+        return RetentionResult(
+            events=events, reservations=reservations, batches=batches + canceled_batches
+        )
@@ -10,6 +10,13 @@ def _getenv(name: str) -> str | None:
     return os.environ.get(f"{ENV_PREFIX}{name}")
 
 
+def _getenv_bool(name: str, default: bool) -> bool:
+    raw = _getenv(name)
+    if raw is None or not raw.strip():
+        return default
+    return raw.strip().lower() in {"1", "true", "yes", "on"}
+
+
 @dataclass(frozen=True)
 class Settings:
     jwt_secret: str
@@ -19,6 +26,28 @@ class Settings:
     rate_limit_read: int
     port: int
     bot_key: str | None
+    db_pool_size: int
+    db_max_overflow: int
+    db_pool_timeout: float
+    db_pool_recycle: int
+    db_pool_pre_ping: bool
+    db_auto_migrate: bool
+    search_backend: str
+    database_read_url: str | None
+    database_read_after_write_seconds: float
+    archive_after_days: int
+    archive_interval_seconds: int
+    archive_batch_size: int
+    sqlite_profile: str
+    sqlite_busy_timeout_ms: int
+    sqlite_mmap_size: int
+    event_cache_size: int
+    event_cache_max_staleness: float
+    cache_control_event: str
+    cache_control_search: str
+    search_etag_window_seconds: float
+    search_cache_size: int
+    search_cache_max_staleness: float
 
     @staticmethod
     def from_env() -> Settings:
@@ -29,6 +58,23 @@ class Settings:
         rate_limit_write_raw = _getenv("RATE_LIMIT_WRITE")
         rate_limit_read_raw = _getenv("RATE_LIMIT_READ")
         port_raw = _getenv("PORT")
+        pool_size_raw = _getenv("DB_POOL_SIZE")
+        max_overflow_raw = _getenv("DB_MAX_OVERFLOW")
+        pool_timeout_raw = _getenv("DB_POOL_TIMEOUT")
+        pool_recycle_raw = _getenv("DB_POOL_RECYCLE")
+        read_after_write_raw = _getenv("DB_READ_AFTER_WRITE_SECONDS")
+        archive_after_raw = _getenv("ARCHIVE_AFTER_DAYS")
+        archive_interval_raw = _getenv("ARCHIVE_INTERVAL_SECONDS")
+        archive_batch_raw = _getenv("ARCHIVE_BATCH_SIZE")
+        busy_timeout_raw = _getenv("SQLITE_BUSY_TIMEOUT_MS")
+        mmap_size_raw = _getenv("SQLITE_MMAP_SIZE")
+        event_cache_size_raw = _getenv("EVENT_CACHE_SIZE")
+        event_cache_staleness_raw = _getenv("EVENT_CACHE_MAX_STALENESS_SECONDS")
+        cache_control_event_raw = _getenv("CACHE_CONTROL_EVENT")
+        cache_control_search_raw = _getenv("CACHE_CONTROL_SEARCH")
+        etag_window_raw = _getenv("SEARCH_ETAG_WINDOW_SECONDS")
+        search_cache_size_raw = _getenv("SEARCH_CACHE_SIZE")
+        search_cache_staleness_raw = _getenv("SEARCH_CACHE_MAX_STALENESS_SECONDS")
         return Settings(
             jwt_secret=jwt_secret,
             cors_origin=cors_origin,
@@ -37,6 +83,54 @@ class Settings:
             rate_limit_read=int(rate_limit_read_raw) if rate_limit_read_raw else 60,
             port=int(port_raw) if port_raw else 8000,
             bot_key=_getenv("BOT_KEY"),
+            db_pool_size=int(pool_size_raw) if pool_size_raw else 5,
+            db_max_overflow=int(max_overflow_raw) if max_overflow_raw else 10,
+            db_pool_timeout=float(pool_timeout_raw) if pool_timeout_raw else 30.0,
+            db_pool_recycle=int(pool_recycle_raw) if pool_recycle_raw else 1800,
+            db_pool_pre_ping=_getenv_bool("DB_POOL_PRE_PING", True),
+            db_auto_migrate=_getenv_bool("DB_AUTO_MIGRATE", True),
+            # "auto": FTS5 on SQLite / tsvector on Postgres; "like": substring scan
+            search_backend=(_getenv("SEARCH_BACKEND") or "auto").strip().lower(),
+            # Read replica for GET routes; unprefixed, like DATABASE_URL
+            database_read_url=os.environ.get("DATABASE_READ_URL") or None,
+            # After a write by this process, reads stay on the primary this long so
+            # a lagging replica cannot hand back (and caches keep) the old rows
+            database_read_after_write_seconds=(
+                float(read_after_write_raw) if read_after_write_raw else 5.0
+            ),
+            # Retention: events this many days past their end move to the archive
+            archive_after_days=int(archive_after_raw) if archive_after_raw else 30,
+            # In-process retention job period; 0 leaves it to `cli archive` (cron)
+            archive_interval_seconds=int(archive_interval_raw) if archive_interval_raw else 0,
+            archive_batch_size=int(archive_batch_raw) if archive_batch_raw else 500,
+            # File SQLite: "production" (WAL, one writer connection, reader pool) or
+            # "default" (SQLite's own settings, one pool for everything)
+            sqlite_profile=(_getenv("SQLITE_PROFILE") or "production").strip().lower(),
+            sqlite_busy_timeout_ms=int(busy_timeout_raw) if busy_timeout_raw else 5000,
+            # Bytes of the database file read through mmap; 0 disables it
+            sqlite_mmap_size=int(mmap_size_raw) if mmap_size_raw else 256 * 1024 * 1024,
+            # GET /events/{id} cache: entries kept (0 disables it) and the longest a
+            # cached response (its occupancy counts) may be served
+            event_cache_size=int(event_cache_size_raw) if event_cache_size_raw else 1024,
+            event_cache_max_staleness=(
+                float(event_cache_staleness_raw) if event_cache_staleness_raw else 2.0
+            ),
+            # Cache-Control for GET /events/{id} and /search ("" sends none); the
+            # default lets clients keep bodies but revalidate them with If-None-Match
+            cache_control_event=(
+                "no-cache" if cache_control_event_raw is None else cache_control_event_raw.strip()
+            ),
+            cache_control_search=(
+                "no-cache" if cache_control_search_raw is None else cache_control_search_raw.strip()
+            ),
+            # /search ETags (this process's write generation) also roll over this often
+            search_etag_window_seconds=float(etag_window_raw) if etag_window_raw else 60.0,
+            # /search result pages kept (0 disables) and how long one may be served
+            # when no write by this process has made it stale
+            search_cache_size=int(search_cache_size_raw) if search_cache_size_raw else 256,
+            search_cache_max_staleness=(
+                float(search_cache_staleness_raw) if search_cache_staleness_raw else 60.0
+            ),
         )
 
 
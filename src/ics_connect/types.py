@@ -37,9 +37,10 @@ class EventPublic(TypedDict):
     tags: list[str]
     public: bool
     capacity: int
+    requires_join_code: bool
+    # Last: the only fields that change, appended to a pre-rendered prefix (rendering.py)
     confirmed_count: int
     waitlist_count: int
-    requires_join_code: bool
 
 
 class CreatedEventResponse(TypedDict):
@@ -70,6 +71,48 @@ class ReserveResponse(TypedDict):
 class SearchResult(TypedDict):
     events: list[EventPublic]
     total: int
+    # Opaque token for the next page (pass back as ?cursor=); None on the last page
+    next_cursor: str | None
+
+
+class PoolStatsOut(TypedDict):
+    size: int
+    checked_out: int
+    overflow: int
+    checkouts: int
+    checkins: int
+    wait_ms_total: float
+    wait_ms_max: float
+
+
+class EventCacheStatsOut(TypedDict):
+    size: int
+    max_entries: int
+    max_staleness_seconds: float
+    hits: int
+    misses: int
+    evictions: int
+    invalidations: int
+
+
+class SearchCacheStatsOut(TypedDict):
+    size: int
+    max_entries: int
+    max_staleness_seconds: float
+    hits: int
+    misses: int
+    # hits / (hits + misses); bypassed lookups count as neither
+    hit_rate: float
+    # Misses that found a page made stale by a write or by age
+    stale: int
+    evictions: int
+    bypassed: int
+
+
+class MetricsOut(TypedDict):
+    db_pool: PoolStatsOut | None
+    event_cache: EventCacheStatsOut
+    search_cache: SearchCacheStatsOut
 
 
 # Auth/profile
@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import base64
+import binascii
+import datetime as dt
+
+from .time import as_utc
+
+_SEP = "|"
+# Ranked (relevance) pages have no stable keyset position; their cursor is an offset
+_OFFSET_MARK = "#"
+
+
+def _encode(raw: str) -> str:
+    return base64.urlsafe_b64encode(raw.encode()).decode("ascii").rstrip("=")
+
+
+def encode_cursor(starts_at: dt.datetime, event_id: str) -> str:
+    """Encode a ``(starts_at, id)`` keyset position as an opaque URL-safe token."""
+    return _encode(f"{starts_at.isoformat()}{_SEP}{event_id}")
+
+
+def encode_offset_cursor(offset: int) -> str:
+    """Encode the offset of the next ranked page as an opaque URL-safe token."""
+    return _encode(f"{_OFFSET_MARK}{offset}")
+
+
+def decode_cursor(token: str) -> tuple[dt.datetime, str] | int:
+    """Inverse of the encoders: a keyset position or an offset.
+
+    Positions come back in UTC (``as_utc``): SQL backends hand back naive UTC
+    datetimes, and the in-memory store keys events by aware ones. Raises
+    ``ValueError`` on malformed tokens.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)).decode()
+    except (binascii.Error, UnicodeDecodeError) as exc:
+        raise ValueError("malformed cursor") from exc
+    if raw.startswith(_OFFSET_MARK):
+        offset = int(raw[len(_OFFSET_MARK) :])
+        if offset < 0:
+            raise ValueError("malformed cursor")
+        return offset
+    starts_raw, sep, event_id = raw.partition(_SEP)
+    if not sep or not event_id:
+        raise ValueError("malformed cursor")
+    return as_utc(dt.datetime.fromisoformat(starts_raw)), event_id
@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+import hashlib
+
+
+def strong_etag(*parts: object) -> str:
+    """A quoted strong entity tag over ``parts`` (which must determine the body)."""
+    raw = "\x1f".join(str(p) for p in parts).encode()
+    return f'"{hashlib.blake2b(raw, digest_size=12).hexdigest()}"'
+
+
+def weak_etag(*parts: object) -> str:
+    """``W/`` + :func:`strong_etag`: for bodies ``parts`` identify only approximately."""
+    return f"W/{strong_etag(*parts)}"
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """``If-None-Match`` semantics: ``*`` or any listed tag (weak comparison)."""
+    if not if_none_match:
+        return False
+    opaque = etag.removeprefix("W/")
+    for candidate in if_none_match.split(","):
+        tag = candidate.strip()
+        if tag == "*" or tag.removeprefix("W/") == opaque:
+            return True
+    return False
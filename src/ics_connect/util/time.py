@@ -6,3 +6,14 @@ import datetime as dt
 def utcnow() -> dt.datetime:
     return dt.datetime.now(dt.UTC)
 
+
+def as_utc(value: dt.datetime) -> dt.datetime:
+    """``value`` as an aware UTC datetime; naive values are taken to be UTC already.
+
+    Event times, search bounds and cursor positions all pass through here, so the
+    in-memory store never compares naive with aware datetimes.
+    """
+    if value.tzinfo is None:
+        return value.replace(tzinfo=dt.UTC)
+    return value.astimezone(dt.UTC)
+
@@ -7,7 +7,7 @@ from ics_connect.db import Store
 from ics_connect.endpoints import (
     cancel_my_reservation_ep,
     create_event_ep,
-    get_event_ep,
+    get_event_listing_ep,
     my_reservation_ep,
     reserve_ep,
 )
@@ -47,8 +47,8 @@ class TestAPI(unittest.TestCase):
         event_id: str = event["id"]
         self.assertEqual(event["title"], body["title"])
 
-        got = get_event_ep(event_id, self.repos)
-        self.assertEqual(got["id"], event_id)
+        got = get_event_listing_ep(event_id, self.repos)
+        self.assertEqual(got.id, event_id)
 
         # Create auth token for first user
         user1_id = "user-ana-123"
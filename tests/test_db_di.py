@@ -1,10 +1,24 @@
 from __future__ import annotations
 
 import os
+import tempfile
 import unittest
+from pathlib import Path
 
-from ics_connect.db import Store, get_engine, get_session, get_store, init_db
+from sqlalchemy import text
+
+from ics_connect.db import (
+    Store,
+    current_database,
+    dispose_database,
+    get_engine,
+    get_session,
+    get_store,
+    init_database,
+    init_db,
+)
 from ics_connect.di import provide_repos, provide_store
+from ics_connect.repositories.sql import SQLRepos
 
 
 class TestDBDI(unittest.TestCase):
@@ -43,3 +57,33 @@ class TestDBDI(unittest.TestCase):
         # Exhaust generator to cover return path
         with self.assertRaises(StopIteration):
             _ = next(gen2)
+
+    def test_provide_repos_reuses_process_engine(self) -> None:
+        os.environ["DATABASE_URL"] = "sqlite:///:memory:"
+        try:
+            first = next(provide_repos())
+            second = next(provide_repos())
+            self.assertIsInstance(first, SQLRepos)
+            self.assertIsInstance(second, SQLRepos)
+            if isinstance(first, SQLRepos) and isinstance(second, SQLRepos):
+                self.assertIsNot(first.session, second.session)
+                self.assertIs(first.session.bind, second.session.bind)
+        finally:
+            del os.environ["DATABASE_URL"]
+
+    def test_pool_stats_for_file_database(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            database = init_database(f"sqlite:///{Path(tmp) / 'pool.db'}")
+            try:
+                before = database.pool_stats()
+                for session in database.session():
+                    session.execute(text("SELECT 1"))
+                stats = database.pool_stats()
+                self.assertEqual(stats["checkouts"], before["checkouts"] + 1)
+                self.assertEqual(stats["checkins"], before["checkins"] + 1)
+                self.assertEqual(stats["checked_out"], 0)
+                self.assertGreaterEqual(stats["wait_ms_max"], 0.0)
+                self.assertIs(current_database(), database)
+            finally:
+                dispose_database()
+        self.assertIsNone(current_database())
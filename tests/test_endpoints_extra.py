@@ -3,21 +3,31 @@ from __future__ import annotations
 import datetime as dt
 import unittest
 
+from pydantic import TypeAdapter
+
 from ics_connect.db import Store
 from ics_connect.endpoints import (
     SearchParams,
     cancel_my_reservation_ep,
     create_event_ep,
-    get_event_ep,
+    get_event_listing_ep,
     health_ep,
     my_reservation_ep,
     reserve_ep,
-    search_ep,
+    search_json_ep,
 )
 from ics_connect.errors import AppError
 from ics_connect.repositories.inmemory import InMemoryRepos
+from ics_connect.repositories.protocols import Repos
 from ics_connect.types import CreateEventBody, ReserveBody, SearchResult
 
+_SEARCH_JSON: TypeAdapter[SearchResult] = TypeAdapter(SearchResult)
+
+
+def _search(params: SearchParams, repos: Repos) -> SearchResult:
+    # The /search body as served, decoded back into its typed shape
+    return _SEARCH_JSON.validate_json(search_json_ep(params, repos))
+
 
 class TestEndpointsExtra(unittest.TestCase):
     def setUp(self) -> None:
@@ -47,19 +57,33 @@ class TestEndpointsExtra(unittest.TestCase):
         body_b: ReserveBody = {"display_name": "B", "email": None, "join_code": None}
         reserve_ep(self.event_id, body_a, self.repos)
         reserve_ep(self.event_id, body_b, self.repos)
-        pub = get_event_ep(self.event_id, self.repos)
-        self.assertEqual(pub["confirmed_count"], 1)
-        self.assertEqual(pub["waitlist_count"], 1)
+        row = get_event_listing_ep(self.event_id, self.repos)
+        self.assertEqual(row.confirmed_count, 1)
+        self.assertEqual(row.waitlist_count, 1)
+
+    def test_search_batches_occupancy_per_page(self) -> None:
+        body_a: ReserveBody = {"display_name": "A", "email": None, "join_code": None}
+        body_b: ReserveBody = {"display_name": "B", "email": None, "join_code": None}
+        reserve_ep(self.event_id, body_a, self.repos)
+        reserve_ep(self.event_id, body_b, self.repos)
+        counts = self.repos.reservations.counts_for_events([self.event_id, "missing"])
+        self.assertEqual(counts[self.event_id].confirmed, 1)
+        self.assertEqual(counts[self.event_id].waitlisted, 1)
+        self.assertEqual(counts["missing"].confirmed, 0)
+        params = SearchParams(q="alpha", start=None, to=None, limit=10, offset=0)
+        result = _search(params=params, repos=self.repos)
+        self.assertEqual(result["events"][0]["confirmed_count"], 1)
+        self.assertEqual(result["events"][0]["waitlist_count"], 1)
 
     def test_health_and_search_defaults(self) -> None:
         ok = health_ep()
         expected: dict[str, bool] = {"ok": True}
         self.assertEqual(ok, expected)
         params = SearchParams(q=None, start=None, to=None, limit=10, offset=0)
-        result = search_ep(params=params, repos=self.repos)
+        result = _search(params=params, repos=self.repos)
         self.assertGreaterEqual(result["total"], 1)
         params2 = SearchParams(q=None, start=None, to=None, limit=10, offset=999)
-        result2 = search_ep(params=params2, repos=self.repos)
+        result2 = _search(params=params2, repos=self.repos)
         self.assertEqual(len(result2["events"]), 0)
 
     def test_search_q_and_dates_and_paging(self) -> None:
@@ -82,10 +106,43 @@ class TestEndpointsExtra(unittest.TestCase):
         params = SearchParams(
             q="alpha", start=now, to=now + dt.timedelta(hours=5), limit=1, offset=0
         )
-        result: SearchResult = search_ep(params=params, repos=self.repos)
+        result: SearchResult = _search(params=params, repos=self.repos)
         self.assertGreaterEqual(result["total"], 1)
         self.assertEqual(len(result["events"]), 1)
 
+    def test_search_cursor_pages(self) -> None:
+        now = dt.datetime.now(dt.UTC)
+        for i in range(4):
+            body: CreateEventBody = {
+                **self.body,
+                "title": f"Alpha {i}",
+                "starts_at": now + dt.timedelta(hours=3 + i),
+            }
+            create_event_ep(body, self.repos)
+        titles: list[str] = []
+        cursor: str | None = None
+        while True:
+            params = SearchParams(q="alpha", start=None, to=None, limit=2, offset=0, cursor=cursor)
+            result = _search(params=params, repos=self.repos)
+            self.assertEqual(result["total"], 5)
+            titles.extend(ev["title"] for ev in result["events"])
+            cursor = result["next_cursor"]
+            if cursor is None:
+                break
+        expected = ["Alpha", "Alpha 0", "Alpha 1", "Alpha 2", "Alpha 3"]
+        self.assertEqual(titles, expected)
+
+    def test_search_cursor_errors(self) -> None:
+        for cursor, offset in (("not a cursor!", 0), ("YWJj", 0), ("YWJjfGlk", 2)):
+            params = SearchParams(
+                q=None, start=None, to=None, limit=2, offset=offset, cursor=cursor
+            )
+            with self.subTest(cursor=cursor), self.assertRaises(AppError):
+                _search(params=params, repos=self.repos)
+        bad_sort = SearchParams(q="alpha", start=None, to=None, limit=2, offset=0, sort="title")
+        with self.assertRaises(AppError):
+            _search(params=bad_sort, repos=self.repos)
+
     def test_my_reservation_invalid_event(self) -> None:
         body_c: ReserveBody = {"display_name": "C", "email": None, "join_code": None}
         r = reserve_ep(self.event_id, body_c, self.repos)
@@ -100,7 +157,7 @@ class TestEndpointsExtra(unittest.TestCase):
 
     def test_get_event_not_found(self) -> None:
         with self.assertRaises(AppError):
-            _ = get_event_ep("missing", self.repos)
+            _ = get_event_listing_ep("missing", self.repos)
 
     def test_my_reservation_invalid_token_no_user_id(self) -> None:
         """Test my_reservation_ep with token containing invalid user_id (line 127)."""
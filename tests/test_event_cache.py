@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+import datetime as dt
+import unittest
+from dataclasses import replace
+
+from ics_connect.cache import EventCache, configure_event_cache, event_cache
+from ics_connect.db import Store
+from ics_connect.endpoints import (
+    cancel_my_reservation_ep,
+    create_event_ep,
+    get_event_listing_ep,
+    metrics_ep,
+    reserve_ep,
+)
+from ics_connect.models import EventListing
+from ics_connect.repositories.inmemory import InMemoryRepos
+from ics_connect.settings import Settings
+from ics_connect.types import CreateEventBody, ReserveBody
+from ics_connect.util.jwt import encode_token
+
+_STALENESS = 2.0
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _listing(event_id: str, confirmed: int = 0) -> EventListing:
+    now = dt.datetime(2030, 1, 1, tzinfo=dt.UTC)
+    return EventListing(
+        id=event_id,
+        title="Cached",
+        description=None,
+        type=None,
+        starts_at=now,
+        ends_at=now,
+        location_text=None,
+        discord_link=None,
+        website_link=None,
+        public=True,
+        capacity=5,
+        requires_join_code=False,
+        confirmed_count=confirmed,
+        waitlist_count=0,
+    )
+
+
+class _Loader:
+    """Counts loads; ``during`` runs inside the load, as a concurrent write would."""
+
+    def __init__(self, cache: EventCache, event_id: str) -> None:
+        self.cache = cache
+        self.event_id = event_id
+        self.calls = 0
+        self.during = False
+
+    def __call__(self) -> EventListing | None:
+        self.calls += 1
+        if self.during:
+            self.cache.invalidate(self.event_id)
+        return _listing(self.event_id, confirmed=self.calls)
+
+
+class TestEventCache(unittest.TestCase):
+    def setUp(self) -> None:
+        self.clock = _Clock()
+        self.cache = EventCache(2, _STALENESS, clock=self.clock)
+
+    def test_hits_until_max_staleness(self) -> None:
+        load = _Loader(self.cache, "a")
+        self.cache.get_or_load("a", load)
+        self.clock.now += _STALENESS
+        self.assertEqual(self.cache.get_or_load("a", load), _listing("a", confirmed=1))
+        self.clock.now += 0.5
+        self.assertEqual(self.cache.get_or_load("a", load), _listing("a", confirmed=2))
+        stats = self.cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["size"]), (1, 2, 1))
+
+    def test_least_recently_used_is_evicted(self) -> None:
+        loads = {key: _Loader(self.cache, key) for key in "abc"}
+        for key in "aba":
+            self.cache.get_or_load(key, loads[key])
+        # "b" is now the least recently used
+        self.cache.get_or_load("c", loads["c"])
+        self.cache.get_or_load("b", loads["b"])
+        self.assertEqual(loads["b"].calls, 2)
+        self.assertEqual(loads["a"].calls, 1)
+        self.assertEqual(self.cache.stats()["evictions"], 2)
+
+    def test_invalidate_drops_the_entry(self) -> None:
+        load = _Loader(self.cache, "a")
+        self.cache.get_or_load("a", load)
+        self.cache.invalidate("a")
+        self.cache.get_or_load("a", load)
+        self.assertEqual(load.calls, 2)
+        self.assertEqual(self.cache.stats()["invalidations"], 1)
+
+    def test_load_overlapping_an_invalidation_is_not_kept(self) -> None:
+        load = _Loader(self.cache, "a")
+        load.during = True
+        self.cache.get_or_load("a", load)
+        load.during = False
+        self.cache.get_or_load("a", load)
+        self.cache.get_or_load("a", load)
+        self.assertEqual(load.calls, 2)
+
+    def test_misses_are_not_cached_and_disabled_cache_passes_through(self) -> None:
+        missing = 0
+
+        def absent() -> EventListing | None:
+            nonlocal missing
+            missing += 1
+            return None
+
+        self.cache.get_or_load("x", absent)
+        self.cache.get_or_load("x", absent)
+        self.assertEqual(missing, 2)
+        off = EventCache(0, _STALENESS)
+        load = _Loader(off, "a")
+        off.get_or_load("a", load)
+        off.get_or_load("a", load)
+        self.assertEqual((load.calls, off.stats()["misses"]), (2, 0))
+
+    def test_written_within_tracks_the_last_write(self) -> None:
+        self.assertFalse(self.cache.written_within(5))
+        self.cache.invalidate("a")
+        self.clock.now += 4
+        self.assertTrue(self.cache.written_within(5))
+        self.clock.now += 1
+        self.assertFalse(self.cache.written_within(5))
+        self.cache.clear()
+        self.assertTrue(self.cache.written_within(5))
+        self.assertFalse(self.cache.written_within(0))
+
+
+class TestGetEventCaching(unittest.TestCase):
+    def setUp(self) -> None:
+        settings = replace(Settings.from_env(), event_cache_max_staleness=3600.0)
+        self.cache = configure_event_cache(settings)
+        self.repos = InMemoryRepos(Store())
+        now = dt.datetime.now(dt.UTC)
+        body: CreateEventBody = {
+            "title": "Popular",
+            "description": None,
+            "type": None,
+            "starts_at": now + dt.timedelta(hours=1),
+            "ends_at": now + dt.timedelta(hours=2),
+            "location_text": None,
+            "discord_link": None,
+            "website_link": None,
+            "capacity": 1,
+            "public": True,
+            "requires_join_code": False,
+            "tags": [],
+        }
+        self.event_id = create_event_ep(body, self.repos)["event"]["id"]
+
+    def tearDown(self) -> None:
+        configure_event_cache(Settings.from_env())
+
+    def test_repeated_reads_hit_and_writes_invalidate(self) -> None:
+        self.assertIs(event_cache(), self.cache)
+        first = get_event_listing_ep(self.event_id, self.repos)
+        self.assertEqual(get_event_listing_ep(self.event_id, self.repos), first)
+        token = encode_token({"sub": "u1", "email": "u1@uci.edu", "name": "U"})
+        body: ReserveBody = {"display_name": "U", "email": "u1@uci.edu", "join_code": None}
+        reserve_ep(self.event_id, body, self.repos, user_id="u1")
+        self.assertEqual(get_event_listing_ep(self.event_id, self.repos).confirmed_count, 1)
+        cancel_my_reservation_ep(self.event_id, token, self.repos)
+        self.assertEqual(get_event_listing_ep(self.event_id, self.repos).confirmed_count, 0)
+        stats = metrics_ep()["event_cache"]
+        self.assertEqual((stats["hits"], stats["misses"]), (1, 3))
+        # create + reserve + cancel
+        self.assertEqual(stats["invalidations"], 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
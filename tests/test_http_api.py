@@ -7,6 +7,7 @@ import unittest
 from fastapi.testclient import TestClient
 
 from ics_connect.main import app
+from ics_connect.util.cursor import encode_cursor
 
 
 class TestHTTPAPI(unittest.TestCase):
@@ -98,12 +99,77 @@ class TestHTTPAPI(unittest.TestCase):
         )
         self.assertEqual(r7.status_code, 200)
 
+    def test_http_search_cursor_without_offset(self) -> None:
+        now = dt.datetime.now(dt.UTC)
+        payload: dict[str, object] = {
+            "title": "HTTP Naive cursor",
+            "starts_at": (now + dt.timedelta(hours=1)).isoformat(),
+            "ends_at": (now + dt.timedelta(hours=2)).isoformat(),
+            "capacity": 1,
+            "public": True,
+            "requires_join_code": False,
+        }
+        self.assertEqual(self.client.post("/api/v1/events", json=payload).status_code, 200)
+        # A position with no UTC offset compares as UTC against stored events
+        naive = encode_cursor(dt.datetime(2000, 1, 1), "x")
+        rs = self.client.get("/api/v1/search", params={"cursor": naive})
+        self.assertEqual(rs.status_code, 200)
+        self.assertIn("HTTP Naive cursor", rs.text)
+
+    def test_http_search_pages_events_given_without_offset(self) -> None:
+        base = dt.datetime(2031, 5, 1, 10)
+        for i in range(2):
+            payload: dict[str, object] = {
+                "title": f"HTTP Local page {i}",
+                "starts_at": (base + dt.timedelta(days=i)).isoformat(),
+                "ends_at": (base + dt.timedelta(days=i, hours=1)).isoformat(),
+                "capacity": 1,
+                "public": True,
+                "requires_join_code": False,
+            }
+            self.assertEqual(self.client.post("/api/v1/events", json=payload).status_code, 200)
+        params = {"q": "HTTP Local page", "sort": "starts_at", "limit": "1"}
+        first = self.client.get("/api/v1/search", params=params)
+        self.assertIn("HTTP Local page 0", first.text)
+        m = re.search(r'"next_cursor":"([^"]+)"', first.text)
+        self.assertIsNotNone(m)
+        # Stored as UTC, so the cursor's position compares with the events' times
+        cursor = m.group(1) if m else ""
+        rest = self.client.get("/api/v1/search", params={**params, "cursor": cursor})
+        self.assertEqual(rest.status_code, 200)
+        self.assertIn("HTTP Local page 1", rest.text)
+
+    def test_http_create_mixes_offset_and_naive_times(self) -> None:
+        starts = ("2032-01-01T10:00:00+00:00", "2032-01-02T10:00:00", "2032-01-03T10:00:00+02:00")
+        for i, starts_at in enumerate(starts):
+            payload: dict[str, object] = {
+                "title": f"HTTP Mixed {i}",
+                "starts_at": starts_at,
+                "ends_at": "2032-02-01T10:00:00",
+                "capacity": 1,
+                "public": True,
+                "requires_join_code": False,
+            }
+            created = self.client.post("/api/v1/events", json=payload)
+            self.assertEqual(created.status_code, 200)
+        rs = self.client.get("/api/v1/search", params={"q": "HTTP Mixed", "sort": "starts_at"})
+        self.assertEqual(rs.status_code, 200)
+        titles = [m.group(1) for m in re.finditer(r'"title":"(HTTP Mixed \d)"', rs.text)]
+        expected: list[str] = ["HTTP Mixed 0", "HTTP Mixed 1", "HTTP Mixed 2"]
+        self.assertEqual(titles, expected)
+
     def test_http_search_and_health(self) -> None:
         rs = self.client.get("/api/v1/search")
         self.assertEqual(rs.status_code, 200)
+        self.assertIn('"next_cursor":', rs.text)
+        rc = self.client.get("/api/v1/search", params={"cursor": "bogus!"})
+        self.assertEqual(rc.status_code, 400)
         rh = self.client.get("/api/v1/health")
         self.assertEqual(rh.status_code, 200)
         self.assertIn('"ok":', rh.text)
+        rm = self.client.get("/api/v1/metrics")
+        self.assertEqual(rm.status_code, 200)
+        self.assertIn('"db_pool"', rm.text)
 
     def test_http_errors_and_auth_guard(self) -> None:
         # Not found event
@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import datetime as dt
+import os
+import re
+import unittest
+
+from fastapi.testclient import TestClient
+
+from ics_connect.cache import configure_event_cache, event_cache
+from ics_connect.http_cache import configure_http_cache
+from ics_connect.main import create_app
+from ics_connect.settings import Settings
+from ics_connect.util.etag import etag_matches, strong_etag, weak_etag
+from ics_connect.util.ids import new_uuid
+
+_ENV = {
+    "ICS_CACHE_CONTROL_SEARCH": "public, max-age=5",
+    "ICS_CACHE_CONTROL_EVENT": None,
+    # No time-based rollover or expiry in the middle of a test
+    "ICS_SEARCH_ETAG_WINDOW_SECONDS": "0",
+    "ICS_EVENT_CACHE_MAX_STALENESS_SECONDS": "3600",
+}
+
+
+def _event_body(title: str) -> dict[str, object]:
+    now = dt.datetime.now(dt.UTC)
+    return {
+        "title": title,
+        "description": None,
+        "type": "meetup",
+        "starts_at": (now + dt.timedelta(hours=1)).isoformat(),
+        "ends_at": (now + dt.timedelta(hours=2)).isoformat(),
+        "location_text": None,
+        "discord_link": None,
+        "website_link": None,
+        "capacity": 5,
+        "public": True,
+        "requires_join_code": False,
+        "tags": [],
+    }
+
+
+def _field(name: str, text: str) -> str:
+    m = re.search(rf'"{name}":"([^"]+)"', text)
+    return m.group(1) if m else ""
+
+
+class TestEtagMatching(unittest.TestCase):
+    def test_if_none_match_forms(self) -> None:
+        etag = strong_etag("event", "e1", 0, 0)
+        self.assertTrue(etag.startswith('"') and etag.endswith('"'))
+        self.assertNotEqual(etag, strong_etag("event", "e1", 1, 0))
+        self.assertTrue(etag_matches(etag, etag))
+        self.assertTrue(etag_matches(f'"other", W/{etag}', etag))
+        self.assertTrue(etag_matches("*", etag))
+        self.assertFalse(etag_matches(None, etag))
+        self.assertFalse(etag_matches('"other"', etag))
+        weak = weak_etag("search", 0)
+        self.assertTrue(weak.startswith('W/"'))
+        self.assertTrue(etag_matches(weak, weak))
+        self.assertTrue(etag_matches(weak.removeprefix("W/"), weak))
+        self.assertFalse(etag_matches(etag, weak))
+
+
+class TestConditionalGets(unittest.TestCase):
+    def setUp(self) -> None:
+        self._saved = {k: os.environ.get(k) for k in _ENV}
+        for key, value in _ENV.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+        self.client = TestClient(create_app())
+
+    def tearDown(self) -> None:
+        for key, value in self._saved.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+        configure_event_cache(Settings.from_env())
+        configure_http_cache(Settings.from_env())
+
+    def _reserve(self, event_id: str) -> None:
+        login_body: dict[str, object] = {"email": "etag@uci.edu", "display_name": "E"}
+        token = _field("token", self.client.post("/api/v1/auth/login", json=login_body).text)
+        reserve_body: dict[str, object] = {"join_code": None}
+        reserved = self.client.post(
+            f"/api/v1/events/{event_id}/reserve",
+            json=reserve_body,
+            headers={"Authorization": f"Bearer {token}"},
+        )
+        self.assertEqual(reserved.status_code, 200)
+
+    def test_event_revalidates_until_it_changes(self) -> None:
+        created = self.client.post("/api/v1/events", json=_event_body("Etag event"))
+        url = f"/api/v1/events/{_field('id', created.text)}"
+        first = self.client.get(url)
+        self.assertEqual(first.status_code, 200)
+        etag = first.headers["etag"]
+        self.assertEqual(first.headers["cache-control"], "no-cache")
+
+        misses = event_cache().stats()["misses"]
+        again = self.client.get(url, headers={"If-None-Match": etag})
+        self.assertEqual(again.status_code, 304)
+        self.assertEqual(again.content, b"")
+        self.assertEqual(again.headers["etag"], etag)
+        # Answered from the event cache: no load, no count query
+        self.assertEqual(event_cache().stats()["misses"], misses)
+
+        self._reserve(_field("id", created.text))
+        changed = self.client.get(url, headers={"If-None-Match": etag})
+        self.assertEqual(changed.status_code, 200)
+        self.assertNotEqual(changed.headers["etag"], etag)
+        self.assertIn('"confirmed_count":1', changed.text)
+
+    def test_search_revalidates_until_a_write(self) -> None:
+        # The in-memory store is shared by the process: search for a fresh word
+        params = {"q": new_uuid()[:8]}
+        first = self.client.get("/api/v1/search", params=params)
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(first.headers["cache-control"], "public, max-age=5")
+        self.assertTrue(first.headers["etag"].startswith('W/"'))
+        headers = {"If-None-Match": first.headers["etag"]}
+        again = self.client.get("/api/v1/search", params=params, headers=headers)
+        self.assertEqual(again.status_code, 304)
+        # A different query is a different resource
+        other = self.client.get("/api/v1/search", params={"q": "other"}, headers=headers)
+        self.assertEqual(other.status_code, 200)
+
+        self.client.post("/api/v1/events", json=_event_body(f"Etag {params['q']}"))
+        changed = self.client.get("/api/v1/search", params=params, headers=headers)
+        self.assertEqual(changed.status_code, 200)
+        self.assertIn('"total":1', changed.text)
+
+    def test_invalid_search_is_rejected_before_revalidation(self) -> None:
+        bad = self.client.get(
+            "/api/v1/search", params={"cursor": "bogus!"}, headers={"If-None-Match": "*"}
+        )
+        self.assertEqual(bad.status_code, 400)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,239 @@
+from __future__ import annotations
+
+import datetime as dt
+import unittest
+from dataclasses import replace
+
+from ics_connect.db import Store
+from ics_connect.models import Event, Reservation, ReservationStatus
+from ics_connect.repositories.inmemory import InMemoryRepos
+from ics_connect.repositories.inmemory_index import EventIndex, SortKey, trigrams
+from ics_connect.repositories.protocols import EventQuery
+
+_BASE = dt.datetime(2031, 6, 1, tzinfo=dt.UTC)
+_WORDS = ["Board", "game", "Night", "resume", "WORKSHOP", "git", "jam", "café", "100%"]
+
+
+def _event(i: int) -> Event:
+    starts_at = _BASE + dt.timedelta(hours=i % 17)
+    return Event(
+        id=f"e{i:03d}",
+        title=" ".join(_WORDS[(i * k) % len(_WORDS)] for k in (1, 3)),
+        description=None if i % 4 == 0 else " ".join(_WORDS[(i + k) % len(_WORDS)] for k in (2, 5)),
+        type=None,
+        starts_at=starts_at,
+        ends_at=starts_at + dt.timedelta(hours=1),
+        location_text=None,
+        discord_link=None,
+        website_link=None,
+        tags_json="[]",
+        public=True,
+        requires_join_code=False,
+        join_code_hash=None,
+        admin_key_hash="x",
+        capacity=5,
+        waitlist_enabled=True,
+        created_at=_BASE,
+    )
+
+
+def _brute_force(events: list[Event], q: str, start: dt.datetime | None) -> list[SortKey]:
+    ql = q.lower()
+    return sorted(
+        (e.starts_at, e.id)
+        for e in events
+        if (start is None or e.starts_at >= start)
+        and (ql in e.title.lower() or ql in (e.description or "").lower())
+    )
+
+
+class TestEventIndex(unittest.TestCase):
+    def setUp(self) -> None:
+        self.events = [_event(i) for i in range(120)]
+        self.index = EventIndex()
+        for e in self.events:
+            self.index.add(e)
+
+    def test_trigrams(self) -> None:
+        expected = {"jam", "ams"}
+        self.assertEqual(trigrams("jams"), expected)
+        self.assertFalse(trigrams("ja"))
+
+    def test_matches_brute_force_substring_search(self) -> None:
+        needles = ["", "a", "ga", "game", "GAME NIGHT", "me ni", "café", "0%", "shop g", "xyz"]
+        for q in needles:
+            for start in (None, _BASE + dt.timedelta(hours=15)):
+                with self.subTest(q=q, start=start):
+                    expected = _brute_force(self.events, q, start)
+                    self.assertEqual(self.index.matching_keys(q, start, None), expected)
+
+    def test_readd_and_remove_keep_postings_exact(self) -> None:
+        renamed = replace(self.events[5], title="Zebra Parade", starts_at=_BASE)
+        self.index.add(renamed)
+        self.assertEqual(len(self.index), 120)
+        expected: list[SortKey] = [(_BASE, renamed.id)]
+        self.assertEqual(self.index.matching_keys("zebra", None, None), expected)
+        self.index.remove(renamed.id)
+        self.index.remove("missing")
+        self.assertFalse(self.index.matching_keys("zebra", None, None))
+        self.assertEqual(self.index.count_range(None, None), 119)
+
+    def test_range_paging_off_sorted_keys(self) -> None:
+        ordered = sorted((e.starts_at, e.id) for e in self.events)
+        page = self.index.keys_after(ordered[9], None, None, offset=0, limit=5)
+        self.assertEqual(page, ordered[10:15])
+        to = _BASE + dt.timedelta(hours=2)
+        in_range = [k for k in ordered if k[0] <= to]
+        self.assertEqual(self.index.count_range(None, to), len(in_range))
+        self.assertEqual(self.index.keys_after(None, None, to, offset=3, limit=100), in_range[3:])
+
+
+class TestInMemorySearchUsesIndex(unittest.TestCase):
+    def test_repo_search_pages_match_index(self) -> None:
+        store = Store()
+        repos = InMemoryRepos(store)
+        for i in range(60):
+            repos.events.create(_event(i))
+        query = EventQuery(q="game", limit=7)
+        seen: list[str] = []
+        while True:
+            page = repos.events.search(query)
+            seen.extend(e.id for e in page.events)
+            if page.next_after is None:
+                break
+            query = replace(query, after=page.next_after)
+        expected: list[str] = [
+            event_id for _, event_id in store.event_index.matching_keys("game", None, None)
+        ]
+        self.assertEqual(seen, expected)
+        ranked = repos.events.search(EventQuery(q="resume", order="relevance", limit=60))
+        hits = ["resume" in e.title.lower() for e in ranked.events]
+        expected_hits: list[bool] = sorted(hits, reverse=True)
+        self.assertEqual(hits, expected_hits)
+
+    def test_rejected_event_leaves_store_and_index_unchanged(self) -> None:
+        store = Store()
+        repos = InMemoryRepos(store)
+        repos.events.create(_event(1))
+        naive = replace(_event(2), starts_at=_BASE.replace(tzinfo=None))
+        # Only EventService normalizes times; the index cannot order this one
+        with self.assertRaises(TypeError):
+            repos.events.create(naive)
+        self.assertIsNone(repos.events.get(naive.id))
+        self.assertEqual(len(store.event_index), 1)
+        ids = [event_id for _, event_id in store.event_index.matching_keys(None, None, None)]
+        expected: list[str] = ["e001"]
+        self.assertEqual(ids, expected)
+
+
+def _reservation(
+    rid: str, event_id: str, status: str, *, user_id: str | None = None, email: str | None = None
+) -> Reservation:
+    return Reservation(
+        id=rid,
+        event_id=event_id,
+        user_id=user_id,
+        display_name=rid,
+        email=email,
+        status=status,
+        promoted_at=None,
+        created_at=_BASE,
+    )
+
+
+class TestReservationIndex(unittest.TestCase):
+    def setUp(self) -> None:
+        self.store = Store()
+        self.repos = InMemoryRepos(self.store)
+        res = self.repos.reservations
+        res.create(_reservation("c1", "e1", ReservationStatus.CONFIRMED, user_id="u1"))
+        # Equal created_at: waitlist order falls back to creation order
+        res.create(_reservation("w1", "e1", ReservationStatus.WAITLISTED, email=" Ann@X.edu "))
+        res.create(_reservation("w2", "e1", ReservationStatus.WAITLISTED, email="ann@x.edu"))
+        res.create(_reservation("w3", "e2", ReservationStatus.WAITLISTED, user_id="u1"))
+
+    def _set_status(self, rid: str, status: str) -> None:
+        r = self.repos.reservations.get(rid)
+        if r is None:
+            self.fail(f"missing reservation {rid}")
+        r.status = status
+        self.repos.reservations.update(r)
+
+    def test_counts_are_per_event(self) -> None:
+        res = self.repos.reservations
+        self.assertEqual((res.count_confirmed("e1"), res.count_waitlisted("e1")), (1, 2))
+        self.assertEqual((res.count_confirmed("e2"), res.count_waitlisted("e2")), (0, 1))
+        self.assertEqual(res.count_waitlisted("missing"), 0)
+
+    def test_lookups_follow_updates(self) -> None:
+        res = self.repos.reservations
+        oldest = res.find_oldest_waitlisted("e1")
+        self.assertEqual(oldest.id if oldest else None, "w1")
+        by_email = res.find_active_by_event_and_email("e1", "ANN@x.edu")
+        self.assertEqual(by_email.id if by_email else None, "w1")
+        by_user = res.find_active_by_event_and_user("e2", "u1")
+        self.assertEqual(by_user.id if by_user else None, "w3")
+
+        # Promote w1, cancel c1: every index moves with the status change
+        self._set_status("w1", ReservationStatus.CONFIRMED)
+        self._set_status("c1", ReservationStatus.CANCELED)
+        oldest = res.find_oldest_waitlisted("e1")
+        self.assertEqual(oldest.id if oldest else None, "w2")
+        self.assertIsNone(res.find_active_by_event_and_user("e1", "u1"))
+        self.assertEqual((res.count_confirmed("e1"), res.count_waitlisted("e1")), (1, 1))
+
+        self._set_status("w2", ReservationStatus.CANCELED)
+        self.assertIsNone(res.find_oldest_waitlisted("e1"))
+        by_email = res.find_active_by_event_and_email("e1", "ann@x.edu")
+        self.assertEqual(by_email.id if by_email else None, "w1")
+
+    def test_waitlist_positions_are_pruned_and_kept_across_updates(self) -> None:
+        res = self.repos.reservations
+        # An in-place update of a waitlisted reservation keeps its place in the queue
+        w1 = res.get("w1")
+        if w1 is None:
+            self.fail("missing reservation w1")
+        w1.display_name = "Renamed"
+        res.update(w1)
+        oldest = res.find_oldest_waitlisted("e1")
+        self.assertEqual(oldest.id if oldest else None, "w1")
+        self._set_status("w1", ReservationStatus.CONFIRMED)
+        self._set_status("w2", ReservationStatus.CANCELED)
+        # Only reservations still on a waitlist hold a position
+        queued: list[str] = list(self.store.reservation_index._seq)
+        expected: list[str] = ["w3"]
+        self.assertEqual(queued, expected)
+        res.create(_reservation("w4", "e1", ReservationStatus.WAITLISTED))
+        res.create(_reservation("w5", "e1", ReservationStatus.WAITLISTED))
+        oldest = res.find_oldest_waitlisted("e1")
+        self.assertEqual(oldest.id if oldest else None, "w4")
+
+    def test_duplicate_keys_keep_insertion_order(self) -> None:
+        res = self.repos.reservations
+        for rid in ("d1", "d2", "d3"):
+            res.create(_reservation(rid, "e3", ReservationStatus.CONFIRMED, user_id="dup"))
+        self._set_status("d2", ReservationStatus.CANCELED)
+        first = res.find_active_by_event_and_user("e3", "dup")
+        self.assertEqual(first.id if first else None, "d1")
+        self._set_status("d1", ReservationStatus.CANCELED)
+        first = res.find_active_by_event_and_user("e3", "dup")
+        self.assertEqual(first.id if first else None, "d3")
+        self._set_status("d3", ReservationStatus.CANCELED)
+        self.assertIsNone(res.find_active_by_event_and_user("e3", "dup"))
+
+    def test_repeated_values_share_one_string(self) -> None:
+        a = _reservation("i1", "".join(["e", "9"]), "".join(["confirm", "ed"]))
+        b = _reservation("i2", "".join(["e", "9"]), "".join(["confirm", "ed"]))
+        self.assertIs(a.event_id, b.event_id)
+        self.assertIs(a.status, ReservationStatus.CONFIRMED)
+        self.assertFalse(hasattr(a, "__dict__"))
+
+    def test_waitlist_orders_by_created_at(self) -> None:
+        res = self.repos.reservations
+        early = replace(
+            _reservation("w0", "e1", ReservationStatus.WAITLISTED),
+            created_at=_BASE - dt.timedelta(minutes=1),
+        )
+        res.create(early)
+        oldest = res.find_oldest_waitlisted("e1")
+        self.assertEqual(oldest.id if oldest else None, "w0")
@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+import contextlib
+import io
+import tempfile
+import unittest
+from pathlib import Path
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+
+from ics_connect.cli import main as cli_main
+from ics_connect.migrations import current_version, latest_version, migrate
+from ics_connect.migrations.ops import has_table
+from ics_connect.migrations.versions import m0001_initial
+from ics_connect.repositories.protocols import EventQuery
+from ics_connect.repositories.sql import SQLRepos
+
+
+class TestMigrations(unittest.TestCase):
+    def test_fresh_database_reaches_latest_and_is_idempotent(self) -> None:
+        engine = create_engine("sqlite://")
+        self.assertEqual(current_version(engine), 0)
+        applied = migrate(engine)
+        self.assertEqual(applied[-1], latest_version())
+        self.assertEqual(current_version(engine), latest_version())
+        self.assertFalse(migrate(engine))
+        with engine.connect() as conn:
+            for table in ("events", "reservations", "schema_version"):
+                self.assertTrue(has_table(conn, table))
+
+    def test_target_stops_early(self) -> None:
+        engine = create_engine("sqlite://")
+        expected: list[int] = [1]
+        self.assertEqual(migrate(engine, target=1), expected)
+        self.assertEqual(current_version(engine), 1)
+
+    def test_adopts_database_created_without_migrations(self) -> None:
+        engine = create_engine("sqlite://")
+        # Simulate a database bootstrapped by the old create_all path
+        with engine.begin() as conn:
+            m0001_initial.upgrade(conn)
+            conn.execute(
+                text(
+                    "INSERT INTO events (id, title, starts_at, ends_at, tags_json, public, "
+                    "requires_join_code, admin_key_hash, capacity, waitlist_enabled, "
+                    "created_at) VALUES ('e1', 'Old', '2025-01-01 10:00:00', "
+                    "'2025-01-01 11:00:00', '[]', 1, 0, 'h', 5, 1, '2025-01-01 09:00:00')"
+                )
+            )
+        migrate(engine)
+        self.assertEqual(current_version(engine), latest_version())
+        with Session(engine) as session:
+            repos = SQLRepos(session)
+            self.assertIsNotNone(repos.events.get("e1"))
+            # Pre-existing events are backfilled into the full-text index
+            self.assertEqual(repos.events.search(EventQuery(q="old")).total, 1)
+
+    def test_counters_backfilled_and_repair_command(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            url = f"sqlite:///{Path(tmp) / 'counters.db'}"
+            engine = create_engine(url)
+            migrate(engine, target=2)
+            with engine.begin() as conn:
+                conn.execute(
+                    text(
+                        "INSERT INTO events (id, title, starts_at, ends_at, tags_json, "
+                        "public, requires_join_code, admin_key_hash, capacity, "
+                        "waitlist_enabled, created_at) VALUES ('e1', 'Old', "
+                        "'2025-01-01 10:00:00', '2025-01-01 11:00:00', '[]', 1, 0, 'h', 1, "
+                        "1, '2025-01-01 09:00:00')"
+                    )
+                )
+                conn.execute(
+                    text(
+                        "INSERT INTO reservations (id, event_id, display_name, status, "
+                        "created_at) VALUES ('r1', 'e1', 'N', 'confirmed', '2025-01-01'), "
+                        "('r2', 'e1', 'N', 'waitlisted', '2025-01-01'), "
+                        "('r3', 'e1', 'N', 'canceled', '2025-01-01')"
+                    )
+                )
+            migrate(engine)
+            with Session(engine) as session:
+                occ = SQLRepos(session).reservations.occupancy("e1")
+                self.assertEqual((occ.confirmed, occ.waitlisted), (1, 1))
+            with engine.begin() as conn:
+                conn.execute(text("UPDATE events SET confirmed_count = 9"))
+            engine.dispose()
+            out = io.StringIO()
+            with contextlib.redirect_stdout(out):
+                rc = cli_main(["--database-url", url, "repair-counters"])
+            self.assertEqual(rc, 0)
+            self.assertIn("repaired=1", out.getvalue())
+
+    def test_normalized_emails_backfilled_and_old_duplicates_unkeyed(self) -> None:
+        engine = create_engine("sqlite://")
+        migrate(engine, target=5)
+        with engine.begin() as conn:
+            conn.execute(
+                text(
+                    "INSERT INTO reservations (id, event_id, user_id, display_name, email, "
+                    "status, created_at) VALUES "
+                    "('r1', 'e1', NULL, 'N', ' Dup@UCI.edu', 'confirmed', '2025-01-01 09:00'), "
+                    "('r2', 'e1', NULL, 'N', 'dup@uci.edu', 'waitlisted', '2025-01-01 10:00'), "
+                    "('r3', 'e1', 'u1', 'N', 'dup@uci.edu', 'confirmed', '2025-01-01 11:00'), "
+                    "('r4', 'e2', NULL, 'N', 'dup@uci.edu', 'confirmed', '2025-01-01 12:00')"
+                )
+            )
+        migrate(engine)
+        with Session(engine) as session:
+            res = SQLRepos(session).reservations
+            # The oldest anonymous duplicate keeps the key; other events are separate
+            first = res.find_active_by_event_and_email("e1", "dup@uci.edu")
+            other = res.find_active_by_event_and_email("e2", "DUP@uci.edu")
+            self.assertEqual(first.id if first else None, "r1")
+            self.assertEqual(other.id if other else None, "r4")
+
+    def test_cli_migrate_and_schema_version(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            url = f"sqlite:///{Path(tmp) / 'cli.db'}"
+            out = io.StringIO()
+            with contextlib.redirect_stdout(out):
+                rc1 = cli_main(["--database-url", url, "migrate"])
+                rc2 = cli_main(["--database-url", url, "schema-version"])
+            self.assertEqual(rc1, 0)
+            self.assertEqual(rc2, 0)
+            self.assertIn(f"version={latest_version()} latest={latest_version()}", out.getvalue())
+            with self.assertRaises(SystemExit):
+                cli_main(["--database-url", url, "bogus"])
+
+    def test_cli_reindex_search(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            url = f"sqlite:///{Path(tmp) / 'fts.db'}"
+            engine = create_engine(url)
+            migrate(engine)
+            with engine.begin() as conn:
+                # Written behind the repository's back, so not yet indexed
+                conn.execute(
+                    text(
+                        "INSERT INTO events (id, title, starts_at, ends_at, tags_json, "
+                        "public, requires_join_code, admin_key_hash, capacity, "
+                        "waitlist_enabled, created_at) VALUES ('e1', 'Imported Mixer', "
+                        "'2025-01-01 10:00:00', '2025-01-01 11:00:00', '[]', 1, 0, 'h', 1, "
+                        "1, '2025-01-01 09:00:00')"
+                    )
+                )
+            with Session(engine) as session:
+                self.assertEqual(SQLRepos(session).events.search(EventQuery(q="mixer")).total, 0)
+            engine.dispose()
+            out = io.StringIO()
+            with contextlib.redirect_stdout(out):
+                rc = cli_main(["--database-url", url, "reindex-search"])
+            self.assertEqual(rc, 0)
+            self.assertIn("indexed=1", out.getvalue())
+            with Session(engine) as session:
+                self.assertEqual(SQLRepos(session).events.search(EventQuery(q="mixer")).total, 1)
+            engine.dispose()
@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import datetime as dt
+import os
+import re
+import sqlite3
+import tempfile
+import unittest
+from dataclasses import replace
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+
+from ics_connect.cache import configure_event_cache
+from ics_connect.db import Database, dispose_database
+from ics_connect.di import provide_read_repos, provide_repos
+from ics_connect.main import create_app
+from ics_connect.migrations import migrate
+from ics_connect.models import Event
+from ics_connect.settings import Settings
+from ics_connect.util.ids import new_uuid
+
+_ENV = ("DATABASE_URL", "DATABASE_READ_URL", "ICS_DB_READ_AFTER_WRITE_SECONDS")
+
+
+def _event_body() -> dict[str, object]:
+    now = dt.datetime.now(dt.UTC)
+    return {
+        "title": "Replica",
+        "description": None,
+        "type": "meetup",
+        "starts_at": (now + dt.timedelta(hours=1)).isoformat(),
+        "ends_at": (now + dt.timedelta(hours=2)).isoformat(),
+        "location_text": None,
+        "discord_link": None,
+        "website_link": None,
+        "capacity": 5,
+        "public": True,
+        "requires_join_code": False,
+        "tags": [],
+    }
+
+
+def _event() -> Event:
+    now = dt.datetime.now(dt.UTC)
+    return Event(
+        id=new_uuid(),
+        title="Replica",
+        description=None,
+        type=None,
+        starts_at=now + dt.timedelta(days=1),
+        ends_at=now + dt.timedelta(days=1, hours=1),
+        location_text=None,
+        tags_json="[]",
+        public=True,
+        requires_join_code=False,
+        join_code_hash=None,
+        admin_key_hash="x",
+        capacity=5,
+        waitlist_enabled=True,
+        discord_link=None,
+        website_link=None,
+    )
+
+
+def _field(name: str, text: str) -> str:
+    m = re.search(rf'"{name}":"([^"]+)"', text)
+    return m.group(1) if m else ""
+
+
+class TestReadReplicaRouting(unittest.TestCase):
+    """Primary and replica are two SQLite files; "replication" is an explicit copy."""
+
+    def setUp(self) -> None:
+        self._saved = {k: os.environ.get(k) for k in _ENV}
+        self._tmp = tempfile.TemporaryDirectory()
+        self.primary = Path(self._tmp.name) / "primary.db"
+        self.replica = Path(self._tmp.name) / "replica.db"
+        for path in (self.primary, self.replica):
+            db = Database(f"sqlite:///{path}", Settings.from_env())
+            migrate(db.engine)
+            db.dispose()
+        os.environ["DATABASE_URL"] = f"sqlite:///{self.primary}"
+        os.environ["DATABASE_READ_URL"] = f"sqlite:///{self.replica}"
+        # Route every read by intent; the read-after-write window has its own test
+        os.environ["ICS_DB_READ_AFTER_WRITE_SECONDS"] = "0"
+
+    def tearDown(self) -> None:
+        dispose_database()
+        for key, value in self._saved.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+        self._tmp.cleanup()
+
+    def _replicate(self) -> None:
+        src = sqlite3.connect(self.primary)
+        dst = sqlite3.connect(self.replica)
+        try:
+            src.backup(dst)
+        finally:
+            src.close()
+            dst.close()
+
+    def test_gets_read_the_replica_and_mine_reads_the_primary(self) -> None:
+        with TestClient(create_app()) as client:
+            created = client.post("/api/v1/events", json=_event_body())
+            self.assertEqual(created.status_code, 200)
+            event_id = _field("id", created.text)
+
+            # Not replicated yet: safe GETs go to the (lagging) replica
+            self.assertEqual(client.get(f"/api/v1/events/{event_id}").status_code, 400)
+            self.assertIn('"total":0', client.get("/api/v1/search").text)
+
+            login_body: dict[str, object] = {"email": "rep@uci.edu", "display_name": "Rep"}
+            login = client.post("/api/v1/auth/login", json=login_body)
+            auth = {"Authorization": f"Bearer {_field('token', login.text)}"}
+            reserve_body: dict[str, object] = {"join_code": None}
+            reserved = client.post(
+                f"/api/v1/events/{event_id}/reserve", json=reserve_body, headers=auth
+            )
+            self.assertEqual(reserved.status_code, 200)
+            # Read-your-writes: /mine sees the reservation the replica does not have
+            mine = client.get(f"/api/v1/events/{event_id}/mine", headers=auth)
+            self.assertEqual(mine.status_code, 200)
+            self.assertEqual(_field("status", mine.text), "confirmed")
+
+            self._replicate()
+            fetched = client.get(f"/api/v1/events/{event_id}")
+            self.assertEqual(fetched.status_code, 200)
+            self.assertIn('"confirmed_count":1', fetched.text)
+            self.assertIn('"total":1', client.get("/api/v1/search").text)
+
+    def test_reads_stay_on_the_primary_right_after_a_write(self) -> None:
+        os.environ["ICS_DB_READ_AFTER_WRITE_SECONDS"] = "60"
+        with TestClient(create_app()) as client:
+            created = client.post("/api/v1/events", json=_event_body())
+            event_id = _field("id", created.text)
+            # Not replicated, yet this process reads (and caches) its own write
+            self.assertEqual(client.get(f"/api/v1/events/{event_id}").status_code, 200)
+            self.assertIn('"total":1', client.get("/api/v1/search").text)
+
+            # Once no recent write is on record, reads go back to the replica
+            configure_event_cache(Settings.from_env())
+            self.assertEqual(client.get(f"/api/v1/events/{event_id}").status_code, 400)
+            self.assertIn('"total":0', client.get("/api/v1/search").text)
+
+    def test_sync_providers_route_by_intent(self) -> None:
+        event = _event()
+        for repos in provide_repos():
+            with repos.transaction():
+                repos.events.create(event)
+        for repos in provide_read_repos():
+            self.assertIsNone(repos.events.get(event.id))
+        self._replicate()
+        for repos in provide_read_repos():
+            self.assertIsNotNone(repos.events.get(event.id))
+
+    def test_without_read_url_reads_use_the_primary(self) -> None:
+        del os.environ["DATABASE_READ_URL"]
+        # The SQLite production profile would give reads a pool of their own
+        settings = replace(Settings.from_env(), sqlite_profile="default")
+        db = Database(f"sqlite:///{self.primary}", settings)
+        try:
+            self.assertIsNone(db.read_url)
+            self.assertIs(db.read_engine, db.engine)
+        finally:
+            db.dispose()
+
+
+if __name__ == "__main__":
+    unittest.main()
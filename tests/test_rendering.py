@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import datetime as dt
+import json
+import unittest
+from dataclasses import replace
+
+from pydantic import TypeAdapter
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+
+from ics_connect.migrations import migrate
+from ics_connect.models import Event, EventListing, Occupancy, event_listing
+from ics_connect.rendering import event_fragment, event_json, listing_public, search_json
+from ics_connect.repositories.protocols import EventQuery
+from ics_connect.repositories.sql import SQLRepos
+from ics_connect.services.events import CreateEventInput, EventService
+from ics_connect.types import EventPublic, SearchResult
+
+_EVENT_JSON: TypeAdapter[EventPublic] = TypeAdapter(EventPublic)
+_SEARCH_JSON: TypeAdapter[SearchResult] = TypeAdapter(SearchResult)
+_START = dt.datetime(2030, 1, 1, 18, tzinfo=dt.UTC)
+
+
+def _event(event_id: str, title: str) -> Event:
+    ev = Event(
+        id=event_id,
+        title=title,
+        description='Say "hi" \\ bring snacks\n',
+        type="social",
+        starts_at=_START,
+        ends_at=_START + dt.timedelta(hours=2),
+        location_text="ICS 174 — main room",
+        tags_json="[]",
+        public=True,
+        requires_join_code=True,
+        join_code_hash="h",
+        admin_key_hash="x",
+        capacity=40,
+        waitlist_enabled=True,
+        discord_link=None,
+        website_link="https://example.edu/e?a=1&b=2",
+    )
+    ev.public_json = event_fragment(ev)
+    return ev
+
+
+def _row(ev: Event, confirmed: int, waitlisted: int) -> EventListing:
+    return event_listing(ev, Occupancy(confirmed=confirmed, waitlisted=waitlisted))
+
+
+class TestSplicedJson(unittest.TestCase):
+    def test_event_matches_the_encoder_byte_for_byte(self) -> None:
+        row = _row(_event("e1", "Café night ☕"), 12, 3)
+        self.assertFalse(row.public_json is None or "confirmed_count" in row.public_json)
+        self.assertEqual(event_json(row), _EVENT_JSON.dump_json(listing_public(row)))
+        # Rows stored before fragments existed render the same bytes
+        self.assertEqual(event_json(row._replace(public_json=None)), event_json(row))
+
+    def test_search_page_matches_the_encoder_byte_for_byte(self) -> None:
+        rows = [_row(_event(f"e{i}", f"Event {i}"), i, 0) for i in range(3)]
+        for cursor in (None, "MjAzMC0wMS0wMQ"):
+            result: SearchResult = {
+                "events": [listing_public(row) for row in rows],
+                "total": 7,
+                "next_cursor": cursor,
+            }
+            self.assertEqual(search_json(rows, 7, cursor), _SEARCH_JSON.dump_json(result))
+        empty: SearchResult = {"events": [], "total": 0, "next_cursor": None}
+        self.assertEqual(search_json([], 0, None), _SEARCH_JSON.dump_json(empty))
+
+
+class TestStoredFragment(unittest.TestCase):
+    def setUp(self) -> None:
+        self.engine = create_engine("sqlite://")
+        migrate(self.engine)
+        self.session = Session(self.engine)
+        self.repos = SQLRepos(self.session)
+
+    def tearDown(self) -> None:
+        self.session.close()
+        self.engine.dispose()
+
+    def test_created_events_store_their_fragment(self) -> None:
+        created = EventService(self.repos).create(
+            CreateEventInput(
+                title="Stored",
+                starts_at=_START,
+                ends_at=_START + dt.timedelta(hours=1),
+                description=None,
+                type=None,
+                location_text=None,
+                discord_link=None,
+                website_link=None,
+                public=True,
+                requires_join_code=False,
+                capacity=5,
+            )
+        ).event
+        self.assertEqual(created.public_json, event_fragment(replace(created, public_json="")))
+        row = self.repos.events.get_listing(created.id)
+        self.assertIsNotNone(row)
+        if row is not None:
+            self.assertEqual(row.public_json, created.public_json)
+            decoded: dict[str, object] = json.loads(event_json(row))
+            self.assertEqual(decoded["title"], "Stored")
+        listed = self.repos.events.search_listings(EventQuery(q="stored")).listings
+        fragments: list[str | None] = [r.public_json for r in listed]
+        expected: list[str | None] = [created.public_json]
+        self.assertEqual(fragments, expected)
+        fetched = self.repos.events.get(created.id)
+        self.assertEqual(fetched.public_json if fetched else "", created.public_json)
+
+    def test_rows_without_a_fragment_still_render(self) -> None:
+        ev = _event("old", "Old")
+        with self.repos.transaction():
+            self.repos.events.create(ev)
+        stored = self.repos.events.get_listing("old")
+        self.session.execute(text("UPDATE events SET public_json = NULL"))
+        row = self.repos.events.get_listing("old")
+        self.assertIsNotNone(row)
+        if row is not None and stored is not None:
+            self.assertIsNone(row.public_json)
+            # Rendered from the stored columns, as every read did before fragments
+            self.assertEqual(event_json(row), _EVENT_JSON.dump_json(listing_public(row)))
+            # SQLite hands the times back naive; they still render as UTC, like the fragment
+            self.assertEqual(event_json(row), event_json(stored))
+            self.assertIn('"starts_at":"2030-01-01T18:00:00Z"', event_json(row).decode())
+
+
+if __name__ == "__main__":
+    unittest.main()
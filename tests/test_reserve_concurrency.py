@@ -0,0 +1,248 @@
+from __future__ import annotations
+
+import datetime as dt
+import tempfile
+import unittest
+from collections import Counter
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
+from functools import partial
+from pathlib import Path
+
+from sqlalchemy.exc import IntegrityError
+
+from ics_connect.db import Database, Store
+from ics_connect.errors import AppError
+from ics_connect.migrations import migrate
+from ics_connect.models import Event, Reservation, ReservationStatus
+from ics_connect.repositories.inmemory import InMemoryRepos
+from ics_connect.repositories.protocols import CancelOutcome, Repos
+from ics_connect.repositories.sql import SQLRepos, is_unique_violation
+from ics_connect.services.reservations import ReservationService, ReserveInput
+from ics_connect.settings import Settings
+from ics_connect.util.ids import new_uuid
+
+_CAPACITY = 25
+_ATTEMPTS = 300
+_THREADS = 12
+
+
+def _event(capacity: int, *, waitlist: bool) -> Event:
+    now = dt.datetime.now(dt.UTC)
+    return Event(
+        id=new_uuid(),
+        title="Race",
+        description=None,
+        type=None,
+        starts_at=now + dt.timedelta(days=1),
+        ends_at=now + dt.timedelta(days=1, hours=1),
+        location_text=None,
+        tags_json="[]",
+        public=True,
+        requires_join_code=False,
+        join_code_hash=None,
+        admin_key_hash="x",
+        capacity=capacity,
+        waitlist_enabled=waitlist,
+        discord_link=None,
+        website_link=None,
+    )
+
+
+def _input(i: int) -> ReserveInput:
+    return ReserveInput(display_name=f"P{i}", email=None, join_code=None, user_id=f"user-{i}")
+
+
+Reserve = Callable[[Event, ReserveInput], Reservation]
+
+
+def _hammer(
+    reserve: Reserve,
+    event: Event,
+    attempts: int,
+    same_user: bool = False,
+    same_email: bool = False,
+) -> Counter[str]:
+    """Fire ``attempts`` reserves from a thread pool; tally outcomes by status/error."""
+
+    def one(i: int) -> str:
+        data = _input(i)
+        if same_user:
+            data = replace(data, user_id="same-user")
+        if same_email:
+            # Anonymous, one address spelled a few ways
+            email = ("same@uci.edu", "Same@UCI.edu", " same@uci.edu ")[i % 3]
+            data = replace(data, user_id=None, email=email)
+        try:
+            return reserve(event, data).id
+        except AppError as exc:
+            if exc.code != "EVENT_FULL":
+                raise
+            return "full"
+
+    with ThreadPoolExecutor(max_workers=_THREADS) as pool:
+        outcomes = list(pool.map(one, range(attempts)))
+    tally: Counter[str] = Counter()
+    for outcome in outcomes:
+        tally["full" if outcome == "full" else "placed"] += 1
+    tally["distinct"] = len(set(outcomes) - {"full"})
+    return tally
+
+
+class TestSQLReserveConcurrency(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        url = f"sqlite:///{Path(self._tmp.name) / 'race.db'}"
+        self.db = Database(url, Settings.from_env())
+        migrate(self.db.engine)
+
+    def tearDown(self) -> None:
+        self.db.dispose()
+        self._tmp.cleanup()
+
+    def _repos(self) -> Repos:
+        return SQLRepos(next(self.db.session()), self.db.search)
+
+    def _reserve(self, event: Event, data: ReserveInput) -> Reservation:
+        # One session per reserve, closed afterwards, like one per request
+        sessions = self.db.session()
+        try:
+            repos = SQLRepos(next(sessions), self.db.search)
+            return ReservationService(repos).reserve(event, data).reservation
+        finally:
+            sessions.close()
+
+    def _cancel(self, event_id: str, reservation_id: str) -> CancelOutcome | None:
+        sessions = self.db.session()
+        try:
+            repos = SQLRepos(next(sessions), self.db.search)
+            with repos.transaction():
+                return repos.reservations.cancel_and_promote(event_id, reservation_id)
+        finally:
+            sessions.close()
+
+    def _add(self, event: Event) -> None:
+        repos = self._repos()
+        with repos.transaction():
+            repos.events.create(event)
+
+    def test_no_overbooking_with_waitlist(self) -> None:
+        ev = _event(_CAPACITY, waitlist=True)
+        self._add(ev)
+        tally = _hammer(self._reserve, ev, _ATTEMPTS)
+        self.assertEqual(tally["placed"], _ATTEMPTS)
+        res = self._repos().reservations
+        self.assertEqual(res.count_confirmed(ev.id), _CAPACITY)
+        self.assertEqual(res.count_waitlisted(ev.id), _ATTEMPTS - _CAPACITY)
+        # Counters agree with the rows they summarize
+        self.assertEqual(res.recompute_occupancy(), 0)
+
+    def test_full_event_rejects_exactly_the_overflow(self) -> None:
+        ev = _event(_CAPACITY, waitlist=False)
+        self._add(ev)
+        tally = _hammer(self._reserve, ev, _ATTEMPTS)
+        self.assertEqual(tally["placed"], _CAPACITY)
+        self.assertEqual(tally["full"], _ATTEMPTS - _CAPACITY)
+        occ = self._repos().reservations.occupancy(ev.id)
+        self.assertEqual((occ.confirmed, occ.waitlisted), (_CAPACITY, 0))
+
+    def test_concurrent_duplicates_resolve_to_one_reservation(self) -> None:
+        ev = _event(_CAPACITY, waitlist=True)
+        self._add(ev)
+        tally = _hammer(self._reserve, ev, _THREADS * 4, same_user=True)
+        self.assertEqual(tally["distinct"], 1)
+        self.assertEqual(self._repos().reservations.count_confirmed(ev.id), 1)
+
+    def test_concurrent_anonymous_duplicates_resolve_to_one_reservation(self) -> None:
+        ev = _event(_CAPACITY, waitlist=True)
+        self._add(ev)
+        tally = _hammer(self._reserve, ev, _THREADS * 4, same_email=True)
+        self.assertEqual(tally["distinct"], 1)
+        res = self._repos().reservations
+        self.assertEqual(res.count_confirmed(ev.id), 1)
+        # The losers' seat claims were rolled back with their inserts
+        self.assertEqual(res.recompute_occupancy(), 0)
+
+    def test_concurrent_cancels_promote_distinct_reservations(self) -> None:
+        ev = _event(_CAPACITY, waitlist=True)
+        self._add(ev)
+        placed = [self._reserve(ev, _input(i)) for i in range(_CAPACITY * 2)]
+        confirmed = [r.id for r in placed if r.status == ReservationStatus.CONFIRMED]
+        with ThreadPoolExecutor(max_workers=_THREADS) as pool:
+            outcomes = list(pool.map(partial(self._cancel, ev.id), confirmed))
+        promoted: set[str] = set()
+        for outcome in outcomes:
+            if outcome is None or outcome.promoted_id is None:
+                self.fail("every freed seat promotes someone")
+            promoted.add(outcome.promoted_id)
+        self.assertEqual(len(promoted), _CAPACITY)
+        res = self._repos().reservations
+        self.assertEqual(res.count_confirmed(ev.id), _CAPACITY)
+        self.assertEqual(res.count_waitlisted(ev.id), 0)
+        self.assertEqual(res.recompute_occupancy(), 0)
+
+    def test_cancel_waitlisted_keeps_waitlist(self) -> None:
+        ev = _event(1, waitlist=True)
+        self._add(ev)
+        self._reserve(ev, _input(0))
+        waiting = [self._reserve(ev, _input(i)) for i in (1, 2)]
+        outcome = self._cancel(ev.id, waiting[0].id)
+        self.assertEqual(outcome, CancelOutcome(ReservationStatus.WAITLISTED))
+        self.assertEqual(self._cancel(ev.id, waiting[0].id), CancelOutcome("canceled"))
+        self.assertIsNone(self._cancel("other-event", waiting[1].id))
+        occ = self._repos().reservations.occupancy(ev.id)
+        self.assertEqual((occ.confirmed, occ.waitlisted), (1, 1))
+
+    def test_unique_violation_is_classified_by_error_code(self) -> None:
+        repos = self._repos()
+        ev = _event(_CAPACITY, waitlist=True)
+        repos.events.create(ev)
+        svc = ReservationService(repos)
+        data = ReserveInput(display_name="A", email=None, join_code=None, user_id="u")
+        placed = svc.reserve(ev, data).reservation
+        with self.assertRaises(IntegrityError) as caught:
+            repos.reservations.create(placed)
+        self.assertTrue(is_unique_violation(caught.exception))
+
+
+class TestInMemoryReserveConcurrency(unittest.TestCase):
+    def test_no_overbooking_and_single_duplicate(self) -> None:
+        repos = InMemoryRepos(Store())
+        full = _event(_CAPACITY, waitlist=False)
+        dup = _event(_CAPACITY, waitlist=True)
+        repos.events.create(full)
+        repos.events.create(dup)
+        svc = ReservationService(repos)
+
+        def shared(event: Event, data: ReserveInput) -> Reservation:
+            return svc.reserve(event, data).reservation
+
+        tally = _hammer(shared, full, _ATTEMPTS)
+        self.assertEqual(tally["placed"], _CAPACITY)
+        self.assertEqual(repos.reservations.count_confirmed(full.id), _CAPACITY)
+        self.assertEqual(_hammer(shared, dup, _THREADS * 4, same_user=True)["distinct"], 1)
+        self.assertEqual(_hammer(shared, dup, _THREADS * 4, same_email=True)["distinct"], 1)
+
+    def test_recompute_runs_alongside_reserves(self) -> None:
+        repos = InMemoryRepos(Store())
+        ev = _event(_CAPACITY, waitlist=True)
+        repos.events.create(ev)
+        svc = ReservationService(repos)
+
+        def reserve_or_recompute(i: int) -> int:
+            # Scans every reservation while others are being added
+            if i % 10 == 0:
+                return repos.reservations.recompute_occupancy()
+            svc.reserve(ev, _input(i))
+            return 0
+
+        with ThreadPoolExecutor(max_workers=_THREADS) as pool:
+            list(pool.map(reserve_or_recompute, range(_ATTEMPTS)))
+        self.assertEqual(repos.reservations.recompute_occupancy(), 0)
+        occ = repos.reservations.occupancy(ev.id)
+        self.assertEqual(occ.confirmed + occ.waitlisted, _ATTEMPTS - _ATTEMPTS // 10)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,224 @@
+from __future__ import annotations
+
+import contextlib
+import datetime as dt
+import io
+import tempfile
+import unittest
+from dataclasses import replace
+from pathlib import Path
+
+from pydantic import TypeAdapter
+
+from ics_connect.cli import main as cli_main
+from ics_connect.db import Database, Store
+from ics_connect.endpoints import SearchParams, search_json_ep
+from ics_connect.errors import AppError
+from ics_connect.migrations import migrate
+from ics_connect.models import Event, Reservation, ReservationStatus
+from ics_connect.repositories.inmemory import InMemoryRepos
+from ics_connect.repositories.protocols import EventQuery, Repos
+from ics_connect.repositories.sql import SQLRepos
+from ics_connect.services.retention import RetentionInput, RetentionService
+from ics_connect.settings import Settings
+from ics_connect.types import SearchResult
+from ics_connect.util.time import utcnow
+
+_NOW = dt.datetime(2040, 3, 1, 12, tzinfo=dt.UTC)
+_CUTOFF = _NOW - dt.timedelta(days=30)
+_PAST = 5
+_UPCOMING = 3
+_BATCH = 2
+
+_SEARCH_JSON: TypeAdapter[SearchResult] = TypeAdapter(SearchResult)
+
+
+def _search(params: SearchParams, repos: Repos) -> SearchResult:
+    # The /search body as served, decoded back into its typed shape
+    return _SEARCH_JSON.validate_json(search_json_ep(params, repos))
+
+
+def _event(i: int, starts_at: dt.datetime) -> Event:
+    return Event(
+        id=f"ret-{i:02d}",
+        title=f"Retro jam {i}",
+        description=None,
+        type=None,
+        starts_at=starts_at,
+        ends_at=starts_at + dt.timedelta(hours=2),
+        location_text=None,
+        tags_json="[]",
+        public=True,
+        requires_join_code=False,
+        join_code_hash=None,
+        admin_key_hash="x",
+        capacity=1,
+        waitlist_enabled=True,
+        discord_link=None,
+        website_link=None,
+        created_at=starts_at - dt.timedelta(days=7),
+    )
+
+
+def _reservation(rid: str, event: Event, status: str) -> Reservation:
+    return Reservation(
+        id=rid,
+        event_id=event.id,
+        user_id=rid,
+        display_name=rid,
+        email=None,
+        status=status,
+        promoted_at=None,
+        created_at=event.created_at,
+    )
+
+
+def _seed(repos: Repos) -> tuple[list[Event], list[Event]]:
+    """Ended events before the cutoff (two reservations each), upcoming ones after."""
+    past = [_event(i, _CUTOFF - dt.timedelta(days=10 - i)) for i in range(_PAST)]
+    upcoming = [_event(_PAST + i, _NOW + dt.timedelta(days=i + 1)) for i in range(_UPCOMING)]
+    with repos.transaction():
+        for ev in past + upcoming:
+            repos.events.create(ev)
+        for ev in past:
+            repos.reservations.create(_reservation(f"{ev.id}-a", ev, ReservationStatus.CONFIRMED))
+            repos.reservations.create(_reservation(f"{ev.id}-b", ev, ReservationStatus.WAITLISTED))
+        # An old canceled reservation on an upcoming event, and a fresh one
+        stale = _reservation("stale-cancel", upcoming[0], ReservationStatus.CANCELED)
+        repos.reservations.create(replace(stale, created_at=_CUTOFF - dt.timedelta(days=1)))
+        repos.reservations.create(
+            _reservation("fresh-cancel", upcoming[0], ReservationStatus.CANCELED)
+        )
+    return past, upcoming
+
+
+class _RetentionCases:
+    """Shared assertions; subclasses provide ``repos``."""
+
+    repos: Repos
+
+    def check_archive_moves_past_rows(self, test: unittest.TestCase) -> None:
+        repos = self.repos
+        past, upcoming = _seed(repos)
+        result = RetentionService(repos).archive(RetentionInput(cutoff=_CUTOFF, batch_size=_BATCH))
+        test.assertEqual((result.events, result.reservations), (_PAST, _PAST * 2 + 1))
+        # ceil(5 / 2) event batches, one canceled batch
+        test.assertEqual(result.batches, 4)
+        for ev in past:
+            test.assertIsNone(repos.events.get(ev.id))
+            test.assertIsNone(repos.reservations.get(f"{ev.id}-a"))
+        test.assertIsNone(repos.reservations.get("stale-cancel"))
+        test.assertIsNotNone(repos.reservations.get("fresh-cancel"))
+        live = repos.events.search(EventQuery(q="retro", limit=20))
+        live_ids: list[str] = [e.id for e in live.events]
+        upcoming_ids: list[str] = [e.id for e in upcoming]
+        test.assertEqual(live_ids, upcoming_ids)
+
+        # include_past: chronological over both, keyset pages add up to the whole
+        everything = [e.id for e in past + upcoming]
+        first = EventQuery(q="retro", limit=3, include_past=True, order="relevance")
+        seen: list[str] = []
+        query = first
+        while True:
+            page = repos.events.search_listings(query)
+            test.assertEqual(page.total, len(everything))
+            seen.extend(row.id for row in page.listings)
+            if page.next_after is None:
+                break
+            query = replace(first, after=page.next_after)
+        test.assertEqual(seen, everything)
+        offset_page = repos.events.search(replace(first, offset=4))
+        offset_ids: list[str] = [e.id for e in offset_page.events]
+        test.assertEqual(offset_ids, everything[4:7])
+        # Archived listings keep their final counters
+        archived = repos.events.search_listings(replace(first, limit=1)).listings[0]
+        test.assertEqual((archived.confirmed_count, archived.waitlist_count), (1, 1))
+
+        # Nothing left to do: one empty batch of each kind
+        again = RetentionService(repos).archive(RetentionInput(cutoff=_CUTOFF))
+        test.assertEqual((again.events, again.reservations, again.batches), (0, 0, 2))
+
+    def check_failed_batch_rolls_back(self, test: unittest.TestCase) -> None:
+        repos = self.repos
+        past, _upcoming = _seed(repos)
+        with contextlib.suppress(RuntimeError), repos.transaction():
+            repos.events.archive_ended(_CUTOFF, _BATCH)
+            raise RuntimeError("abort")
+        test.assertIsNotNone(repos.events.get(past[0].id))
+        occ = repos.reservations.occupancy(past[0].id)
+        test.assertEqual((occ.confirmed, occ.waitlisted), (1, 1))
+        page = repos.events.search(EventQuery(limit=20, include_past=True))
+        test.assertEqual(page.total, _PAST + _UPCOMING)
+
+
+class TestInMemoryRetention(unittest.TestCase, _RetentionCases):
+    def setUp(self) -> None:
+        self.repos = InMemoryRepos(Store())
+
+    def test_archive_moves_past_rows(self) -> None:
+        self.check_archive_moves_past_rows(self)
+
+    def test_failed_batch_rolls_back(self) -> None:
+        self.check_failed_batch_rolls_back(self)
+
+    def test_search_endpoint_include_past(self) -> None:
+        _seed(self.repos)
+        RetentionService(self.repos).archive(RetentionInput(cutoff=_CUTOFF))
+        params = SearchParams(q="retro", start=None, to=None, limit=20, offset=0)
+        live = _search(params, self.repos)
+        both = _search(replace(params, include_past=True), self.repos)
+        self.assertEqual((live["total"], both["total"]), (_UPCOMING, _PAST + _UPCOMING))
+        with self.assertRaises(AppError):
+            _search(replace(params, include_past=True, sort="relevance"), self.repos)
+
+
+class TestSQLRetention(unittest.TestCase, _RetentionCases):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.url = f"sqlite:///{Path(self._tmp.name) / 'retention.db'}"
+        self.db = Database(self.url, Settings.from_env())
+        migrate(self.db.engine)
+        self._sessions = self.db.session()
+        self.repos = SQLRepos(next(self._sessions), self.db.search)
+
+    def tearDown(self) -> None:
+        self._sessions.close()
+        self.db.dispose()
+        self._tmp.cleanup()
+
+    def test_archive_moves_past_rows(self) -> None:
+        self.check_archive_moves_past_rows(self)
+        # The full-text side index dropped the archived events too
+        fts = self.repos.events.search(EventQuery(q="jam", limit=20))
+        self.assertEqual(fts.total, _UPCOMING)
+
+    def test_failed_batch_rolls_back(self) -> None:
+        self.check_failed_batch_rolls_back(self)
+
+    def test_cli_archive(self) -> None:
+        # The command's cutoff is relative to the clock: events that ended days ago
+        ended = [_event(i, utcnow() - dt.timedelta(days=3 + i)) for i in range(_PAST)]
+        with self.repos.transaction():
+            for ev in ended:
+                self.repos.events.create(ev)
+        self._sessions.close()
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            # Two events per transaction: three event batches, one canceled batch
+            rc = cli_main(
+                ["--database-url", self.url, "archive", "--older-than-days", "1", "--batch", "2"]
+            )
+        self.assertEqual(rc, 0)
+        self.assertIn(f"events={_PAST} reservations=0 batches=4", out.getvalue())
+
+    def test_cli_archive_rejects_bad_numbers(self) -> None:
+        bad = (("--older-than-days", "soon"), ("--batch", "0"), ("--max-batches", "1.5"))
+        for option, value in bad:
+            with self.subTest(option=option), self.assertRaises(SystemExit) as caught:
+                cli_main(["--database-url", self.url, "archive", option, value])
+            self.assertIn(f"{option} expects a whole number", str(caught.exception.code))
+            self.assertIn("usage:", str(caught.exception.code))
+
+
+if __name__ == "__main__":
+    unittest.main()
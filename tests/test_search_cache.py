@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import datetime as dt
+import unittest
+from dataclasses import replace
+
+from pydantic import TypeAdapter
+
+from ics_connect.cache import (
+    SearchCache,
+    configure_event_cache,
+    configure_search_cache,
+    search_cache,
+)
+from ics_connect.db import Store
+from ics_connect.endpoints import (
+    SearchParams,
+    create_event_ep,
+    metrics_ep,
+    reserve_ep,
+    search_json_ep,
+)
+from ics_connect.repositories.inmemory import InMemoryRepos
+from ics_connect.repositories.protocols import ListingPage, Repos
+from ics_connect.settings import Settings
+from ics_connect.types import CreateEventBody, ReserveBody, SearchResult
+
+_STALENESS = 60.0
+
+_SEARCH_JSON: TypeAdapter[SearchResult] = TypeAdapter(SearchResult)
+
+
+def _search(params: SearchParams, repos: Repos) -> SearchResult:
+    # The /search body as served, decoded back into its typed shape
+    return _SEARCH_JSON.validate_json(search_json_ep(params, repos))
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class _Loader:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def __call__(self) -> ListingPage:
+        self.calls += 1
+        return ListingPage(listings=[], total=self.calls)
+
+
+class TestSearchCache(unittest.TestCase):
+    def setUp(self) -> None:
+        self.clock = _Clock()
+        self.cache = SearchCache(2, _STALENESS, clock=self.clock)
+
+    def test_hits_until_the_version_changes_or_max_staleness(self) -> None:
+        load = _Loader()
+        self.cache.get_or_load("q", "v1", load)
+        self.assertEqual(self.cache.get_or_load("q", "v1", load).total, 1)
+        # A write bumped the version: the page is dropped on lookup
+        self.assertEqual(self.cache.get_or_load("q", "v2", load).total, 2)
+        self.clock.now += _STALENESS + 1
+        self.assertEqual(self.cache.get_or_load("q", "v2", load).total, 3)
+        stats = self.cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["stale"]), (1, 3, 2))
+        self.assertEqual(stats["hit_rate"], 0.25)
+
+    def test_refresh_bypasses_the_lookup_but_replaces_the_page(self) -> None:
+        load = _Loader()
+        self.cache.get_or_load("q", "v1", load)
+        self.assertEqual(self.cache.get_or_load("q", "v1", load, refresh=True).total, 2)
+        self.assertEqual(self.cache.get_or_load("q", "v1", load).total, 2)
+        stats = self.cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["bypassed"]), (1, 1, 1))
+
+    def test_least_recently_used_is_evicted_and_disabled_passes_through(self) -> None:
+        loads = {key: _Loader() for key in "abc"}
+        for key in "abac":
+            self.cache.get_or_load(key, "v", loads[key])
+        self.cache.get_or_load("b", "v", loads["b"])
+        self.assertEqual((loads["a"].calls, loads["b"].calls), (1, 2))
+        self.assertEqual(self.cache.stats()["evictions"], 2)
+        off = SearchCache(0, _STALENESS)
+        load = _Loader()
+        off.get_or_load("q", "v", load)
+        off.get_or_load("q", "v", load)
+        self.assertEqual((load.calls, off.stats()["hit_rate"]), (2, 0.0))
+
+
+def _params(q: str | None, *, fresh: bool = False) -> SearchParams:
+    return SearchParams(q=q, start=None, to=None, limit=10, offset=0, fresh=fresh)
+
+
+class TestSearchEndpointCaching(unittest.TestCase):
+    def setUp(self) -> None:
+        settings = replace(Settings.from_env(), search_cache_max_staleness=3600.0)
+        configure_event_cache(settings)
+        self.cache = configure_search_cache(settings)
+        self.repos = InMemoryRepos(Store())
+        now = dt.datetime.now(dt.UTC)
+        body: CreateEventBody = {
+            "title": "Hackathon",
+            "description": None,
+            "type": None,
+            "starts_at": now + dt.timedelta(hours=1),
+            "ends_at": now + dt.timedelta(hours=2),
+            "location_text": None,
+            "discord_link": None,
+            "website_link": None,
+            "capacity": 3,
+            "public": True,
+            "requires_join_code": False,
+            "tags": [],
+        }
+        self.event_id = create_event_ep(body, self.repos)["event"]["id"]
+
+    def tearDown(self) -> None:
+        configure_event_cache(Settings.from_env())
+        configure_search_cache(Settings.from_env())
+
+    def test_repeated_queries_hit_until_a_write(self) -> None:
+        self.assertIs(search_cache(), self.cache)
+        first = _search(_params("hackathon"), self.repos)
+        self.assertEqual(_search(_params("hackathon"), self.repos), first)
+        body: ReserveBody = {"display_name": "U", "email": "u@uci.edu", "join_code": None}
+        reserve_ep(self.event_id, body, self.repos, user_id="u1")
+        after = _search(_params("hackathon"), self.repos)
+        self.assertEqual(after["events"][0]["confirmed_count"], 1)
+        stats = metrics_ep()["search_cache"]
+        self.assertEqual((stats["hits"], stats["misses"], stats["stale"]), (1, 2, 1))
+
+    def test_fresh_skips_the_cached_page(self) -> None:
+        _search(_params(None), self.repos)
+        _search(_params(""), self.repos)
+        _search(_params(None, fresh=True), self.repos)
+        stats = self.cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["bypassed"]), (1, 1, 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -108,3 +108,60 @@ class TestServices(unittest.TestCase):
         svc.cancel_and_maybe_promote(self.event.id, res1.reservation.id)
         # Cancel again (already canceled)
         svc.cancel_and_maybe_promote(self.event.id, res1.reservation.id)
+
+    def test_occupancy_counters_follow_reserve_cancel_promote(self) -> None:
+        svc = ReservationService(self.repos)
+        res1 = svc.reserve(self.event, ReserveInput(display_name="A", email=None, join_code=None))
+        svc.reserve(self.event, ReserveInput(display_name="B", email=None, join_code=None))
+        occ = self.repos.reservations.occupancy(self.event.id)
+        self.assertEqual((occ.confirmed, occ.waitlisted), (1, 1))
+        svc.cancel_and_maybe_promote(self.event.id, res1.reservation.id)
+        occ = self.repos.reservations.occupancy(self.event.id)
+        self.assertEqual((occ.confirmed, occ.waitlisted), (1, 0))
+        # Mutating a returned reservation must not touch the stored copy/counters
+        got = self.repos.reservations.get(res1.reservation.id)
+        self.assertIsNotNone(got)
+        if got is not None:
+            got.status = ReservationStatus.CONFIRMED
+        self.assertEqual(self.repos.reservations.occupancy(self.event.id).confirmed, 1)
+
+    def test_recompute_occupancy_repairs_drift(self) -> None:
+        svc = ReservationService(self.repos)
+        svc.reserve(self.event, ReserveInput(display_name="A", email=None, join_code=None))
+        self.store.occupancy[self.event.id].confirmed = 7
+        self.assertEqual(self.repos.reservations.recompute_occupancy(), 1)
+        self.assertEqual(self.repos.reservations.occupancy(self.event.id).confirmed, 1)
+        self.assertEqual(self.repos.reservations.recompute_occupancy(), 0)
+
+    def test_cancel_waitlisted_does_not_promote(self) -> None:
+        svc = ReservationService(self.repos)
+        svc.reserve(self.event, ReserveInput(display_name="A", email=None, join_code=None))
+        res2 = svc.reserve(self.event, ReserveInput(display_name="B", email=None, join_code=None))
+        res3 = svc.reserve(self.event, ReserveInput(display_name="C", email=None, join_code=None))
+        svc.cancel_and_maybe_promote(self.event.id, res2.reservation.id)
+        # No seat was freed, so C stays on the waitlist
+        self.assertEqual(
+            self.store.reservations[res3.reservation.id].status, ReservationStatus.WAITLISTED
+        )
+        occ = self.repos.reservations.occupancy(self.event.id)
+        self.assertEqual((occ.confirmed, occ.waitlisted), (1, 1))
+
+    def test_cancel_reports_promotion(self) -> None:
+        svc = ReservationService(self.repos)
+        res1 = svc.reserve(self.event, ReserveInput(display_name="A", email=None, join_code=None))
+        res2 = svc.reserve(self.event, ReserveInput(display_name="B", email=None, join_code=None))
+        outcome = self.repos.reservations.cancel_and_promote(self.event.id, res1.reservation.id)
+        self.assertIsNotNone(outcome)
+        if outcome is not None:
+            self.assertEqual(outcome.previous_status, ReservationStatus.CONFIRMED)
+            self.assertEqual(outcome.promoted_id, res2.reservation.id)
+        self.assertIsNotNone(self.store.reservations[res2.reservation.id].promoted_at)
+
+    def test_cancel_reservation_of_other_event_not_found(self) -> None:
+        svc = ReservationService(self.repos)
+        res1 = svc.reserve(self.event, ReserveInput(display_name="A", email=None, join_code=None))
+        with self.assertRaises(AppError):
+            svc.cancel_and_maybe_promote("other-event", res1.reservation.id)
+        self.assertEqual(
+            self.store.reservations[res1.reservation.id].status, ReservationStatus.CONFIRMED
+        )
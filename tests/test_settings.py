@@ -22,3 +22,35 @@ class TestSettings(unittest.TestCase):
         self.assertEqual(s.rate_limit_write, 11)
         self.assertEqual(s.rate_limit_read, 22)
         self.assertEqual(s.port, 9999)
+
+    def test_db_pool_settings(self) -> None:
+        os.environ["ICS_DB_POOL_SIZE"] = "3"
+        os.environ["ICS_DB_MAX_OVERFLOW"] = "0"
+        os.environ["ICS_DB_POOL_TIMEOUT"] = "2.5"
+        os.environ["ICS_DB_POOL_RECYCLE"] = "60"
+        os.environ["ICS_DB_POOL_PRE_PING"] = "false"
+        try:
+            s = Settings.from_env()
+        finally:
+            for key in (
+                "ICS_DB_POOL_SIZE",
+                "ICS_DB_MAX_OVERFLOW",
+                "ICS_DB_POOL_TIMEOUT",
+                "ICS_DB_POOL_RECYCLE",
+                "ICS_DB_POOL_PRE_PING",
+            ):
+                del os.environ[key]
+        self.assertEqual(s.db_pool_size, 3)
+        self.assertEqual(s.db_max_overflow, 0)
+        self.assertEqual(s.db_pool_timeout, 2.5)
+        self.assertEqual(s.db_pool_recycle, 60)
+        self.assertFalse(s.db_pool_pre_ping)
+        self.assertTrue(Settings.from_env().db_pool_pre_ping)
+
+    def test_search_backend_setting(self) -> None:
+        self.assertEqual(Settings.from_env().search_backend, "auto")
+        os.environ["ICS_SEARCH_BACKEND"] = " LIKE "
+        try:
+            self.assertEqual(Settings.from_env().search_backend, "like")
+        finally:
+            del os.environ["ICS_SEARCH_BACKEND"]
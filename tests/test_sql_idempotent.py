@@ -102,7 +102,8 @@ class TestSQLIdempotent(unittest.TestCase):
             promoted_at=None,
             created_at=utcnow(),
         )
-        repos.reservations.create(r1)
+        with repos.transaction():
+            repos.reservations.create(r1)
 
         # Try to create duplicate - should raise IntegrityError
         r2 = Reservation(
@@ -116,14 +117,61 @@ class TestSQLIdempotent(unittest.TestCase):
             created_at=utcnow(),
         )
 
-        with self.assertRaises(IntegrityError):
+        # The unit of work rolls back on the IntegrityError; r1 stays committed
+        with self.assertRaises(IntegrityError), repos.transaction():
             repos.reservations.create(r2)
 
-        # After IntegrityError, rollback the session to continue testing
-        from ics_connect.repositories.sql import SQLRepos
-
-        if isinstance(repos, SQLRepos):
-            repos.session.rollback()
-
         # Verify only one reservation exists (constraint worked!)
         self.assertEqual(repos.reservations.count_confirmed(ev.id), 1)
+
+    def test_database_constraint_keys_anonymous_reservations_by_normalized_email(self) -> None:
+        from sqlalchemy.exc import IntegrityError
+
+        from ics_connect.models import Reservation, ReservationStatus
+        from ics_connect.util.ids import new_id
+
+        repos: Repos = next(provide_repos())
+        now = dt.datetime.now(dt.UTC)
+        ev = EventService(repos).create(
+            CreateEventInput(
+                title="Email Constraint",
+                starts_at=now + dt.timedelta(hours=1),
+                ends_at=now + dt.timedelta(hours=2),
+                description=None,
+                type=None,
+                location_text=None,
+                discord_link=None,
+                website_link=None,
+                public=True,
+                requires_join_code=False,
+                capacity=5,
+            )
+        ).event
+
+        def reservation(email: str, user_id: str | None = None) -> Reservation:
+            return Reservation(
+                id=new_id(),
+                event_id=ev.id,
+                user_id=user_id,
+                display_name="Anon",
+                email=email,
+                status=ReservationStatus.CONFIRMED,
+                promoted_at=None,
+            )
+
+        first = reservation("anon@uci.edu")
+        with repos.transaction():
+            repos.reservations.create(first)
+            # A signed-in user's reservation is keyed by user id, not email
+            repos.reservations.create(reservation("anon@uci.edu", user_id="u-anon"))
+        with self.assertRaises(IntegrityError), repos.transaction():
+            repos.reservations.create(reservation(" ANON@uci.edu"))
+        found = repos.reservations.find_active_by_event_and_email(ev.id, "Anon@UCI.edu ")
+        self.assertEqual(found.id if found else None, first.id)
+
+        # Canceling frees the key for a new anonymous reservation
+        first.status = ReservationStatus.CANCELED
+        with repos.transaction():
+            repos.reservations.update(first)
+            repos.reservations.create(reservation("anon@uci.edu"))
+        self.assertEqual(repos.reservations.count_confirmed(ev.id), 2)
@@ -3,11 +3,48 @@ from __future__ import annotations
 import datetime as dt
 import os
 import unittest
+import uuid
+from dataclasses import replace
 
+from ics_connect.db import Store, get_database
 from ics_connect.di import provide_repos
 from ics_connect.models import Reservation, ReservationStatus
+from ics_connect.repositories.inmemory import InMemoryRepos
+from ics_connect.repositories.protocols import EventQuery, Repos
+from ics_connect.repositories.sql import SQLRepos, listing_page_stmt
+from ics_connect.repositories.sql_search import LikeEventSearch
 from ics_connect.services.events import CreateEventInput, EventService
 from ics_connect.services.reservations import ReservationService, ReserveInput
+from ics_connect.util.ids import new_id, new_uuid
+
+_V7 = 7
+
+
+def _seed_search_events(repos: Repos, base: dt.datetime) -> None:
+    svc = EventService(repos)
+    titles = ["Zeta 100% Jam", "zeta 100x jam", "Zeta_Night", "Zeta Talk", "Other"]
+    # Insert out of order so ordering comes from the query, not insertion
+    for i in (3, 0, 4, 1, 2):
+        svc.create(
+            CreateEventInput(
+                title=titles[i],
+                starts_at=base + dt.timedelta(hours=i),
+                ends_at=base + dt.timedelta(hours=i + 1),
+                description="about zeta" if titles[i] == "Other" else None,
+                type=None,
+                location_text=None,
+                discord_link=None,
+                website_link=None,
+                public=True,
+                requires_join_code=False,
+                capacity=5,
+            )
+        )
+
+
+def _search_titles(repos: Repos, query: EventQuery) -> tuple[list[str], int]:
+    page = repos.events.search(query)
+    return [e.title for e in page.events], page.total
 
 
 class TestSQLIntegration(unittest.TestCase):
@@ -44,6 +81,8 @@ class TestSQLIntegration(unittest.TestCase):
         _ = repos.events.list_all()
         self.assertEqual(repos.reservations.count_confirmed(ev.id), 1)
         self.assertEqual(repos.reservations.count_waitlisted(ev.id), 1)
+        occ = repos.reservations.occupancy(ev.id)
+        self.assertEqual((occ.confirmed, occ.waitlisted), (1, 1))
         # Early return path of update (missing ID)
         missing = Reservation(
             id="missing",
@@ -60,3 +99,129 @@ class TestSQLIntegration(unittest.TestCase):
         self.assertIsNotNone(got2)
         if got2 is not None:
             self.assertEqual(got2.status, "confirmed")
+        occ = repos.reservations.occupancy(ev.id)
+        self.assertEqual((occ.confirmed, occ.waitlisted), (1, 0))
+        # Counters already match reservations for this event
+        repos.reservations.recompute_occupancy()
+        self.assertEqual(repos.reservations.recompute_occupancy(), 0)
+        self.assertEqual(repos.reservations.occupancy("missing").confirmed, 0)
+        counts = repos.reservations.counts_for_events([ev.id, "missing"])
+        self.assertEqual((counts[ev.id].confirmed, counts[ev.id].waitlisted), (1, 0))
+        self.assertEqual(counts["missing"].confirmed, 0)
+        self.assertFalse(repos.reservations.counts_for_events([]))
+
+    def test_sql_like_search_matches_inmemory(self) -> None:
+        # The LIKE backend keeps the in-memory substring semantics exactly
+        session = next(get_database("sqlite:///:memory:").session())
+        sql_repos = SQLRepos(session, LikeEventSearch())
+        mem_repos = InMemoryRepos(Store())
+        # Far-future window keeps this test clear of events created elsewhere
+        base = dt.datetime(2091, 3, 1, 12, tzinfo=dt.UTC)
+        _seed_search_events(sql_repos, base)
+        _seed_search_events(mem_repos, base)
+        window = EventQuery(start=base, to=base + dt.timedelta(days=1))
+        queries = [
+            window,
+            replace(window, q="ZETA"),
+            replace(window, q="100%"),
+            replace(window, q="zeta_"),
+            replace(window, q="zeta", limit=2, offset=1),
+            EventQuery(start=base + dt.timedelta(hours=2), to=base + dt.timedelta(hours=3)),
+            replace(window, q="zeta", offset=50),
+        ]
+        for query in queries:
+            with self.subTest(query=query):
+                self.assertEqual(_search_titles(sql_repos, query), _search_titles(mem_repos, query))
+        titles, total = _search_titles(sql_repos, replace(window, q="100%"))
+        expected = ["Zeta 100% Jam"]
+        self.assertEqual((titles, total), (expected, 1))
+        titles, total = _search_titles(sql_repos, replace(window, q="zeta", limit=2, offset=1))
+        expected = ["zeta 100x jam", "Zeta_Night"]
+        self.assertEqual((titles, total), (expected, 5))
+
+    def test_sql_keyset_pages_match_offset_pages(self) -> None:
+        sql_repos = next(provide_repos())
+        mem_repos = InMemoryRepos(Store())
+        base = dt.datetime(2092, 5, 1, 9, tzinfo=dt.UTC)
+        _seed_search_events(sql_repos, base)
+        _seed_search_events(mem_repos, base)
+        first = EventQuery(q="zeta", start=base, to=base + dt.timedelta(days=1), limit=2)
+        for repos in (sql_repos, mem_repos):
+            seen: list[str] = []
+            query = first
+            while True:
+                page = repos.events.search(query)
+                self.assertEqual(page.total, 5)
+                seen.extend(e.title for e in page.events)
+                if page.next_after is None:
+                    break
+                query = replace(first, after=page.next_after)
+            everything = repos.events.search(replace(first, limit=10))
+            expected: list[str] = [e.title for e in everything.events]
+            self.assertEqual(seen, expected)
+            self.assertIsNone(everything.next_after)
+
+    def test_listing_projection_matches_full_entities(self) -> None:
+        sql_repos = next(provide_repos())
+        mem_repos = InMemoryRepos(Store())
+        base = dt.datetime(2093, 2, 1, 9, tzinfo=dt.UTC)
+        _seed_search_events(sql_repos, base)
+        _seed_search_events(mem_repos, base)
+        window = EventQuery(start=base, to=base + dt.timedelta(days=1), limit=2)
+        queries = [window, replace(window, q="zeta"), replace(window, q="zeta", offset=9)]
+        for repos in (sql_repos, mem_repos):
+            for query in queries:
+                with self.subTest(repos=type(repos).__name__, query=query):
+                    full = repos.events.search(query)
+                    page = repos.events.search_listings(query)
+                    listed: list[str] = [r.id for r in page.listings]
+                    expected: list[str] = [e.id for e in full.events]
+                    self.assertEqual(listed, expected)
+                    self.assertEqual((page.total, page.next_after), (full.total, full.next_after))
+            event_id = repos.events.search(window).events[0].id
+            listing = repos.events.get_listing(event_id)
+            occ = repos.reservations.occupancy(event_id)
+            if listing is None:
+                self.fail("seeded event has a listing")
+            self.assertEqual((listing.confirmed_count, listing.waitlist_count), (occ.confirmed, 0))
+            self.assertIsNone(repos.events.get_listing("missing"))
+
+    def test_listing_statement_skips_secret_and_unused_columns(self) -> None:
+        sql = str(listing_page_stmt(EventQuery(q="zeta")))
+        select_list = sql.split("FROM", 1)[0]
+        for column in ("join_code_hash", "admin_key_hash", "tags_json", "created_at"):
+            self.assertNotIn(column, select_list)
+        self.assertIn("confirmed_count", select_list)
+
+    def test_v4_keyed_rows_coexist_with_time_ordered_ids(self) -> None:
+        repos = next(provide_repos())
+        base = dt.datetime(2094, 3, 1, 9, tzinfo=dt.UTC)
+        _seed_search_events(repos, base)
+        window = EventQuery(start=base, to=base + dt.timedelta(days=1), limit=10)
+        legacy = repos.events.search(window).events[0]
+        # A row written before ids were time-ordered, next to one written after
+        v4 = replace(legacy, id=new_uuid(), title="Legacy v4")
+        v7 = replace(legacy, id=new_id(), title="Current v7")
+        with repos.transaction():
+            repos.events.create(v4)
+            repos.events.create(v7)
+        res_svc = ReservationService(repos)
+        for ev in (v4, v7):
+            reserved = res_svc.reserve(
+                ev, ReserveInput(display_name="A", email=None, join_code=None)
+            )
+            self.assertEqual(uuid.UUID(reserved.reservation.id).version, _V7)
+            self.assertIsNotNone(repos.events.get_listing(ev.id))
+            self.assertEqual(repos.reservations.count_confirmed(ev.id), 1)
+        # Keyset paging tie-breaks on id across both formats
+        seen: list[str] = []
+        query = replace(window, limit=2)
+        while True:
+            page = repos.events.search(query)
+            seen.extend(e.id for e in page.events)
+            if page.next_after is None:
+                break
+            query = replace(query, after=page.next_after)
+        everything: list[str] = [e.id for e in repos.events.search(window).events]
+        self.assertEqual(seen, everything)
+        self.assertIn(v4.id, seen)
@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import datetime as dt
+import unittest
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from ics_connect.migrations import migrate
+from ics_connect.repositories.protocols import EventQuery
+from ics_connect.repositories.sql import (
+    active_by_email_stmt,
+    count_by_status_stmt,
+    explain_plan,
+    oldest_waitlisted_stmt,
+    search_page_stmt,
+)
+
+
+class TestSQLQueryPlans(unittest.TestCase):
+    """EXPLAIN the hot-path queries on a migrated SQLite database."""
+
+    def setUp(self) -> None:
+        self.engine = create_engine("sqlite://")
+        migrate(self.engine)
+        self.session = Session(self.engine)
+
+    def tearDown(self) -> None:
+        self.session.close()
+        self.engine.dispose()
+
+    def _plan(self, plan: list[str]) -> str:
+        return "\n".join(plan)
+
+    def test_counts_use_composite_index(self) -> None:
+        for status in ("confirmed", "waitlisted"):
+            plan = self._plan(explain_plan(self.session, count_by_status_stmt("e1", status)))
+            self.assertIn("ix_reservations_event_status_created", plan)
+            self.assertNotIn("SCAN reservations", plan)
+
+    def test_waitlist_head_uses_index_order(self) -> None:
+        plan = self._plan(explain_plan(self.session, oldest_waitlisted_stmt("e1")))
+        self.assertIn("ix_reservations_event_status_created", plan)
+        # created_at is the trailing index column, so no sort step is needed
+        self.assertNotIn("TEMP B-TREE", plan)
+
+    def test_anonymous_email_lookup_probes_the_partial_unique_index(self) -> None:
+        plan = self._plan(explain_plan(self.session, active_by_email_stmt("e1", " A@uci.edu")))
+        self.assertIn("ux_reservations_event_email_active", plan)
+        self.assertNotIn("SCAN reservations", plan)
+
+    def test_search_page_uses_starts_at_index(self) -> None:
+        for query in (
+            EventQuery(),
+            EventQuery(
+                start=dt.datetime(2025, 1, 1, tzinfo=dt.UTC),
+                to=dt.datetime(2025, 2, 1, tzinfo=dt.UTC),
+            ),
+            EventQuery(after=(dt.datetime(2025, 1, 1, tzinfo=dt.UTC), "evt")),
+        ):
+            plan = self._plan(explain_plan(self.session, search_page_stmt(query)))
+            self.assertIn("ix_events_starts_at_id", plan)
+            self.assertNotIn("TEMP B-TREE", plan)
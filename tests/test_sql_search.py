@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import datetime as dt
+import unittest
+
+from pydantic import TypeAdapter
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from ics_connect.endpoints import SearchParams, search_json_ep
+from ics_connect.migrations import migrate
+from ics_connect.repositories.protocols import EventQuery, Repos
+from ics_connect.repositories.sql import SQLRepos, explain_plan, search_page_stmt
+from ics_connect.repositories.sql_search import (
+    Fts5EventSearch,
+    LikeEventSearch,
+    TsvectorEventSearch,
+    event_search_for,
+    query_tokens,
+)
+from ics_connect.services.events import CreateEventInput, EventService
+from ics_connect.types import SearchResult
+
+_BASE = dt.datetime(2030, 1, 1, 18, tzinfo=dt.UTC)
+
+_SEARCH_JSON: TypeAdapter[SearchResult] = TypeAdapter(SearchResult)
+
+
+def _search(params: SearchParams, repos: Repos) -> SearchResult:
+    # The /search body as served, decoded back into its typed shape
+    return _SEARCH_JSON.validate_json(search_json_ep(params, repos))
+
+
+class TestFullTextSearch(unittest.TestCase):
+    def setUp(self) -> None:
+        self.engine = create_engine("sqlite://")
+        migrate(self.engine)
+        self.session = Session(self.engine)
+        self.repos = SQLRepos(self.session)
+        svc = EventService(self.repos)
+        rows = [
+            ("Board game night", "Bring snacks"),
+            ("Career fair", "Meet recruiters; resume workshop after"),
+            ("Resume Workshop", None),
+            ("Workshops: Git basics", "Hands-on workshop for beginners"),
+            ("Hackathon kickoff", "Teams form, then pizza"),
+        ]
+        for i, (title, description) in enumerate(rows):
+            svc.create(
+                CreateEventInput(
+                    title=title,
+                    starts_at=_BASE + dt.timedelta(days=i),
+                    ends_at=_BASE + dt.timedelta(days=i, hours=2),
+                    description=description,
+                    type=None,
+                    location_text=None,
+                    discord_link=None,
+                    website_link=None,
+                    public=True,
+                    requires_join_code=False,
+                    capacity=10,
+                )
+            )
+
+    def tearDown(self) -> None:
+        self.session.close()
+        self.engine.dispose()
+
+    def _titles(self, query: EventQuery) -> list[str]:
+        return [e.title for e in self.repos.events.search(query).events]
+
+    def test_backend_selection(self) -> None:
+        self.assertIsInstance(self.repos.search, Fts5EventSearch)
+        self.assertIsInstance(event_search_for("postgresql"), TsvectorEventSearch)
+        self.assertIsInstance(event_search_for("mysql"), LikeEventSearch)
+        self.assertIsInstance(event_search_for("sqlite", "like"), LikeEventSearch)
+        with self.assertRaises(ValueError):
+            event_search_for("sqlite", "elastic")
+
+    def test_query_tokens_drop_operators(self) -> None:
+        expected = ["resume", "or", "git"]
+        self.assertEqual(query_tokens('Resume" OR git*'), expected)
+
+    def test_token_prefix_matching_in_time_order(self) -> None:
+        expected = ["Career fair", "Resume Workshop", "Workshops: Git basics"]
+        self.assertEqual(self._titles(EventQuery(q="workshop")), expected)
+        # Date filters take the joined count instead of the FTS-only one
+        later = self.repos.events.search(
+            EventQuery(q="workshop", start=_BASE + dt.timedelta(days=2))
+        )
+        self.assertEqual(later.total, 2)
+        # Every token must match (AND), each as a prefix
+        expected = ["Career fair", "Resume Workshop"]
+        self.assertEqual(self._titles(EventQuery(q="resume work")), expected)
+        expected = ["Hackathon kickoff"]
+        self.assertEqual(self._titles(EventQuery(q="hack")), expected)
+
+    def test_relevance_ranks_title_hits_first(self) -> None:
+        ranked = self._titles(EventQuery(q="resume", order="relevance"))
+        expected = ["Resume Workshop", "Career fair"]
+        self.assertEqual(ranked, expected)
+
+    def test_hostile_and_tokenless_queries(self) -> None:
+        for q in ('"', 'resume" OR "x', "NEAR(", "*", "git AND -"):
+            with self.subTest(q=q):
+                self.repos.events.search(EventQuery(q=q, order="relevance"))
+        # No word tokens at all: falls back to a substring match
+        expected = ["Career fair"]
+        self.assertEqual(self._titles(EventQuery(q=";")), expected)
+
+    def test_relevance_pages_through_offset_cursor(self) -> None:
+        titles: list[str] = []
+        cursor: str | None = None
+        while True:
+            params = SearchParams(
+                q="workshop", start=None, to=None, limit=2, offset=0, cursor=cursor
+            )
+            result = _search(params, self.repos)
+            self.assertEqual(result["total"], 3)
+            titles.extend(ev["title"] for ev in result["events"])
+            cursor = result["next_cursor"]
+            if cursor is None:
+                break
+        expected = self._titles(EventQuery(q="workshop", order="relevance"))
+        self.assertEqual(titles, expected)
+        chrono = SearchParams(
+            q="workshop", start=None, to=None, limit=2, offset=0, sort="starts_at"
+        )
+        self.assertEqual(_search(chrono, self.repos)["events"][0]["title"], "Career fair")
+
+    def test_match_is_served_by_fts_index(self) -> None:
+        stmt = search_page_stmt(EventQuery(q="workshop", order="relevance"), self.repos.search)
+        plan = "\n".join(explain_plan(self.session, stmt))
+        self.assertIn("events_fts VIRTUAL TABLE", plan)
+        self.assertIn("USING INDEX sqlite_autoindex_events_1", plan)
@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import datetime as dt
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
+from pathlib import Path
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import OperationalError
+
+from ics_connect.db import Database
+from ics_connect.migrations import migrate
+from ics_connect.models import Event
+from ics_connect.repositories.protocols import EventQuery
+from ics_connect.repositories.sql import SQLRepos
+from ics_connect.repositories.sql_engine import read_pragma
+from ics_connect.services.reservations import ReservationService, ReserveInput
+from ics_connect.settings import Settings
+from ics_connect.util.ids import new_id
+
+_BUSY_MS = 1234
+_MMAP = 1 << 20
+_RESERVES = 40
+
+
+def _event(capacity: int) -> Event:
+    now = dt.datetime.now(dt.UTC)
+    return Event(
+        id=new_id(),
+        title="Profile",
+        description=None,
+        type=None,
+        starts_at=now + dt.timedelta(days=1),
+        ends_at=now + dt.timedelta(days=1, hours=1),
+        location_text=None,
+        tags_json="[]",
+        public=True,
+        requires_join_code=False,
+        join_code_hash=None,
+        admin_key_hash="x",
+        capacity=capacity,
+        waitlist_enabled=True,
+        discord_link=None,
+        website_link=None,
+    )
+
+
+def _pragma(engine: Engine, name: str) -> str:
+    with engine.connect() as conn:
+        return read_pragma(conn, name)
+
+
+class _ProfileCase(unittest.TestCase):
+    profile = "production"
+
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        settings = replace(
+            Settings.from_env(),
+            sqlite_profile=self.profile,
+            sqlite_busy_timeout_ms=_BUSY_MS,
+            sqlite_mmap_size=_MMAP,
+        )
+        self.db = Database(f"sqlite:///{Path(self._tmp.name) / 'profile.db'}", settings)
+        migrate(self.db.engine)
+
+    def tearDown(self) -> None:
+        self.db.dispose()
+        self._tmp.cleanup()
+
+
+class TestProductionProfile(_ProfileCase):
+    def test_connections_carry_the_pragmas(self) -> None:
+        for engine in (self.db.engine, self.db.read_engine):
+            self.assertEqual(_pragma(engine, "journal_mode"), "wal")
+            # NORMAL
+            self.assertEqual(_pragma(engine, "synchronous"), "1")
+            self.assertEqual(_pragma(engine, "busy_timeout"), str(_BUSY_MS))
+            self.assertEqual(_pragma(engine, "mmap_size"), str(_MMAP))
+        self.assertEqual(_pragma(self.db.engine, "query_only"), "0")
+        self.assertEqual(_pragma(self.db.read_engine, "query_only"), "1")
+
+    def test_writes_have_one_connection_and_reads_their_own_pool(self) -> None:
+        self.assertIsNot(self.db.read_engine, self.db.engine)
+        self.assertEqual(self.db.pool_stats()["size"], 1)
+        for session in self.db.read_session():
+            with self.assertRaises(OperationalError):
+                session.execute(text("DELETE FROM events"))
+
+    def test_reserves_queue_on_the_writer_while_searches_run(self) -> None:
+        event = _event(_RESERVES // 2)
+        for session in self.db.session():
+            repos = SQLRepos(session, self.db.search)
+            with repos.transaction():
+                repos.events.create(event)
+
+        def reserve(i: int) -> str:
+            for session in self.db.session():
+                data = ReserveInput(display_name="P", email=None, join_code=None, user_id=str(i))
+                repos = SQLRepos(session, self.db.search)
+                return ReservationService(repos).reserve(event, data).reservation.status
+            return ""
+
+        def search(_: int) -> int:
+            for session in self.db.read_session():
+                return SQLRepos(session, self.db.search).events.search(EventQuery(limit=5)).total
+            return 0
+
+        with ThreadPoolExecutor(max_workers=16) as pool:
+            searches = pool.map(search, range(_RESERVES))
+            statuses = list(pool.map(reserve, range(_RESERVES)))
+            totals: set[int] = set(searches)
+        self.assertEqual(statuses.count("confirmed"), _RESERVES // 2)
+        self.assertEqual(statuses.count("waitlisted"), _RESERVES // 2)
+        # Every search saw the one event, never a half-written reserve or a lock error
+        one_event: set[int] = {1}
+        self.assertEqual(totals, one_event)
+
+
+class TestDefaultProfile(_ProfileCase):
+    profile = "default"
+
+    def test_sqlite_defaults_and_one_shared_pool(self) -> None:
+        self.assertEqual(_pragma(self.db.engine, "journal_mode"), "delete")
+        self.assertIs(self.db.read_engine, self.db.engine)
+        self.assertEqual(self.db.pool_stats()["size"], Settings.from_env().db_pool_size)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+import datetime as dt
+import tempfile
+import unittest
+from pathlib import Path
+
+from ics_connect.db import Database, Store
+from ics_connect.migrations import migrate
+from ics_connect.models import Event, Reservation, ReservationStatus
+from ics_connect.repositories.inmemory import InMemoryRepos
+from ics_connect.repositories.protocols import DuplicateReservationError, Repos
+from ics_connect.repositories.sql import SQLRepos
+from ics_connect.settings import Settings
+from ics_connect.util.ids import new_uuid
+
+
+class _BoomError(Exception):
+    pass
+
+
+def _event() -> Event:
+    now = dt.datetime.now(dt.UTC)
+    return Event(
+        id=new_uuid(),
+        title="UoW",
+        description=None,
+        type=None,
+        starts_at=now + dt.timedelta(days=2),
+        ends_at=now + dt.timedelta(days=2, hours=1),
+        location_text=None,
+        tags_json="[]",
+        public=True,
+        requires_join_code=False,
+        join_code_hash=None,
+        admin_key_hash="x",
+        capacity=1,
+        waitlist_enabled=True,
+        discord_link=None,
+        website_link=None,
+    )
+
+
+def _reservation(event_id: str, user_id: str) -> Reservation:
+    return Reservation(
+        id=new_uuid(),
+        event_id=event_id,
+        user_id=user_id,
+        display_name=user_id,
+        email=None,
+        status=ReservationStatus.CONFIRMED,
+        promoted_at=None,
+    )
+
+
+class _UnitOfWorkCases(unittest.TestCase):
+    """Behaviour every backend's ``Repos.transaction()`` must share."""
+
+    def setUp(self) -> None:
+        if type(self) is _UnitOfWorkCases:
+            self.skipTest("backend-agnostic base")
+
+    def repos(self) -> Repos:  # pragma: no cover - overridden
+        raise NotImplementedError
+
+    def _fail_inside(self, repos: Repos, event: Event) -> None:
+        with repos.transaction():
+            repos.events.create(event)
+            repos.reservations.create(_reservation(event.id, "u1"))
+            raise _BoomError
+
+    def test_commit_makes_writes_visible(self) -> None:
+        repos = self.repos()
+        ev = _event()
+        with repos.transaction():
+            repos.events.create(ev)
+            placed = repos.reservations.create_within_capacity(_reservation(ev.id, "u1"))
+        self.assertIsNotNone(placed)
+        fresh = self.repos()
+        self.assertIsNotNone(fresh.events.get(ev.id))
+        self.assertEqual(fresh.reservations.occupancy(ev.id).confirmed, 1)
+
+    def test_exception_rolls_back_everything(self) -> None:
+        repos = self.repos()
+        ev = _event()
+        with self.assertRaises(_BoomError):
+            self._fail_inside(repos, ev)
+        fresh = self.repos()
+        self.assertIsNone(fresh.events.get(ev.id))
+        self.assertEqual(fresh.reservations.count_confirmed(ev.id), 0)
+        self.assertIsNone(fresh.reservations.find_active_by_event_and_user(ev.id, "u1"))
+
+    def test_savepoint_undoes_only_the_inner_block(self) -> None:
+        repos = self.repos()
+        ev = _event()
+        with repos.transaction():
+            repos.events.create(ev)
+            first = repos.reservations.create_within_capacity(_reservation(ev.id, "u1"))
+            with self.assertRaises(DuplicateReservationError), repos.transaction():
+                repos.reservations.create_within_capacity(_reservation(ev.id, "u1"))
+            # The outer unit of work is still usable after the savepoint rolled back
+            second = repos.reservations.create_within_capacity(_reservation(ev.id, "u2"))
+        if first is None or second is None:
+            self.fail("both distinct users get a place")
+        self.assertEqual(second.status, ReservationStatus.WAITLISTED)
+        occ = self.repos().reservations.occupancy(ev.id)
+        self.assertEqual((occ.confirmed, occ.waitlisted), (1, 1))
+
+    def test_rollback_restores_updated_reservation(self) -> None:
+        repos = self.repos()
+        ev = _event()
+        with repos.transaction():
+            repos.events.create(ev)
+            placed = repos.reservations.create_within_capacity(_reservation(ev.id, "u1"))
+        if placed is None:
+            self.fail("seat available")
+        with self.assertRaises(_BoomError), repos.transaction():
+            repos.reservations.cancel_and_promote(ev.id, placed.id)
+            raise _BoomError
+        fresh = self.repos().reservations
+        self.assertEqual(fresh.count_confirmed(ev.id), 1)
+        self.assertIsNotNone(fresh.find_active_by_event_and_user(ev.id, "u1"))
+
+
+class TestInMemoryUnitOfWork(_UnitOfWorkCases):
+    def setUp(self) -> None:
+        super().setUp()
+        self.store = Store()
+
+    def repos(self) -> Repos:
+        return InMemoryRepos(self.store)
+
+
+class TestSQLUnitOfWork(_UnitOfWorkCases):
+    def setUp(self) -> None:
+        super().setUp()
+        self._tmp = tempfile.TemporaryDirectory()
+        self.db = Database(f"sqlite:///{Path(self._tmp.name) / 'uow.db'}", Settings.from_env())
+        migrate(self.db.engine)
+        self._sessions: list[SQLRepos] = []
+
+    def tearDown(self) -> None:
+        for repos in self._sessions:
+            repos.session.close()
+        self.db.dispose()
+        self._tmp.cleanup()
+
+    def repos(self) -> Repos:
+        return self._sql_repos()
+
+    def _sql_repos(self) -> SQLRepos:
+        # A fresh session each time: reads see only what was committed
+        repos = SQLRepos(next(self.db.session()), self.db.search)
+        self._sessions.append(repos)
+        return repos
+
+    def test_repository_writes_alone_are_not_committed(self) -> None:
+        repos = self._sql_repos()
+        ev = _event()
+        repos.events.create(ev)
+        self.assertIsNotNone(repos.events.get(ev.id))
+        repos.session.rollback()
+        self.assertIsNone(self.repos().events.get(ev.id))
+
+
+if __name__ == "__main__":
+    unittest.main()
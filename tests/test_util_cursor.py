@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+import datetime as dt
+import unittest
+
+from ics_connect.util.cursor import decode_cursor, encode_cursor, encode_offset_cursor
+from ics_connect.util.time import as_utc
+
+
+class TestCursor(unittest.TestCase):
+    def test_round_trip(self) -> None:
+        aware = dt.datetime(2025, 3, 4, 5, 6, 7, 890, tzinfo=dt.UTC)
+        offset = dt.datetime(2025, 3, 4, 5, 6, 7, tzinfo=dt.timezone(dt.timedelta(hours=-7)))
+        for starts_at in (aware, offset):
+            token = encode_cursor(starts_at, "evt|1")
+            self.assertNotIn("=", token)
+            self.assertEqual(decode_cursor(token), (starts_at, "evt|1"))
+
+    def test_naive_position_is_read_as_utc(self) -> None:
+        naive = dt.datetime(2025, 3, 4, 5, 6, 7)
+        decoded = decode_cursor(encode_cursor(naive, "x"))
+        self.assertEqual(decoded, (naive.replace(tzinfo=dt.UTC), "x"))
+
+    def test_as_utc_converts_offsets_and_reads_naive_as_utc(self) -> None:
+        pacific = dt.datetime(2025, 3, 4, 5, tzinfo=dt.timezone(dt.timedelta(hours=-7)))
+        self.assertEqual(as_utc(pacific).tzinfo, dt.UTC)
+        self.assertEqual(as_utc(pacific), pacific)
+        naive = dt.datetime(2025, 3, 4, 5)
+        self.assertEqual(as_utc(naive), naive.replace(tzinfo=dt.UTC))
+
+    def test_offset_round_trip(self) -> None:
+        self.assertEqual(decode_cursor(encode_offset_cursor(40)), 40)
+
+    def test_malformed(self) -> None:
+        for token in ("***", "YWJj", "bm90LWEtZGF0ZXxpZA", "MjAyNS0wMS0wMXw", "I3g", "Iy0x"):
+            with self.subTest(token=token), self.assertRaises(ValueError):
+                decode_cursor(token)
@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import time
+import unittest
+import uuid
+
+from ics_connect.util.ids import new_id, new_uuid
+
+_V7 = 7
+_V4 = 4
+_BURST = 10_000
+
+
+class TestIds(unittest.TestCase):
+    def test_new_id_is_a_canonical_uuid7(self) -> None:
+        value = new_id()
+        parsed = uuid.UUID(value)
+        self.assertEqual(str(parsed), value)
+        self.assertEqual(parsed.version, _V7)
+        self.assertEqual(parsed.variant, uuid.RFC_4122)
+
+    def test_new_id_embeds_the_creation_millisecond(self) -> None:
+        before = time.time_ns() // 1_000_000
+        ms = uuid.UUID(new_id()).int >> 80
+        after = time.time_ns() // 1_000_000
+        # The clock may run ahead of wall time after a burst, never behind it
+        self.assertGreaterEqual(ms, before)
+        self.assertLessEqual(ms, after + _BURST // 4096 + 1)
+
+    def test_ids_are_strictly_increasing_as_text(self) -> None:
+        # A burst larger than the 4096-per-millisecond counter still sorts in order
+        ids = [new_id() for _ in range(_BURST)]
+        ordered: list[str] = sorted(ids)
+        self.assertEqual(ids, ordered)
+        self.assertEqual(len(set(ids)), _BURST)
+
+    def test_v4_ids_share_the_format(self) -> None:
+        legacy = new_uuid()
+        self.assertEqual(uuid.UUID(legacy).version, _V4)
+        self.assertEqual(len(legacy), len(new_id()))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+import statistics
+import sys
+import time
+from collections.abc import Callable
+
+
+def parse_options(argv: list[str], defaults: dict[str, int]) -> dict[str, int]:
+    """Parse ``--name N`` integer options, starting from ``defaults``."""
+    options = dict(defaults)
+    it = iter(argv)
+    for arg in it:
+        name = arg[2:] if arg.startswith("--") else ""
+        value = next(it, None)
+        if name not in options or value is None:
+            known = " ".join(f"[--{k} N]" for k in defaults)
+            raise SystemExit(f"usage: {known}")
+        options[name] = int(value)
+    return options
+
+
+def time_ms(fn: Callable[[], object], repeat: int) -> list[float]:
+    samples: list[float] = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t0) * 1000.0)
+    return samples
+
+
+def report(label: str, samples: list[float]) -> None:
+    ordered = sorted(samples)
+    p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+    sys.stdout.write(
+        f"{label:<44} median={statistics.median(ordered):9.3f}ms p95={p95:9.3f}ms\n"
+    )
@@ -0,0 +1,57 @@
+"""Deterministic synthetic events shared by the benchmarks."""
+
+from __future__ import annotations
+
+import datetime as dt
+
+from ics_connect.models import Event
+
+_WORDS = list(
+    "board game night career fair resume workshop git basics hackathon kickoff pizza "
+    "study group midterm review robotics club meeting ai ethics panel open source "
+    "sprint coffee chat alumni mixer cybersecurity ctf practice design critique "
+    "volunteer cleanup yoga break movie screening karaoke trivia".split()
+)
+
+# Rare, per-event-ish vocabulary next to the common words above
+_RARE = [f"topic{n}" for n in range(5000)]
+
+_BASE = dt.datetime(2030, 1, 1, tzinfo=dt.UTC)
+
+
+def _pick(seed: int, vocab: list[str]) -> str:
+    # Deterministic, well-spread picks (Knuth multiplicative hash; no RNG state)
+    h = (seed * 2_654_435_761) & 0xFFFF_FFFF
+    return vocab[(h ^ (h >> 16)) % len(vocab)]
+
+
+def _words(seed: int, k: int) -> str:
+    return " ".join(_pick(seed * 8 + j, _WORDS) for j in range(k))
+
+
+def make_events(count: int) -> list[Event]:
+    events: list[Event] = []
+    for i in range(count):
+        starts_at = _BASE + dt.timedelta(minutes=37 * i)
+        events.append(
+            Event(
+                id=f"evt-{i:07d}",
+                title=f"{_words(i, 2).title()} {_pick(i, _RARE)}",
+                description=_words(i * 31 + 17, 12),
+                type=None,
+                starts_at=starts_at,
+                ends_at=starts_at + dt.timedelta(hours=1),
+                location_text=None,
+                discord_link=None,
+                website_link=None,
+                tags_json="[]",
+                public=True,
+                requires_join_code=False,
+                join_code_hash=None,
+                admin_key_hash="x",
+                capacity=10,
+                waitlist_enabled=True,
+                created_at=_BASE,
+            )
+        )
+    return events
@@ -0,0 +1,63 @@
+"""Search page serialization: per-request dicts + encoder vs stored JSON fragments.
+
+Usage: ``python -m tools.bench.event_json [--events 100] [--repeat 2000]``
+
+Times only turning one page of listing rows (as ``search_listings`` returns them,
+counts included) into the ``/search`` response body. "dicts + encoder" is the
+former path: ``listing_public`` per row, then pydantic encodes the ``SearchResult``.
+"fragments" appends each row's counts to the fragment stored at create time.
+Both must produce the same bytes.
+"""
+
+from __future__ import annotations
+
+import statistics
+import sys
+from functools import partial
+
+from pydantic import TypeAdapter
+
+from ics_connect.models import EventListing, Occupancy, event_listing
+from ics_connect.rendering import event_fragment, listing_public, search_json
+from ics_connect.types import SearchResult
+
+from ._common import parse_options, report, time_ms
+from ._events import make_events
+
+_SEARCH_JSON: TypeAdapter[SearchResult] = TypeAdapter(SearchResult)
+_CURSOR = "MjAzMC0wMS0wMVQwMDowMDowMCswMDowMHxldnQtMDAwMDA5OQ"
+
+
+def _dicts(rows: list[EventListing]) -> bytes:
+    result: SearchResult = {
+        "events": [listing_public(row) for row in rows],
+        "total": len(rows),
+        "next_cursor": _CURSOR,
+    }
+    return _SEARCH_JSON.dump_json(result)
+
+
+def _fragments(rows: list[EventListing]) -> bytes:
+    return search_json(rows, len(rows), _CURSOR)
+
+
+def main(argv: list[str] | None = None) -> int:
+    opts = parse_options(sys.argv[1:] if argv is None else argv, {"events": 100, "repeat": 2000})
+    rows: list[EventListing] = []
+    for i, ev in enumerate(make_events(opts["events"])):
+        ev.public_json = event_fragment(ev)
+        rows.append(event_listing(ev, Occupancy(confirmed=i % 10, waitlisted=i % 3)))
+    if _dicts(rows) != _fragments(rows):
+        raise SystemExit("fragment output differs from the encoder's")
+    sys.stdout.write(f"events={len(rows)} page bytes={len(_fragments(rows)):,}\n")
+    medians: list[float] = []
+    for label, render in (("dicts + encoder", _dicts), ("fragments", _fragments)):
+        samples = time_ms(partial(render, rows), opts["repeat"])
+        report(label, samples)
+        medians.append(statistics.median(samples))
+    sys.stdout.write(f"{'':<44} {medians[0] / medians[1]:.1f}x faster\n")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,101 @@
+"""Insert throughput and primary-key index size: random UUIDv4 vs time-ordered UUIDv7.
+
+Usage: ``python -m tools.bench.ids_insert [--rows 1000000] [--batch 1000] [--events 1000]``
+
+Inserts ``--rows`` reservations into the migrated schema of a fresh file-backed
+SQLite database, ``--batch`` rows per transaction, for three id layouts: v4 text
+(``new_uuid``), v7 text (``new_id``, what the services write) and v7 as 16-byte
+blobs (what a native ``uuid``/``BINARY(16)`` column would hold). Rows go through the
+stdlib driver so the id layout, not ORM overhead, is what differs between runs.
+Reports rows/s, the size of the primary-key index (``dbstat``) and the file size.
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+import sqlite3
+import sys
+import tempfile
+import time
+import uuid
+from collections.abc import Callable
+from pathlib import Path
+
+from sqlalchemy import Integer, String, column, create_engine, func, select, table
+
+from ics_connect.migrations import migrate
+from ics_connect.util.ids import new_id, new_uuid
+
+from ._common import parse_options
+
+_PK_INDEX = "sqlite_autoindex_reservations_1"
+_NAME = column("name", String)
+_PGSIZE = column("pgsize", Integer)
+_DBSTAT = table("dbstat", _NAME, _PGSIZE)
+
+
+def _blob7() -> bytes:
+    return uuid.UUID(new_id()).bytes
+
+
+_LAYOUTS: tuple[tuple[str, Callable[[], str | bytes]], ...] = (
+    ("uuid4 text", new_uuid),
+    ("uuid7 text", new_id),
+    ("uuid7 blob(16)", _blob7),
+)
+
+
+def _insert(path: Path, make_id: Callable[[], str | bytes], opts: dict[str, int]) -> float:
+    event_ids = [make_id() for _ in range(opts["events"])]
+    created = dt.datetime.now(dt.UTC).strftime("%Y-%m-%d %H:%M:%S.%f")
+    con = sqlite3.connect(path)
+    t0 = time.perf_counter()
+    for start in range(0, opts["rows"], opts["batch"]):
+        stop = min(start + opts["batch"], opts["rows"])
+        with con:
+            con.executemany(
+                "INSERT INTO reservations (id, event_id, user_id, display_name, status, "
+                "created_at) VALUES (?, ?, ?, ?, 'confirmed', ?)",
+                [
+                    (make_id(), event_ids[i % len(event_ids)], f"u{i}", f"Person {i}", created)
+                    for i in range(start, stop)
+                ],
+            )
+    seconds = time.perf_counter() - t0
+    con.close()
+    return seconds
+
+
+def _pk_index_bytes(path: Path) -> int:
+    engine = create_engine(f"sqlite:///{path}")
+    with engine.connect() as conn:
+        size: int = conn.execute(
+            select(func.sum(_PGSIZE)).select_from(_DBSTAT).where(_NAME == _PK_INDEX)
+        ).scalar_one()
+    engine.dispose()
+    return size
+
+
+def main(argv: list[str] | None = None) -> int:
+    opts = parse_options(
+        sys.argv[1:] if argv is None else argv, {"rows": 1_000_000, "batch": 1000, "events": 1000}
+    )
+    sys.stdout.write(f"rows={opts['rows']:,} batch={opts['batch']:,} events={opts['events']:,}\n")
+    for label, make_id in _LAYOUTS:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "ids.db"
+            engine = create_engine(f"sqlite:///{path}")
+            migrate(engine)
+            engine.dispose()
+            seconds = _insert(path, make_id, opts)
+            pk_bytes = _pk_index_bytes(path)
+            sys.stdout.write(
+                f"{label:<16} {opts['rows'] / seconds:10,.0f} rows/s  "
+                f"pk index {pk_bytes / 2**20:7.1f} MiB  "
+                f"file {path.stat().st_size / 2**20:7.1f} MiB\n"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,73 @@
+"""Listing throughput: full ORM entities + counts query vs the column projection.
+
+Usage: ``python -m tools.bench.listing_projection [--events 10000] [--repeat 10]``
+
+Renders one listing page holding every event (the ``/search`` response body minus
+JSON encoding) from a file-backed SQLite database, in a fresh session each run as a
+request would. "entities" is the former path: ``events.search`` hydrating
+``EventRow`` -> ``Event`` plus a batched ``counts_for_events``; "projection" is
+``events.search_listings`` selecting only the public columns and counters.
+"""
+
+from __future__ import annotations
+
+import statistics
+import sys
+import tempfile
+from collections.abc import Callable
+from functools import partial
+from pathlib import Path
+
+from ics_connect.db import Database
+from ics_connect.migrations import migrate
+from ics_connect.rendering import listing_public, to_public
+from ics_connect.repositories.protocols import EventQuery, Repos
+from ics_connect.repositories.sql import SQLRepos
+from ics_connect.settings import Settings
+from ics_connect.types import EventPublic
+
+from ._common import parse_options, report, time_ms
+from ._events import make_events
+
+
+def _entities(query: EventQuery, repos: Repos) -> list[EventPublic]:
+    events = repos.events.search(query).events
+    counts = repos.reservations.counts_for_events([ev.id for ev in events])
+    return [to_public(ev, counts[ev.id].confirmed, counts[ev.id].waitlisted) for ev in events]
+
+
+def _projection(query: EventQuery, repos: Repos) -> list[EventPublic]:
+    return [listing_public(row) for row in repos.events.search_listings(query).listings]
+
+
+def main(argv: list[str] | None = None) -> int:
+    opts = parse_options(sys.argv[1:] if argv is None else argv, {"events": 10_000, "repeat": 10})
+    events = make_events(opts["events"])
+    query = EventQuery(limit=len(events))
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(f"sqlite:///{Path(tmp) / 'listing.db'}", Settings.from_env())
+        migrate(db.engine)
+        for session in db.session():
+            repos = SQLRepos(session, db.search)
+            with repos.transaction():
+                for ev in events:
+                    repos.events.create(ev)
+
+        def in_session(render: Callable[[EventQuery, Repos], list[EventPublic]]) -> None:
+            for session in db.session():
+                rows = render(query, SQLRepos(session, db.search))
+                if len(rows) != len(events):
+                    raise SystemExit(f"expected {len(events)} rows, got {len(rows)}")
+
+        sys.stdout.write(f"events={len(events)} (one page holding all of them)\n")
+        for label, render in (("entities + counts query", _entities), ("projection", _projection)):
+            samples = time_ms(partial(in_session, render), opts["repeat"])
+            report(label, samples)
+            rate = len(events) / (statistics.median(samples) / 1000.0)
+            sys.stdout.write(f"{'':<44} {rate:,.0f} rows/s\n")
+        db.dispose()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
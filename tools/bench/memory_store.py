@@ -0,0 +1,87 @@
+"""Memory footprint of the in-memory store: bytes per event and per reservation.
+
+Usage: ``python -m tools.bench.memory_store [--reservations 1000000] [--events 1000]``
+
+Loads ``--events`` events, then ``--reservations`` reservations spread evenly over
+them (each event's first half confirmed, the rest waitlisted), and reports what
+``tracemalloc`` attributes to each phase: the model objects, the store's dicts and
+its secondary indexes. As for requests, every reservation's ``event_id`` and
+``status`` arrive as fresh string objects (parsed from a path or a row).
+"""
+
+from __future__ import annotations
+
+import gc
+import sys
+import tracemalloc
+
+from ics_connect.db import Store
+from ics_connect.models import Reservation, ReservationStatus
+from ics_connect.repositories.inmemory import InMemoryRepos
+
+from ._common import parse_options
+from ._events import make_events
+
+
+def _fresh(value: str) -> str:
+    # A new str object with the same value, like one decoded off the wire
+    return value.encode().decode()
+
+
+def _traced() -> int:
+    gc.collect()
+    return tracemalloc.get_traced_memory()[0]
+
+
+def main(argv: list[str] | None = None) -> int:
+    opts = parse_options(
+        sys.argv[1:] if argv is None else argv, {"reservations": 1_000_000, "events": 1000}
+    )
+    n_events, n_res = opts["events"], opts["reservations"]
+    per_event = max(1, n_res // n_events)
+
+    tracemalloc.start()
+    base = _traced()
+    events = make_events(n_events)
+    for ev in events:
+        ev.capacity = per_event // 2
+    repos = InMemoryRepos(Store())
+    for ev in events:
+        repos.events.create(ev)
+    after_events = _traced()
+
+    confirmed, waitlisted = ReservationStatus.CONFIRMED, ReservationStatus.WAITLISTED
+    for i in range(n_res):
+        ev = events[i % n_events]
+        status = confirmed if i // n_events < ev.capacity else waitlisted
+        repos.reservations.create(
+            Reservation(
+                id=f"res-{i:09d}",
+                event_id=_fresh(ev.id),
+                user_id=f"user-{i}",
+                display_name=f"Person {i}",
+                email=f"person{i}@uci.edu",
+                status=_fresh(status),
+                promoted_at=None,
+            )
+        )
+    after_reservations = _traced()
+    tracemalloc.stop()
+
+    # An event's bytes include its search-index entries
+    per_event_bytes = (after_events - base) / n_events
+    per_res_bytes = (after_reservations - after_events) / n_res
+    sys.stdout.write(
+        f"events={n_events:,} reservations={n_res:,}\n"
+        f"bytes/event       {per_event_bytes:10,.0f}\n"
+        f"bytes/reservation {per_res_bytes:10,.0f}  "
+        f"(total {(after_reservations - after_events) / 2**20:,.0f} MiB)\n"
+    )
+    occ = repos.reservations.occupancy(events[0].id)
+    if occ.confirmed + occ.waitlisted != per_event:
+        raise SystemExit("reservations went missing")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,85 @@
+"""In-memory reservation lookups: full scans (pre-index) vs the secondary indexes.
+
+Usage: ``python -m tools.bench.reservations_memory [--events 10000] [--per-event 20]``
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+import sys
+from functools import partial
+
+from ics_connect.db import Store
+from ics_connect.models import Reservation, ReservationStatus, normalize_email
+from ics_connect.repositories.inmemory import InMemoryRepos
+from ics_connect.services.reservations import ReservationService, ReserveInput
+
+from ._common import parse_options, report, time_ms
+from ._events import make_events
+
+
+def scan_by_email(store: Store, event_id: str, email: str) -> Reservation | None:
+    email_l = normalize_email(email)
+    for r in store.reservations.values():
+        if (
+            r.event_id == event_id
+            and r.email is not None
+            and normalize_email(r.email) == email_l
+            and r.status != ReservationStatus.CANCELED
+        ):
+            return r
+    return None
+
+
+def scan_oldest_waitlisted(store: Store, event_id: str) -> Reservation | None:
+    waitlisted = [
+        r
+        for r in store.reservations.values()
+        if r.event_id == event_id and r.status == ReservationStatus.WAITLISTED
+    ]
+    return min(waitlisted, key=_created_at) if waitlisted else None
+
+
+def _created_at(r: Reservation) -> dt.datetime:
+    return r.created_at
+
+
+def main(argv: list[str] | None = None) -> int:
+    opts = parse_options(
+        sys.argv[1:] if argv is None else argv,
+        {"events": 10_000, "per-event": 20, "repeat": 20},
+    )
+    store = Store()
+    repos = InMemoryRepos(store)
+    events = make_events(opts["events"])
+    for e in events:
+        e.capacity = opts["per-event"] // 2
+        repos.events.create(e)
+    svc = ReservationService(repos)
+    for e in events:
+        for j in range(opts["per-event"]):
+            svc.reserve(e, ReserveInput(display_name="x", email=f"p{j}@uci.edu", join_code=None))
+    target = events[len(events) // 2]
+    sys.stdout.write(f"reservations={len(store.reservations)} events={len(events)}\n")
+    res = repos.reservations
+    cases = (
+        ("by email: scan", partial(scan_by_email, store, target.id, "P7@uci.edu")),
+        ("by email: index", partial(res.find_active_by_event_and_email, target.id, "P7@uci.edu")),
+        ("oldest waitlisted: scan", partial(scan_oldest_waitlisted, store, target.id)),
+        ("oldest waitlisted: index", partial(res.find_oldest_waitlisted, target.id)),
+    )
+    for label, run in cases:
+        report(label, time_ms(run, opts["repeat"]))
+
+    def cycle() -> None:
+        made = svc.reserve(
+            target, ReserveInput(display_name="y", email="cycle@uci.edu", join_code=None)
+        )
+        svc.cancel_and_maybe_promote(target.id, made.reservation.id)
+
+    report("reserve + cancel (service, indexed)", time_ms(cycle, opts["repeat"]))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
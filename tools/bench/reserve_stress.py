@@ -0,0 +1,137 @@
+"""Concurrent reserves against one event: prove no overbooking, report throughput.
+
+Usage: ``python -m tools.bench.reserve_stress [--attempts 5000] [--threads 32]
+[--capacity 500] [--waitlist 1]``
+
+Runs the in-memory store and a file-backed SQLite database (pooled sessions, one
+per reserve, as in a request). Exits non-zero if any run confirms more
+reservations than the event's capacity or loses a reserve.
+"""
+
+from __future__ import annotations
+
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import partial
+from pathlib import Path
+from typing import Protocol, TypeVar
+
+from ics_connect.db import Database, Store
+from ics_connect.errors import AppError
+from ics_connect.migrations import migrate
+from ics_connect.models import Event
+from ics_connect.repositories.inmemory import InMemoryRepos
+from ics_connect.repositories.protocols import Repos
+from ics_connect.repositories.sql import SQLRepos
+from ics_connect.services.reservations import ReservationService, ReserveInput
+from ics_connect.settings import Settings
+
+from ._common import parse_options
+from ._events import make_events
+
+_T = TypeVar("_T")
+
+
+class _WithRepos(Protocol):
+    """Run ``fn`` against a backend's repositories (one session per call for SQL)."""
+
+    def __call__(self, fn: Callable[[Repos], _T]) -> _T: ...
+
+
+@dataclass(frozen=True)
+class _Outcome:
+    placed: int
+    full: int
+    confirmed: int
+    waitlisted: int
+    seconds: float
+
+
+def _counts(event_id: str, repos: Repos) -> tuple[int, int]:
+    res = repos.reservations
+    return res.count_confirmed(event_id), res.count_waitlisted(event_id)
+
+
+def _reserve(event: Event, i: int, repos: Repos) -> bool:
+    data = ReserveInput(display_name=f"P{i}", email=None, join_code=None, user_id=f"u{i}")
+    try:
+        ReservationService(repos).reserve(event, data)
+    except AppError as exc:
+        if exc.code != "EVENT_FULL":
+            raise
+        return False
+    return True
+
+
+def _create_event(event: Event, repos: Repos) -> None:
+    with repos.transaction():
+        repos.events.create(event)
+
+
+def _stress(with_repos: _WithRepos, event: Event, attempts: int, threads: int) -> _Outcome:
+    def one(i: int) -> bool:
+        return with_repos(partial(_reserve, event, i))
+
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        placed = sum(pool.map(one, range(attempts)))
+    seconds = time.perf_counter() - t0
+    confirmed, waitlisted = with_repos(partial(_counts, event.id))
+    return _Outcome(placed, attempts - placed, confirmed, waitlisted, seconds)
+
+
+def _check(label: str, event: Event, attempts: int, out: _Outcome) -> bool:
+    sys.stdout.write(
+        f"{label:<10} reserves={attempts} placed={out.placed} full={out.full} "
+        f"confirmed={out.confirmed}/{event.capacity} waitlisted={out.waitlisted} "
+        f"elapsed={out.seconds:.2f}s throughput={attempts / out.seconds:,.0f}/s\n"
+    )
+    ok = out.confirmed <= event.capacity and out.confirmed + out.waitlisted == out.placed
+    if not ok:
+        sys.stdout.write(f"{label}: OVERBOOKED or lost reservations\n")
+    return ok
+
+
+def main(argv: list[str] | None = None) -> int:
+    opts = parse_options(
+        sys.argv[1:] if argv is None else argv,
+        {"attempts": 5000, "threads": 32, "capacity": 500, "waitlist": 1},
+    )
+    event = make_events(1)[0]
+    event.capacity = opts["capacity"]
+    event.waitlist_enabled = bool(opts["waitlist"])
+    ok = True
+
+    repos_mem = InMemoryRepos(Store())
+    repos_mem.events.create(event)
+
+    def with_memory(fn: Callable[[Repos], _T]) -> _T:
+        return fn(repos_mem)
+
+    out = _stress(with_memory, event, opts["attempts"], opts["threads"])
+    ok = _check("memory", event, opts["attempts"], out) and ok
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(f"sqlite:///{Path(tmp) / 'stress.db'}", Settings.from_env())
+        migrate(db.engine)
+
+        def with_sqlite(fn: Callable[[Repos], _T]) -> _T:
+            sessions = db.session()
+            try:
+                return fn(SQLRepos(next(sessions), db.search))
+            finally:
+                sessions.close()
+
+        with_sqlite(partial(_create_event, event))
+        out = _stress(with_sqlite, event, opts["attempts"], opts["threads"])
+        ok = _check("sqlite", event, opts["attempts"], out) and ok
+        db.dispose()
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
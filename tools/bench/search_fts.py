@@ -0,0 +1,97 @@
+"""Search latency at scale: Python scan vs SQL LIKE vs the full-text backend.
+
+Usage: ``python -m tools.bench.search_fts [--events 100000] [--repeat 20]``
+"""
+
+from __future__ import annotations
+
+import sqlite3
+import sys
+import tempfile
+from functools import partial
+from pathlib import Path
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from ics_connect.db import Store
+from ics_connect.migrations import migrate
+from ics_connect.models import Event
+from ics_connect.repositories.inmemory import InMemoryRepos
+from ics_connect.repositories.protocols import EventQuery
+from ics_connect.repositories.sql import SQLRepos
+from ics_connect.repositories.sql_search import (
+    LikeEventSearch,
+    event_search_for,
+    rebuild_fts_index,
+)
+
+from ._common import parse_options, report, time_ms
+from ._events import make_events
+
+_QUERIES = ("workshop", "topic1234", "robotics topic42", "zzznomatch")
+
+
+def _load_sqlite(path: Path, events: list[Event]) -> None:
+    # Bulk load with the stdlib driver; per-event ORM commits would dominate setup.
+    con = sqlite3.connect(path)
+    with con:
+        con.executemany(
+            "INSERT INTO events (id, title, description, starts_at, ends_at, tags_json, "
+            "public, requires_join_code, admin_key_hash, capacity, waitlist_enabled, "
+            "created_at) VALUES (?, ?, ?, ?, ?, '[]', 1, 0, 'x', 10, 1, ?)",
+            [
+                (
+                    e.id,
+                    e.title,
+                    e.description,
+                    e.starts_at.strftime("%Y-%m-%d %H:%M:%S.%f"),
+                    e.ends_at.strftime("%Y-%m-%d %H:%M:%S.%f"),
+                    e.created_at.strftime("%Y-%m-%d %H:%M:%S.%f"),
+                )
+                for e in events
+            ],
+        )
+    con.close()
+
+
+def main(argv: list[str] | None = None) -> int:
+    opts = parse_options(sys.argv[1:] if argv is None else argv, {"events": 100_000, "repeat": 20})
+    events = make_events(opts["events"])
+    store = Store()
+    mem = InMemoryRepos(store)
+    for e in events:
+        mem.events.create(e)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "bench.db"
+        engine = create_engine(f"sqlite:///{path}")
+        migrate(engine)
+        _load_sqlite(path, events)
+        with Session(engine) as session:
+            indexed = rebuild_fts_index(session)
+            sys.stdout.write(f"events={len(events)} fts_rows={indexed}\n")
+            like = SQLRepos(session, LikeEventSearch())
+            fts = SQLRepos(session, event_search_for("sqlite"))
+            for q in _QUERIES:
+                query = EventQuery(q=q, limit=20)
+                ranked = EventQuery(q=q, limit=20, order="relevance")
+                totals = (
+                    mem.events.search(query).total,
+                    like.events.search(query).total,
+                    fts.events.search(query).total,
+                )
+                sys.stdout.write(f"\nq={q!r} matches scan/like/fts={totals}\n")
+                runs = (
+                    ("python scan (in-memory)", partial(mem.events.search, query)),
+                    ("sql LIKE", partial(like.events.search, query)),
+                    ("fts5 (starts_at order)", partial(fts.events.search, query)),
+                    ("fts5 (relevance order)", partial(fts.events.search, ranked)),
+                )
+                for label, run in runs:
+                    report(label, time_ms(run, opts["repeat"]))
+        engine.dispose()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
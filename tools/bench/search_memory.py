@@ -0,0 +1,73 @@
+"""In-memory search: linear scan (the pre-index algorithm) vs the trigram/starts_at index.
+
+Usage: ``python -m tools.bench.search_memory [--events 100000] [--repeat 20]``
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+import sys
+from functools import partial
+
+from ics_connect.db import Store
+from ics_connect.models import Event
+from ics_connect.repositories.inmemory import InMemoryRepos
+from ics_connect.repositories.protocols import EventPage, EventQuery
+
+from ._common import parse_options, report, time_ms
+from ._events import make_events
+
+
+def _sort_key(e: Event) -> tuple[dt.datetime, str]:
+    return (e.starts_at, e.id)
+
+
+def scan_search(events: dict[str, Event], query: EventQuery) -> EventPage:
+    """Reference: filter + lowercase every event per request, then sort and slice."""
+    ql = (query.q or "").lower()
+    matched = sorted(
+        (
+            e
+            for e in list(events.values())
+            if (query.start is None or e.starts_at >= query.start)
+            and (query.to is None or e.starts_at <= query.to)
+            and (not ql or ql in e.title.lower() or ql in (e.description or "").lower())
+        ),
+        key=_sort_key,
+    )
+    return EventPage(matched[query.offset : query.offset + query.limit], len(matched))
+
+
+def main(argv: list[str] | None = None) -> int:
+    opts = parse_options(sys.argv[1:] if argv is None else argv, {"events": 100_000, "repeat": 20})
+    events = make_events(opts["events"])
+    store = Store()
+    repos = InMemoryRepos(store)
+    for e in events:
+        repos.events.create(e)
+    mid = events[len(events) // 2].starts_at
+    day = (mid, mid + dt.timedelta(days=1))
+    deep = events[-50]
+    cases = (
+        ("first page, no filters", EventQuery(limit=20)),
+        ("deep keyset page", EventQuery(limit=20, after=(deep.starts_at, deep.id))),
+        ("one-day range", EventQuery(start=day[0], to=day[1])),
+        ("q=workshop (common)", EventQuery(q="workshop", limit=20)),
+        ("q=topic1234 (rare)", EventQuery(q="topic1234", limit=20)),
+        ("q=ai (short, no trigram)", EventQuery(q="ai", limit=20)),
+        ("q=workshop + one-day range", EventQuery(q="workshop", start=day[0], to=day[1])),
+    )
+    sys.stdout.write(f"events={len(events)}\n")
+    for label, query in cases:
+        scanned = scan_search(store.events, query)
+        indexed = repos.events.search(query)
+        if query.after is None and [e.id for e in scanned.events] != [e.id for e in indexed.events]:
+            raise SystemExit(f"result mismatch for {label}")
+        sys.stdout.write(f"\n{label}: total={indexed.total}\n")
+        report("scan", time_ms(partial(scan_search, store.events, query), opts["repeat"]))
+        report("index", time_ms(partial(repos.events.search, query), opts["repeat"]))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,104 @@
+"""File SQLite under write load: the ``default`` vs ``production`` profile.
+
+Usage: ``python -m tools.bench.sqlite_profile [--events 2000] [--reserves 3000]
+[--threads 16]``
+
+For each profile, ``threads`` workers reserve across the events (one session per
+reserve, as in a request) while one more thread searches in a loop on the read
+side. Reports reserve throughput, reserves that failed with "database is
+locked", and the search latency observed during the storm.
+"""
+
+from __future__ import annotations
+
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
+from functools import partial
+from pathlib import Path
+
+from sqlalchemy.exc import OperationalError
+
+from ics_connect.db import Database
+from ics_connect.migrations import migrate
+from ics_connect.models import Event
+from ics_connect.repositories.protocols import EventQuery
+from ics_connect.repositories.sql import SQLRepos
+from ics_connect.services.reservations import ReservationService, ReserveInput
+from ics_connect.settings import Settings
+
+from ._common import parse_options, report
+from ._events import make_events
+
+_QUERY = EventQuery(q="workshop", limit=20)
+
+
+def _load(db: Database, events: list[Event]) -> None:
+    for session in db.session():
+        repos = SQLRepos(session, db.search)
+        with repos.transaction():
+            for e in events:
+                repos.events.create(e)
+
+
+def _reserve(db: Database, events: list[Event], i: int) -> bool:
+    data = ReserveInput(display_name=f"P{i}", email=None, join_code=None, user_id=f"u{i}")
+    for session in db.session():
+        try:
+            ReservationService(SQLRepos(session, db.search)).reserve(events[i % len(events)], data)
+        except OperationalError as exc:
+            if "locked" not in str(exc):
+                raise
+            return False
+    return True
+
+
+def _search_until(db: Database, stop: threading.Event, samples: list[float]) -> None:
+    while not stop.is_set():
+        t0 = time.perf_counter()
+        for session in db.read_session():
+            SQLRepos(session, db.search).events.search(_QUERY)
+        samples.append((time.perf_counter() - t0) * 1000.0)
+
+
+def _run(profile: str, opts: dict[str, int], events: list[Event], tmp: Path) -> None:
+    settings = replace(Settings.from_env(), sqlite_profile=profile)
+    db = Database(f"sqlite:///{tmp / f'{profile}.db'}", settings)
+    migrate(db.engine)
+    _load(db, events)
+    stop = threading.Event()
+    samples: list[float] = []
+    searcher = threading.Thread(target=_search_until, args=(db, stop, samples))
+    searcher.start()
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=opts["threads"]) as pool:
+        placed = sum(pool.map(partial(_reserve, db, events), range(opts["reserves"])))
+    seconds = time.perf_counter() - t0
+    stop.set()
+    searcher.join()
+    db.dispose()
+    sys.stdout.write(
+        f"\nprofile={profile} reserves={opts['reserves']} placed={placed} "
+        f"locked={opts['reserves'] - placed} elapsed={seconds:.2f}s "
+        f"throughput={placed / seconds:,.0f}/s\n"
+    )
+    report(f"search during reserves ({len(samples)} runs)", samples)
+
+
+def main(argv: list[str] | None = None) -> int:
+    opts = parse_options(
+        sys.argv[1:] if argv is None else argv,
+        {"events": 2000, "reserves": 3000, "threads": 16},
+    )
+    events = make_events(opts["events"])
+    with tempfile.TemporaryDirectory() as tmp:
+        for profile in ("default", "production"):
+            _run(profile, opts, events, Path(tmp))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())